@@ -0,0 +1,125 @@
+"""
+数据库性能配置基准测试
+
+对每个性能配置（config.DB_PROFILES，另加只设置 WAL + synchronous=NORMAL 的 baseline），
+在同一个临时词库上测量：
+1. search_words：关键词搜索、标签过滤、复习状态过滤与排序、翻页
+2. update_sm2_status：随机单词的复习写入（经单写线程，含复习记录）
+
+输出每种操作的平均和 p95 延迟（毫秒），以及测试结束时 WAL 文件大小。
+
+用法:
+    python benchmarks/bench_db_profiles.py [--words 20000] [-n 300] [--profiles baseline,balanced]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.config import DB_PROFILES
+from vocab_app.models.database import DatabaseManager
+
+TAGS = ["CET4", "CET6", "GRE", "TOEFL", "IELTS", "考研"]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_words(n, seed):
+    rng = random.Random(seed)
+    now = time.time()
+    words = set()
+    while len(words) < n:
+        words.add(''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 10))))
+    for word in sorted(words):
+        yield {
+            'word': word,
+            'meaning': f"释义 {word}",
+            'example': f"An example sentence with {word}.",
+            'tags': ','.join(rng.sample(TAGS, rng.randint(0, 2))),
+            'next_review_time': now + rng.uniform(-30, 60) * 86400 if rng.random() < 0.7 else 0,
+        }
+
+
+def search_queries(rng):
+    """生成一组与列表页相近的查询参数"""
+    prefix = ''.join(rng.choice(LETTERS) for _ in range(2))
+    return [
+        dict(keyword=prefix, sort_by="status"),
+        dict(keyword=prefix, sort_by="word"),
+        dict(tag_filter=rng.choice(TAGS), sort_by="status"),
+        dict(status_filter="due", sort_by="status"),
+        dict(status_filter="new", sort_by="status", limit=50),
+    ]
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def timed(fn, n):
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return sum(samples) / len(samples), percentile(samples, 95)
+
+
+def bench_profile(template, tmp_dir, name, profile, n, seed):
+    path = os.path.join(tmp_dir, f"{name}.db")
+    shutil.copy(template, path)
+    db = DatabaseManager(db_path=path, json_path=path + ".no-json", profile=profile)
+    rng = random.Random(seed)
+    words = db.get_matching_words()
+
+    queries = [q for _ in range(max(1, n // 5)) for q in search_queries(rng)]
+    search = timed(lambda i: db.search_words(**queries[i % len(queries)]), len(queries))
+
+    def page(i):
+        _, _, cursor = db.search_words(sort_by="status", limit=50)
+        db.search_words(sort_by="status", limit=50, cursor=cursor)
+    paging = timed(page, max(1, n // 5))
+
+    targets = [rng.choice(words) for _ in range(n)]
+    update = timed(lambda i: db.update_sm2_status(targets[i], 2.5, 6, 2, time.time() + 6 * 86400, 5), n)
+
+    wal_size = os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") else 0
+    db.close()
+    return search, paging, update, wal_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据库性能配置基准测试")
+    parser.add_argument('--words', type=int, default=20000, help="词库单词数")
+    parser.add_argument('-n', type=int, default=300, help="每种操作的次数")
+    parser.add_argument('--profiles', default=None, help="逗号分隔的配置名，默认 baseline + 全部配置")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    profiles = {'baseline': None}
+    profiles.update(DB_PROFILES)
+    if args.profiles:
+        profiles = {name: profiles[name] for name in args.profiles.split(',')}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template = os.path.join(tmp_dir, "template.db")
+        db = DatabaseManager(db_path=template, json_path=template + ".no-json")
+        db.bulk_upsert_words(make_words(args.words, args.seed))
+        db.close()
+        print(f"{args.words} words, {args.n} operations per test (mean / p95 ms)")
+        print(f"  {'profile':<12} {'search_words':>16} {'status paging':>16} {'update_sm2_status':>18} {'WAL':>9}")
+
+        for name, profile in profiles.items():
+            search, paging, update, wal_size = bench_profile(template, tmp_dir, name, profile, args.n, args.seed)
+            print(f"  {name:<12} {search[0]:7.2f} / {search[1]:6.2f} {paging[0]:7.2f} / {paging[1]:6.2f} "
+                  f"{update[0]:8.2f} / {update[1]:7.2f} {wal_size / 1024:7.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+FSRS 拟合与复习量对比基准测试
+
+1. 读取词库的 review_history（--db），或用一个"真实"记忆模型按 SM-2 调度
+   生成模拟的复习记录
+2. 拟合 FSRS 参数，输出耗时和拟合前后的对数损失
+3. 重放：每个单词先按自己的历史得到 SM-2 与 FSRS 的当前状态，再以拟合出的
+   模型作为记忆模型向后模拟 --days 天，分别用 SM-2 和 FSRS 调度，
+   比较复习次数和平均记忆保持率；并找出与 SM-2 保持率相同的 FSRS 目标，比较复习量
+
+用法:
+    python benchmarks/bench_fsrs.py [--db vocab.db] [--cards 2000] [--days 365]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services import fsrs_service
+from vocab_app.services.fsrs_service import FSRS
+from vocab_app.services.sm2_engine import schedule_sm2
+
+# FSRS 评分 -> 复习界面的 SM-2 评分（忘了 / 模糊 / 熟悉）
+GRADE_TO_QUALITY = np.array([0, 1, 3, 5, 5])
+
+
+def synthetic_history(cards, days, seed):
+    """用扰动过的默认参数作为真实记忆模型，按 SM-2 调度生成复习记录"""
+    rng = np.random.default_rng(seed)
+    truth = FSRS(np.clip(np.array(fsrs_service.DEFAULT_PARAMS) * rng.uniform(0.7, 1.3, 17),
+                         fsrs_service.PARAM_BOUNDS[:, 0], fsrs_service.PARAM_BOUNDS[:, 1]))
+    start = date.today() - timedelta(days=days)
+    rows = []
+
+    first_day = rng.integers(0, days // 2, cards)
+    grade = np.where(rng.random(cards) < 0.7, 3, 1)
+    stability, difficulty = truth.init_stability(grade), truth.init_difficulty(grade)
+    easiness, interval, repetitions = schedule_sm2(np.full(cards, 2.5), np.zeros(cards), np.zeros(cards),
+                                                   np.zeros(cards), GRADE_TO_QUALITY[grade])
+    last = first_day.copy()
+    due = first_day + interval
+    for i in range(cards):
+        rows.append((i + 1, (start + timedelta(days=int(first_day[i]))).isoformat(), int(GRADE_TO_QUALITY[grade[i]])))
+
+    for day in range(days):
+        idx = np.flatnonzero(due == day)
+        if not len(idx):
+            continue
+        r = truth.retrievability(day - last[idx], stability[idx])
+        recalled = rng.random(len(idx)) < r
+        g = np.where(recalled, np.where(rng.random(len(idx)) < 0.2, 2, 3), 1)
+        stability[idx], difficulty[idx] = truth.step(stability[idx], difficulty[idx], day - last[idx], g)
+        e, iv, rep = schedule_sm2(easiness[idx], interval[idx], repetitions[idx], np.zeros(len(idx)),
+                                  GRADE_TO_QUALITY[g])
+        easiness[idx], interval[idx], repetitions[idx] = e, iv, rep
+        last[idx] = day
+        due[idx] = day + iv
+        day_str = (start + timedelta(days=day)).isoformat()
+        rows.extend((int(i) + 1, day_str, int(GRADE_TO_QUALITY[gg])) for i, gg in zip(idx, g))
+
+    rows.sort(key=lambda r: (r[0], r[1]))
+    return rows
+
+
+def replay_states(model, elapsed, grade, mask):
+    """按历史得到每个单词当前的 FSRS 状态和 SM-2 状态"""
+    n = len(grade)
+    stability, difficulty = model.init_stability(grade[:, 0]), model.init_difficulty(grade[:, 0])
+    easiness, interval, repetitions = schedule_sm2(np.full(n, 2.5), np.zeros(n), np.zeros(n), np.zeros(n),
+                                                   GRADE_TO_QUALITY[grade[:, 0]])
+    for k in range(1, grade.shape[1]):
+        active = mask[:, k]
+        s, d = model.step(stability, difficulty, elapsed[:, k], grade[:, k])
+        stability, difficulty = np.where(active, s, stability), np.where(active, d, difficulty)
+        e, iv, rep = schedule_sm2(easiness, interval, repetitions, np.zeros(n), GRADE_TO_QUALITY[grade[:, k]])
+        easiness = np.where(active, e, easiness)
+        interval = np.where(active, iv, interval)
+        repetitions = np.where(active, rep, repetitions)
+    return stability, difficulty, easiness, interval, repetitions
+
+
+def simulate(model, scheduler, state, days, seed):
+    """
+    以 model 为记忆模型向后模拟
+
+    Returns:
+        (复习次数, 平均记忆保持率)：后者为每天全部单词的记忆概率均值再对天数取平均，
+        不受"忘记后次日复习"这类短间隔复习的影响
+    """
+    rng = np.random.default_rng(seed)
+    stability, difficulty, easiness, interval, repetitions = (a.astype(np.float64).copy() for a in state)
+    n = len(stability)
+    last = np.zeros(n, dtype=np.int64)
+    if scheduler == 'fsrs':
+        due = model.interval(stability)
+    else:
+        due = interval.astype(np.int64)
+    reviews = 0
+    retention = 0.0
+
+    for day in range(1, days + 1):
+        retention += float(model.retrievability(day - last, stability).mean())
+        idx = np.flatnonzero(due == day)
+        if not len(idx):
+            continue
+        elapsed = day - last[idx]
+        recalled = rng.random(len(idx)) < model.retrievability(elapsed, stability[idx])
+        grade = np.where(recalled, 3, 1)
+        reviews += len(idx)
+
+        stability[idx], difficulty[idx] = model.step(stability[idx], difficulty[idx], elapsed, grade)
+        if scheduler == 'fsrs':
+            next_interval = model.interval(stability[idx])
+        else:
+            e, next_interval, rep = schedule_sm2(easiness[idx], interval[idx], repetitions[idx],
+                                                 np.zeros(len(idx)), GRADE_TO_QUALITY[grade])
+            easiness[idx], interval[idx], repetitions[idx] = e, next_interval, rep
+        last[idx] = day
+        due[idx] = day + next_interval
+    return reviews, retention / days
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FSRS 拟合与复习量对比基准测试")
+    parser.add_argument('--db', default=None, help="读取该词库的 review_history，默认生成模拟记录")
+    parser.add_argument('--cards', type=int, default=2000, help="模拟记录的单词数")
+    parser.add_argument('--history-days', type=int, default=180, help="模拟记录的天数")
+    parser.add_argument('--days', type=int, default=365, help="向后模拟的天数")
+    parser.add_argument('--iterations', type=int, default=150, help="拟合迭代次数")
+    parser.add_argument('--retention', type=float, default=0.9, help="FSRS 目标记忆保持率")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.db:
+        rows = fsrs_service.load_history(args.db)
+        source = args.db
+    else:
+        rows = synthetic_history(args.cards, args.history_days, args.seed)
+        source = "synthetic"
+    elapsed, grade, mask = fsrs_service.build_sequences(rows)
+    print(f"history ({source}): {len(rows)} reviews, {len(mask)} cards with repeat reviews")
+    if not len(mask):
+        print("not enough history to fit")
+        return
+
+    start = time.perf_counter()
+    params, before, after = fsrs_service.fit_params(elapsed, grade, mask, iterations=args.iterations)
+    print(f"fit: {time.perf_counter() - start:.1f} s, log loss {before:.4f} -> {after:.4f}")
+
+    model = FSRS(params, desired_retention=args.retention)
+    state = replay_states(model, elapsed, grade, mask)
+    print(f"\nreplay over the next {args.days} days ({len(mask)} cards, memory model = fitted FSRS):")
+
+    sm2_reviews, sm2_retention = simulate(model, 'sm2', state, args.days, args.seed)
+    print(f"  SM-2                   reviews {sm2_reviews:7d}, avg retention {sm2_retention:.1%}")
+
+    reviews, retention = simulate(model, 'fsrs', state, args.days, args.seed)
+    print(f"  FSRS (target {args.retention:.0%})      reviews {reviews:7d}, avg retention {retention:.1%}")
+
+    # 二分查找目标保持率，使 FSRS 的平均记忆保持率与 SM-2 相同，再比较复习量
+    low, high = 0.5, 0.99
+    for _ in range(10):
+        target = (low + high) / 2
+        reviews, retention = simulate(FSRS(params, desired_retention=target), 'fsrs', state, args.days, args.seed)
+        if retention < sm2_retention:
+            low = target
+        else:
+            high = target
+    print(f"  FSRS (target {target:.1%})    reviews {reviews:7d}, avg retention {retention:.1%}  <- matched to SM-2")
+    if sm2_reviews:
+        print(f"  at SM-2's retention FSRS schedules {1 - reviews / sm2_reviews:.1%} fewer reviews")
+
+if __name__ == "__main__":
+    main()
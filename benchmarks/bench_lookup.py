@@ -0,0 +1,125 @@
+"""
+词典查询延迟基准测试
+
+启动本地替身服务器（或使用已运行的 --url），把词典地址指向它，
+在不同并发度下调用 MultiDictService.aggregate_search 或 DictService.search_word，
+输出 p50/p95/p99 延迟与吞吐量。查询缓存写入临时数据库，不影响真实词库。
+
+用法:
+    python benchmarks/bench_lookup.py --target aggregate --concurrency 1,4,8 -n 200 \\
+        --latency youdao=80,cambridge=400,bing=150,freedict=120 --error-rate 0.02
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dict_standin_server import StandinServer, parse_latency
+from vocab_app.models.database import DatabaseManager
+from vocab_app.services import multi_dict_service
+from vocab_app.services.multi_dict_service import MultiDictService
+from vocab_app.services.dict_service import DictService
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def make_target(name, use_cache, grace):
+    if name == 'aggregate':
+        return lambda word: MultiDictService.aggregate_search(word, use_cache=use_cache, primary_grace=grace)["primary"]
+    if name == 'youdao':
+        return DictService.search_word
+    if name in MultiDictService.DICT_NAMES:
+        return lambda word: MultiDictService.lookup(word, name, use_cache=use_cache)
+    raise ValueError(f"unknown target: {name}")
+
+
+def run(target, words, concurrency):
+    """并发执行所有查询，返回 (每次耗时列表, 失败数, 总耗时)"""
+    latencies = []
+    failures = 0
+
+    def one(word):
+        start = time.perf_counter()
+        result = target(word)
+        return time.perf_counter() - start, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for elapsed, result in executor.map(one, words):
+            latencies.append(elapsed)
+            if not result:
+                failures += 1
+    return latencies, failures, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="词典查询延迟基准测试")
+    parser.add_argument('--target', default='aggregate',
+                        help="aggregate / youdao (DictService.search_word) / cambridge / bing / freedict")
+    parser.add_argument('--concurrency', default='1,4,8', help="逗号分隔的并发度")
+    parser.add_argument('-n', '--requests', type=int, default=100, help="每个并发度的查询次数")
+    parser.add_argument('--url', default=None, help="使用已运行的替身服务器，不在进程内启动")
+    parser.add_argument('--latency', default='youdao=80,cambridge=400,bing=150,freedict=120',
+                        help="替身服务器延迟（毫秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--hang-rate', type=float, default=0.0)
+    parser.add_argument('--grace', type=float, default=None,
+                        help="aggregate 的 primary_grace（默认等待全部词典，与 AddView 一致）")
+    parser.add_argument('--cache', action='store_true', help="允许读取查询缓存（默认每次都走网络）")
+    parser.add_argument('--repeat-words', action='store_true',
+                        help="重复使用少量单词（测试请求合并），默认每次查询不同单词")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        base_url = args.url
+    else:
+        server = StandinServer(latency=parse_latency(args.latency), error_rate=args.error_rate,
+                               hang_rate=args.hang_rate, hang_seconds=15).start()
+        base_url = server.url
+        print(f"替身服务器: {base_url}  样本数量: {server.store.counts()}")
+    multi_dict_service.set_base_urls(base_url)
+
+    tmp_dir = tempfile.mkdtemp(prefix="vocab_bench_")
+    multi_dict_service.set_db_manager(DatabaseManager(db_path=os.path.join(tmp_dir, 'bench.db'),
+                                                      json_path=os.path.join(tmp_dir, 'none.json')))
+
+    target = make_target(args.target, args.cache, args.grace)
+    print(f"目标: {args.target}  每轮 {args.requests} 次查询\n")
+    print(f"{'并发':>4s} {'p50(ms)':>9s} {'p95(ms)':>9s} {'p99(ms)':>9s} {'吞吐(次/s)':>11s} {'失败':>5s}")
+
+    try:
+        for run_index, concurrency in enumerate(int(c) for c in args.concurrency.split(',')):
+            if args.repeat_words:
+                words = [f"word{i % 5}" for i in range(args.requests)]
+            else:
+                words = [f"word{run_index}x{i}" for i in range(args.requests)]
+            MultiDictService.clear_memory_cache()
+
+            latencies, failures, total = run(target, words, concurrency)
+            latencies.sort()
+            print(f"{concurrency:4d} {percentile(latencies, 50) * 1000:9.1f} {percentile(latencies, 95) * 1000:9.1f} "
+                  f"{percentile(latencies, 99) * 1000:9.1f} {len(latencies) / total:11.1f} {failures:5d}")
+    finally:
+        if server:
+            server.stop()
+
+    stats = MultiDictService.get_lookup_stats()
+    print("\n查询线程池统计:")
+    for source, entry in sorted(stats['by_source'].items()):
+        print(f"  {source:10s} 次数 {entry['count']:5d}  平均 {entry['avg_ms']:7.1f} ms  "
+              f"p95 {entry['p95_ms']:7.1f} ms  失败 {entry['errors']}  超时 {entry['timeouts']}")
+
+
+if __name__ == "__main__":
+    main()
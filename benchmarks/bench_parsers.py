@@ -0,0 +1,149 @@
+"""
+词典页面解析基准测试
+
+对比旧的解析方式（html.parser 整页解析 + 多次 find(string=...) 全树扫描）
+与 vocab_app.services.html_parser（lxml/局部解析/单次标记查找）的耗时，
+并检查两种方式提取出的字段一致。
+
+页面样本：tests/fixtures 下随仓库提交的精简样本，以及 record_fixtures.py
+录制到 benchmarks/fixtures 的完整页面（如果有）。
+
+用法:
+    python benchmarks/record_fixtures.py          # 可选：录制完整页面样本
+    python benchmarks/bench_parsers.py [-n 轮数]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from vocab_app.services import html_parser
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIRS = [
+    os.path.join(os.path.dirname(BENCH_DIR), 'tests', 'fixtures'),
+    os.path.join(BENCH_DIR, 'fixtures'),
+]
+
+
+def _text(el):
+    return el.get_text(separator=' ', strip=True) if el else ""
+
+
+# --- 字段提取（与词典服务中的查找逻辑一致） ---
+
+def youdao_fields(soup, markers):
+    trans = soup.find('div', class_='trans-container')
+    return (
+        [_text(p) for p in soup.find_all('span', class_='phonetic')],
+        _text(trans),
+        _text(soup.find('div', id='bilingual')),
+        _text(markers.get("词根").find_parent('div')) if markers.get("词根") else "",
+        _text(soup.find('div', id='synonyms')),
+        _text(markers.get("同近义词").find_parent('div')) if markers.get("同近义词") else "",
+    )
+
+
+def cambridge_fields(soup):
+    return (
+        bool(soup.find('div', class_='di-title')),
+        _text(soup.find('span', class_='us')),
+        [_text(b) for b in soup.find_all('div', class_='def-block', limit=3)],
+    )
+
+
+def bing_fields(soup):
+    return (
+        _text(soup.find('div', class_='qdef')),
+        _text(soup.find('div', class_='hd_prUS')),
+        _text(soup.find('div', id='sentenceSeg')),
+    )
+
+
+# --- 旧实现 ---
+
+def old_youdao(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    markers = {}
+    for marker in ("词根", "同近义词"):
+        found = soup.find(string=lambda t, m=marker: m in t if t else False)
+        if found:
+            markers[marker] = found
+    return youdao_fields(soup, markers)
+
+
+def old_cambridge(html):
+    return cambridge_fields(BeautifulSoup(html, 'html.parser'))
+
+
+def old_bing(html):
+    return bing_fields(BeautifulSoup(html, 'html.parser'))
+
+
+# --- 新实现 ---
+
+def new_youdao(html):
+    soup = html_parser.parse_youdao(html)
+    return youdao_fields(soup, html_parser.find_text_markers(soup, ["词根", "同近义词"]))
+
+
+def new_cambridge(html):
+    return cambridge_fields(html_parser.parse_cambridge(html))
+
+
+def new_bing(html):
+    return bing_fields(html_parser.parse_bing(html))
+
+
+CASES = {
+    'youdao': (old_youdao, new_youdao),
+    'cambridge': (old_cambridge, new_cambridge),
+    'bing': (old_bing, new_bing),
+}
+
+
+def timeit(func, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            func(html)
+    return (time.perf_counter() - start) / (rounds * len(pages)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="词典页面解析基准测试")
+    parser.add_argument('-n', '--rounds', type=int, default=5, help="每个样本解析轮数")
+    args = parser.parse_args()
+
+    print(f"解析器: {html_parser.PARSER}\n")
+    print(f"{'词典源':10s} {'样本':>4s} {'旧(ms/页)':>10s} {'新(ms/页)':>10s} {'加速':>6s}  字段一致")
+
+    any_fixture = False
+    for source, (old, new) in CASES.items():
+        paths = sorted(path for fixtures_dir in FIXTURES_DIRS
+                       for path in glob.glob(os.path.join(fixtures_dir, source, '*.html')))
+        if not paths:
+            continue
+        any_fixture = True
+        pages = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+
+        mismatched = [os.path.basename(p) for p, html in zip(paths, pages) if old(html) != new(html)]
+        old_ms = timeit(old, pages, args.rounds)
+        new_ms = timeit(new, pages, args.rounds)
+        same = "是" if not mismatched else f"否 ({', '.join(mismatched)})"
+        print(f"{source:10s} {len(pages):4d} {old_ms:10.2f} {new_ms:10.2f} {old_ms / new_ms:5.1f}x  {same}")
+
+    if not any_fixture:
+        print(f"\n没有找到页面样本（目录: {', '.join(FIXTURES_DIRS)}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+SM-2 调度引擎基准测试
+
+随机生成 N 张卡片（含旧 stage 数据、缺失字段），分别用 ReviewService.calculate_sm2
+逐张计算和 sm2_engine.schedule_sm2 一次向量化计算，检查两者结果完全一致并比较耗时。
+可选地对真实词库运行 simulate_workload，输出未来每日复习量。
+
+用法:
+    python benchmarks/bench_sm2.py [-n 卡片数] [--db vocab.db --days 365]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services.review_service import ReviewService
+from vocab_app.services import sm2_engine
+
+
+def make_cards(n, seed):
+    rng = np.random.default_rng(seed)
+    easiness = rng.uniform(1.3, 3.0, n).round(3)
+    easiness[rng.random(n) < 0.05] = np.nan          # 缺失字段
+    interval = rng.integers(0, 400, n).astype(np.float64)
+    repetitions = rng.integers(0, 10, n).astype(np.float64)
+    repetitions[rng.random(n) < 0.2] = 0
+    stage = rng.integers(0, 9, n).astype(np.float64)  # 旧 stage 数据
+    quality = rng.integers(0, 6, n)
+    return easiness, interval, repetitions, stage, quality
+
+
+def scalar_schedule(easiness, interval, repetitions, stage, quality):
+    results = []
+    for e, i, r, s, q in zip(easiness.tolist(), interval.tolist(), repetitions.tolist(), stage.tolist(), quality.tolist()):
+        word = {'easiness': None if e != e else e, 'interval': int(i), 'repetitions': int(r), 'stage': int(s)}
+        results.append(ReviewService.calculate_sm2(q, word))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SM-2 调度引擎基准测试")
+    parser.add_argument('-n', '--cards', type=int, default=100000, help="随机卡片数")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db', default=None, help="对该词库运行复习量预测")
+    parser.add_argument('--days', type=int, default=365, help="预测天数")
+    args = parser.parse_args()
+
+    cards = make_cards(args.cards, args.seed)
+
+    start = time.perf_counter()
+    expected = scalar_schedule(*cards)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    easiness, interval, repetitions = sm2_engine.schedule_sm2(*cards)
+    vector_time = time.perf_counter() - start
+
+    mismatches = [
+        k for k, (e, i, r) in enumerate(expected)
+        if (e, i, r) != (easiness[k], interval[k], repetitions[k])
+    ]
+    print(f"{args.cards} cards: scalar {scalar_time * 1000:.1f} ms, "
+          f"vectorized {vector_time * 1000:.1f} ms ({scalar_time / max(vector_time, 1e-9):.0f}x)")
+    if mismatches:
+        k = mismatches[0]
+        print(f"MISMATCH in {len(mismatches)} cards, first #{k}: scalar {expected[k]} vs "
+              f"vectorized {(easiness[k], interval[k], repetitions[k])}")
+        sys.exit(1)
+    print("results identical")
+
+    if args.db:
+        from vocab_app.models.database import DatabaseManager
+        db = DatabaseManager(db_path=args.db, json_path=args.db + ".no-json")
+        state = sm2_engine.load_schedule_arrays(db)
+        start = time.perf_counter()
+        load = sm2_engine.simulate_workload(state, days=args.days, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"\nworkload forecast for {len(state['id'])} cards over {args.days} days ({elapsed * 1000:.0f} ms)")
+        print(f"  today: {load[0]}, peak: {load.max()} (day {load.argmax()}), mean: {load.mean():.1f}")
+        for week in range(min(8, (args.days + 6) // 7)):
+            chunk = load[week * 7:(week + 1) * 7]
+            print(f"  week {week + 1}: {' '.join(f'{c:4d}' for c in chunk)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+并发写入基准测试
+
+多个线程同时写词典缓存（模拟界面、查询线程、提醒服务同时写库），比较：
+1. per-thread：每个线程自己的连接，每次写入单独提交（旧做法），统计 "database is locked" 错误
+2. writer：经 DatabaseManager 的单写线程执行，同时到达的写入合并提交；
+   再测一次 submit_write 异步提交（不等待每次写入完成）
+
+输出吞吐量、实际提交次数和锁错误数。数据库为临时文件，不影响真实词库。
+
+用法:
+    python benchmarks/bench_writes.py [--threads 8] [-n 300]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.models.database import DatabaseManager
+
+
+def run_threads(threads, target):
+    workers = [threading.Thread(target=target, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - start
+
+
+def bench_per_thread(db_path, threads, n, timeout):
+    errors = []
+
+    def worker(t):
+        conn = sqlite3.connect(db_path, timeout=timeout)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for i in range(n):
+            try:
+                conn.execute('INSERT OR REPLACE INTO dict_cache (word, source, data, created_at) VALUES (?, ?, ?, ?)',
+                             (f"t{t}-{i}", "bench", json.dumps({'i': i}), time.time()))
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                errors.append(str(e))
+        conn.close()
+
+    elapsed = run_threads(threads, worker)
+    return elapsed, threads * n - len(errors), len(errors)
+
+
+def bench_writer(db, threads, n, async_submit):
+    before = db.get_pool_stats()['write_batches']
+
+    def worker(t):
+        if async_submit:
+            futures = [db.submit_write(db.set_dict_cache, f"t{t}-{i}", "bench", {'i': i}) for i in range(n)]
+            for f in futures:
+                f.result()
+        else:
+            for i in range(n):
+                db.set_dict_cache(f"t{t}-{i}", "bench", {'i': i})
+
+    elapsed = run_threads(threads, worker)
+    return elapsed, db.get_pool_stats()['write_batches'] - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并发写入基准测试")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('-n', type=int, default=300, help="每个线程的写入次数")
+    parser.add_argument('--timeout', type=float, default=0.05,
+                        help="per-thread 模式的 busy timeout（秒），越小越容易出现锁错误")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.db')
+        db = DatabaseManager(db_path=db_path, json_path=os.path.join(tmp_dir, 'none.json'))
+        total = args.threads * args.n
+        print(f"{args.threads} threads x {args.n} writes")
+
+        elapsed, commits, locked = bench_per_thread(db_path, args.threads, args.n, args.timeout)
+        print(f"  per-thread commit   {total / elapsed:9.0f} writes/s, {commits:6d} commits, {locked} locked errors")
+
+        db.clear_all_dict_cache()
+        elapsed, commits = bench_writer(db, args.threads, args.n, async_submit=False)
+        print(f"  writer (blocking)   {total / elapsed:9.0f} writes/s, {commits:6d} commits, 0 locked errors")
+
+        db.clear_all_dict_cache()
+        elapsed, commits = bench_writer(db, args.threads, args.n, async_submit=True)
+        print(f"  writer (futures)    {total / elapsed:9.0f} writes/s, {commits:6d} commits, 0 locked errors")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+本地词典替身服务器
+
+在本机回放录制好的有道 / 剑桥 / Bing / dictionaryapi.dev 响应，
+可注入延迟、HTTP 错误和超时，用于可重复地测量查询延迟。
+
+样本目录结构与 record_fixtures.py 相同：
+    fixtures/<词典源>/<单词>.html   (freedict 为 .json)
+请求的单词没有样本时回放该词典源的任意一个样本（--missing any，默认），
+或返回“未找到”（--missing 404）。某个词典源完全没有样本时使用内置的最小合成页面。
+
+用法:
+    python benchmarks/dict_standin_server.py --port 8765 --latency youdao=80,cambridge=400 --error-rate 0.02
+    然后设置环境变量 VOCAB_DICT_BASE_URL=http://127.0.0.1:8765 启动应用，
+    或在 config.json 中设置 dict_base_urls
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 路径 -> 词典源，与 vocab_app 中的请求地址对应
+ROUTES = [
+    (re.compile(r'^/w/eng/(?P<word>[^/]+)$'), 'youdao'),
+    (re.compile(r'^/dictionary/english-chinese-simplified/(?P<word>[^/]+)$'), 'cambridge'),
+    (re.compile(r'^/dict/search$'), 'bing'),
+    (re.compile(r'^/api/v2/entries/en/(?P<word>[^/]+)$'), 'freedict'),
+]
+
+# 没有录制样本时使用的最小页面（只包含解析器用到的结构）
+SYNTHETIC_PAGES = {
+    'youdao': (
+        '<html><body><div id="results-contents">'
+        '<span class="phonetic">[{word}]</span><span class="phonetic">[{word}]</span>'
+        '<div class="trans-container"><ul><li>n. {word} 的释义</li></ul></div>'
+        '<div id="bilingual"><ul><li><p>This is {word}.</p><p>这是 {word}。</p></li></ul></div>'
+        '</div></body></html>'
+    ),
+    'cambridge': (
+        '<html><body><div class="di-title">{word}</div>'
+        '<span class="us"><span class="pron">/{word}/</span></span>'
+        '<div class="def-block"><div class="ddef_h"><div class="def">a definition of {word}</div></div>'
+        '<span class="trans">释义</span><div class="examp"><span class="eg">An example of {word}.</span></div></div>'
+        '</body></html>'
+    ),
+    'bing': (
+        '<html><body><div class="hd_prUS">US [{word}]</div>'
+        '<div class="qdef"><ul><li>n. {word} 的释义</li></ul></div>'
+        '<div id="sentenceSeg"><div class="se_li"><div class="sen_en">A {word} sentence.</div>'
+        '<div class="sen_cn">一个例句。</div></div></div></body></html>'
+    ),
+    'freedict': json.dumps([{
+        "word": "{word}", "phonetic": "/{word}/",
+        "meanings": [{"partOfSpeech": "noun", "definitions": [{"definition": "A {word}.", "example": "A {word} example."}]}],
+    }]),
+}
+
+NOT_FOUND_PAGES = {
+    'youdao': '<html><body><div class="error-wrapper">not found</div></body></html>',
+    'cambridge': '<html><body></body></html>',
+    'bing': '<html><body></body></html>',
+}
+
+
+class FixtureStore:
+    """按词典源加载样本文件"""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR):
+        self.pages = {}
+        for source in SYNTHETIC_PAGES:
+            ext = 'json' if source == 'freedict' else 'html'
+            pages = {}
+            for path in glob.glob(os.path.join(fixtures_dir, source, f'*.{ext}')):
+                with open(path, 'r', encoding='utf-8') as f:
+                    pages[os.path.splitext(os.path.basename(path))[0].lower()] = f.read()
+            self.pages[source] = pages
+
+    def counts(self):
+        return {source: len(pages) for source, pages in self.pages.items()}
+
+    def get(self, source, word, missing='any'):
+        """返回 (状态码, 内容)"""
+        pages = self.pages.get(source) or {}
+        word = word.lower()
+        if word in pages:
+            return 200, pages[word]
+        if missing == '404':
+            if source == 'freedict':
+                return 404, json.dumps({"title": "No Definitions Found"})
+            return 200, NOT_FOUND_PAGES[source]
+        if pages:
+            # 按单词固定选择一个样本，同一单词每次返回相同内容
+            keys = sorted(pages)
+            return 200, pages[keys[zlib.crc32(word.encode('utf-8')) % len(keys)]]
+        return 200, SYNTHETIC_PAGES[source].replace('{word}', word)
+
+
+class StandinServer:
+    """
+    可在进程内启动的替身服务器
+
+    Args:
+        port: 端口，0 表示自动分配
+        latency: {词典源: 毫秒} 基础延迟
+        jitter: 延迟随机浮动比例（0.2 表示 ±20%）
+        error_rate: 返回 HTTP 500 的概率
+        hang_rate: 挂起 hang_seconds 秒（模拟超时）的概率
+        missing: 没有样本的单词如何处理，'any' 或 '404'
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, fixtures_dir=FIXTURES_DIR, latency=None, jitter=0.2,
+                 error_rate=0.0, hang_rate=0.0, hang_seconds=30, missing='any'):
+        self.store = FixtureStore(fixtures_dir)
+        self.latency = latency or {}
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.missing = missing
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _route(self, path):
+        parsed = urlparse(path)
+        for pattern, source in ROUTES:
+            match = pattern.match(parsed.path)
+            if match:
+                if source == 'bing':
+                    word = parse_qs(parsed.query).get('q', [''])[0]
+                else:
+                    word = unquote(match.group('word'))
+                return source, word
+        return None, None
+
+    def handle(self, handler):
+        with self._lock:
+            self.requests += 1
+
+        source, word = self._route(handler.path)
+        if source is None:
+            self._send(handler, 404, 'text/plain', 'unknown route')
+            return
+
+        delay = self.latency.get(source, 0) / 1000
+        if delay and self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        roll = random.random()
+        if roll < self.hang_rate:
+            delay = self.hang_seconds
+        if delay:
+            time.sleep(delay)
+
+        if roll >= self.hang_rate and roll < self.hang_rate + self.error_rate:
+            self._send(handler, 500, 'text/plain', 'injected error')
+            return
+
+        status, body = self.store.get(source, word, self.missing)
+        content_type = 'application/json' if source == 'freedict' else 'text/html; charset=utf-8'
+        self._send(handler, status, content_type, body)
+
+    @staticmethod
+    def _send(handler, status, content_type, body):
+        data = body.encode('utf-8')
+        try:
+            handler.send_response(status)
+            handler.send_header('Content-Type', content_type)
+            handler.send_header('Content-Length', str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def parse_latency(text):
+    """解析 "youdao=80,cambridge=400" 或单个数字（所有词典源相同）"""
+    if not text:
+        return {}
+    if '=' not in text:
+        return {source: float(text) for source in SYNTHETIC_PAGES}
+    latency = {}
+    for part in text.split(','):
+        source, ms = part.split('=')
+        latency[source.strip()] = float(ms)
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地词典替身服务器")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help="样本目录")
+    parser.add_argument('--latency', default='', help="延迟毫秒，如 80 或 youdao=80,cambridge=400")
+    parser.add_argument('--jitter', type=float, default=0.2, help="延迟浮动比例")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="返回 HTTP 500 的概率")
+    parser.add_argument('--hang-rate', type=float, default=0.0, help="挂起不响应的概率")
+    parser.add_argument('--hang-seconds', type=float, default=30)
+    parser.add_argument('--missing', choices=['any', '404'], default='any', help="没有样本的单词如何响应")
+    args = parser.parse_args()
+
+    server = StandinServer(
+        host=args.host, port=args.port, fixtures_dir=args.fixtures,
+        latency=parse_latency(args.latency), jitter=args.jitter,
+        error_rate=args.error_rate, hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds, missing=args.missing,
+    )
+    print(f"样本数量: {server.store.counts()}")
+    print(f"替身服务器运行在 {server.url} (Ctrl+C 退出)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
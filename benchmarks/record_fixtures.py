@@ -0,0 +1,60 @@
+"""
+录制词典页面样本（供解析与查询基准测试使用）
+
+用法:
+    python benchmarks/record_fixtures.py apple abandon take ...
+
+样本保存到 benchmarks/fixtures/<词典源>/<单词>.html（Free Dictionary 为 .json），
+已存在的文件会被覆盖。不带参数时录制默认单词表。
+"""
+import os
+import sys
+
+import requests
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+DEFAULT_WORDS = ['apple', 'abandon', 'take', 'run', 'serendipity', 'ubiquitous', 'set', 'light']
+
+SOURCES = {
+    'youdao': ('https://dict.youdao.com/w/eng/{word}', 'html'),
+    'cambridge': ('https://dictionary.cambridge.org/dictionary/english-chinese-simplified/{word}', 'html'),
+    'bing': ('https://cn.bing.com/dict/search?q={word}&mkt=zh-cn&setlang=zh-hans', 'html'),
+    'freedict': ('https://api.dictionaryapi.dev/api/v2/entries/en/{word}', 'json'),
+}
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
+}
+
+
+def record(word, session):
+    for source, (url, ext) in SOURCES.items():
+        target_dir = os.path.join(FIXTURES_DIR, source)
+        os.makedirs(target_dir, exist_ok=True)
+        try:
+            resp = session.get(url.format(word=word), timeout=15)
+        except requests.RequestException as e:
+            print(f"  {source:10s} 失败: {e}")
+            continue
+        if resp.status_code != 200:
+            print(f"  {source:10s} HTTP {resp.status_code}，跳过")
+            continue
+        path = os.path.join(target_dir, f"{word}.{ext}")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(resp.text)
+        print(f"  {source:10s} {len(resp.text) / 1024:.0f} KB -> {os.path.relpath(path)}")
+
+
+def main():
+    words = sys.argv[1:] or DEFAULT_WORDS
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    for word in words:
+        print(f"录制 {word}")
+        record(word, session)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+DatabaseManager.bulk_upsert_words 测试：计数、重复单词合并、出错时整个导入不生效
+
+用法:
+    python -m pytest tests/test_bulk_import.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.models.database import DatabaseManager
+
+
+def make_rows(start, stop, fail_at=None):
+    for i in range(start, stop):
+        if i == fail_at:
+            raise ValueError("bad row")
+        yield {'word': f'w{i}', 'meaning': f'释义 {i}' if i % 2 else ''}
+
+
+class BulkUpsertTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.tmp_dir, 'vocab.db')
+        self.db = DatabaseManager(db_path=path, json_path=path + '.no-json')
+        self.changes = []
+        self.db.add_change_listener(self.changes.append)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def total(self):
+        return self.db.execute('SELECT COUNT(*) FROM words', fetch=True, commit=False)[0][0]
+
+    def test_counts_and_progress(self):
+        progress = []
+        self.assertEqual(self.db.bulk_upsert_words(make_rows(0, 2500), batch_size=1000,
+                                                   on_progress=progress.append), (2500, 0))
+        self.assertEqual(progress, [1000, 2000, 2500])
+        self.assertEqual(self.db.bulk_upsert_words(make_rows(2000, 3000), batch_size=1000), (500, 500))
+        self.assertEqual(self.total(), 3000)
+        self.assertEqual([c['op'] for c in self.changes], ['reload', 'reload'])
+        self.assertEqual(self.db.bulk_upsert_words([]), (0, 0))
+
+    def test_duplicates_merge_in_order(self):
+        rows = [
+            {'word': 'apple', 'meaning': '苹果', 'tags': 'CET4'},
+            {'word': 'apple', 'meaning': '', 'example': 'An apple.'},
+            {'word': 'apple', 'meaning': '苹果公司'},
+        ]
+        self.assertEqual(self.db.bulk_upsert_words(rows, batch_size=2), (1, 2))
+        row = self.db.get_word('apple')
+        self.assertEqual((row['meaning'], row['example'], row['tags']), ('苹果公司', 'An apple.', 'CET4'))
+
+    def test_read_error_leaves_words_unchanged(self):
+        self.db.bulk_upsert_words(make_rows(0, 100))
+        with self.assertRaises(ValueError):
+            self.db.bulk_upsert_words(make_rows(100, 5000, fail_at=3500), batch_size=1000)
+        self.assertEqual(self.total(), 100)
+        self.assertEqual(len(self.changes), 1)
+
+    def test_write_error_leaves_words_unchanged(self):
+        rows = [{'word': f'x{i}'} for i in range(10)] + [{'word': None}]
+        with self.assertRaises(Exception):
+            self.db.bulk_upsert_words(rows, batch_size=3)
+        self.assertEqual(self.total(), 0)
+        # 失败的导入不留下临时表，之后的导入不受影响
+        self.assertEqual(self.db.bulk_upsert_words(make_rows(0, 10), batch_size=3), (10, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
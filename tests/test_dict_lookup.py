@@ -0,0 +1,72 @@
+"""
+MultiDictService.lookup 测试：并发的相同查询合并为一次网络请求
+
+用法:
+    python -m pytest tests/test_dict_lookup.py
+"""
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services import multi_dict_service
+from vocab_app.services.multi_dict_service import MultiDictService
+
+SOURCE = MultiDictService.DICT_BING
+
+
+class LookupCoalescingTest(unittest.TestCase):
+
+    def setUp(self):
+        MultiDictService._memory_cache.clear()
+        # 只用内存缓存，不打开用户的数据库
+        patcher = mock.patch.object(multi_dict_service, 'get_db_manager', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(MultiDictService._memory_cache.clear)
+
+    def test_concurrent_lookups_fetch_once(self):
+        entered, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_fetch(word, source):
+            calls.append(word)
+            entered.set()
+            release.wait(5)
+            return {'word': word, 'meaning': '苹果'}
+
+        results = []
+        with mock.patch.object(MultiDictService, '_fetch', side_effect=slow_fetch):
+            threads = [threading.Thread(target=lambda: results.append(MultiDictService.lookup('apple', SOURCE)))
+                       for _ in range(4)]
+            threads[0].start()
+            self.assertTrue(entered.wait(5))
+            for t in threads[1:]:
+                t.start()
+            release.set()
+            for t in threads:
+                t.join(5)
+        self.assertEqual(calls, ['apple'])
+        self.assertEqual([r['meaning'] for r in results], ['苹果'] * 4)
+        self.assertEqual(MultiDictService._inflight, {})
+
+    def test_owner_uses_result_cached_after_first_check(self):
+        cached = {'word': 'apple', 'meaning': '苹果'}
+        # 第一次查缓存未命中，之后另一个线程的同一查询完成并写入了缓存
+        with mock.patch.object(MultiDictService, 'get_cached', side_effect=[None, cached]), \
+                mock.patch.object(MultiDictService, '_fetch') as fetch:
+            self.assertEqual(MultiDictService.lookup('apple', SOURCE), cached)
+        fetch.assert_not_called()
+        self.assertEqual(MultiDictService._inflight, {})
+
+    def test_no_cache_always_fetches(self):
+        MultiDictService._update_memory_cache('apple', SOURCE, {'word': 'apple', 'meaning': '旧'})
+        with mock.patch.object(MultiDictService, '_fetch', return_value={'word': 'apple', 'meaning': '新'}):
+            self.assertEqual(MultiDictService.lookup('apple', SOURCE, use_cache=False)['meaning'], '新')
+
+
+if __name__ == "__main__":
+    unittest.main()
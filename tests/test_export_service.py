@@ -0,0 +1,44 @@
+"""
+ExportService Anki 文本导出测试：字段中的 HTML 特殊字符被转义，换行转为 <br>
+
+用法:
+    python -m pytest tests/test_export_service.py
+"""
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services.export_service import ExportService
+
+
+class AnkiExportTest(unittest.TestCase):
+
+    def write(self, rows):
+        f = io.StringIO()
+        for _ in ExportService._write_anki(f, rows):
+            pass
+        return f.getvalue().splitlines()[3:]
+
+    def test_fields_are_html_escaped(self):
+        lines = self.write([{
+            'word': 'a<b>',
+            'phonetic': '/ə/',
+            'meaning': 'x < y && "z"\n第二行',
+            'example': 'Use <i>tags</i>\tcarefully.',
+            'tags': 'CET 4, GRE',
+        }])
+        self.assertEqual(lines, [
+            'a&lt;b&gt;<br>/ə/\t'
+            'x &lt; y &amp;&amp; &quot;z&quot;<br>第二行<br><br>Use &lt;i&gt;tags&lt;/i&gt; carefully.\t'
+            'CET_4 GRE'
+        ])
+
+    def test_plain_word(self):
+        self.assertEqual(self.write([{'word': 'apple', 'meaning': '苹果'}]), ['apple\t苹果\t'])
+
+
+if __name__ == "__main__":
+    unittest.main()
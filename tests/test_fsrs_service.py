@@ -0,0 +1,57 @@
+"""
+fsrs_service.load_history 测试：路径中含 URI 特殊字符时仍打开正确的数据库文件
+
+用法:
+    python -m pytest tests/test_fsrs_service.py
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services import fsrs_service
+
+
+class LoadHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_db(self, *parts):
+        path = os.path.join(self.tmp_dir, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE review_history (id INTEGER PRIMARY KEY, word_id INTEGER, '
+                     'review_date TEXT, rating INTEGER)')
+        conn.executemany('INSERT INTO review_history (word_id, review_date, rating) VALUES (?, ?, ?)',
+                         [(2, '2024-01-02', 4), (1, '2024-01-01', 3), (1, '2024-01-03', 5)])
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_special_characters_in_path(self):
+        for directory in ('a#b', 'c?d', 'e%20f', '生词 本'):
+            with self.subTest(directory=directory):
+                path = self.make_db(directory, 'x.db')
+                self.assertEqual(fsrs_service.load_history(path),
+                                 [(1, '2024-01-01', 3), (1, '2024-01-03', 5), (2, '2024-01-02', 4)])
+
+    def test_relative_path(self):
+        path = self.make_db('rel', 'vocab.db')
+        cwd = os.getcwd()
+        os.chdir(os.path.dirname(path))
+        try:
+            self.assertEqual(len(fsrs_service.load_history('vocab.db')), 3)
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+"""
+数据库结构迁移测试：旧版数据库升级到最新版本，触发器维护的派生表
+(words_fts / word_tags / tag_counts / word_stats / due_days) 与 words 保持一致，
+已是最新版本的数据库打开时不再执行迁移
+
+用法:
+    python -m pytest tests/test_migrations.py
+"""
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from collections import Counter
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.models import migrations
+from vocab_app.models.database import DatabaseManager
+
+# 引入版本号之前（user_version = 0）的建表语句
+BASELINE_SCHEMA = '''
+    CREATE TABLE words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT UNIQUE NOT NULL,
+        phonetic TEXT,
+        meaning TEXT,
+        example TEXT,
+        roots TEXT,
+        synonyms TEXT,
+        context_en TEXT,
+        context_cn TEXT,
+        date_added TEXT,
+        next_review_time REAL DEFAULT 0,
+        review_count INTEGER DEFAULT 0,
+        mastered INTEGER DEFAULT 0,
+        stage INTEGER DEFAULT 0,
+        easiness REAL DEFAULT 2.5,
+        interval INTEGER DEFAULT 0,
+        repetitions INTEGER DEFAULT 0,
+        tags TEXT
+    );
+    CREATE TABLE review_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word_id INTEGER,
+        review_date TEXT,
+        rating INTEGER,
+        FOREIGN KEY(word_id) REFERENCES words(id)
+    );
+    CREATE TABLE word_families (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        root TEXT NOT NULL,
+        root_meaning TEXT,
+        word TEXT NOT NULL,
+        UNIQUE(root, word)
+    );
+    CREATE TABLE study_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT UNIQUE NOT NULL,
+        total_duration INTEGER DEFAULT 0,
+        review_count INTEGER DEFAULT 0
+    );
+    CREATE TABLE dict_cache (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT NOT NULL,
+        source TEXT NOT NULL,
+        data TEXT,
+        created_at REAL,
+        UNIQUE(word, source)
+    );
+    CREATE INDEX idx_word ON words(word);
+    CREATE INDEX idx_next_review_time ON words(next_review_time);
+'''
+
+DAY = 86400
+
+
+class MigrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'vocab.db')
+        self.db = None
+
+    def tearDown(self):
+        if self.db is not None:
+            self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def open_db(self):
+        self.db = DatabaseManager(db_path=self.path, json_path=self.path + '.no-json')
+        return self.db
+
+    def query(self, sql, params=()):
+        return [tuple(row) for row in self.db.execute(sql, params, fetch=True, commit=False)]
+
+    def assert_derived_tables_in_sync(self):
+        """按 words 表重新计算各派生表，与触发器维护的结果比较"""
+        words = self.query('SELECT id, word, meaning, tags, mastered, next_review_time FROM words')
+
+        total = len(words)
+        mastered = sum(1 for w in words if w[4] == 1)
+        new = sum(1 for w in words if w[4] == 0 and not w[5])
+        self.assertEqual(self.query('SELECT total, mastered, new FROM word_stats'), [(total, mastered, new)])
+
+        due = Counter(datetime.fromtimestamp(w[5]).strftime('%Y-%m-%d') for w in words if w[4] == 0 and w[5])
+        self.assertEqual(dict(self.query('SELECT day, count FROM due_days')), dict(due))
+
+        if self.db.tag_index_enabled:
+            tags = {(w[0], t.strip()) for w in words for t in (w[3] or '').split(',') if t.strip()}
+            self.assertEqual(set(self.query('SELECT word_id, tag FROM word_tags')), tags)
+            self.assertEqual(dict(self.query('SELECT tag, count FROM tag_counts')),
+                             dict(Counter(tag for _, tag in tags)))
+
+        if self.db.fts_enabled:
+            for word_id, word, meaning, *_ in words:
+                for column, text in (('word', word), ('meaning', meaning)):
+                    if len(text or '') < 3:
+                        continue
+                    expected = sorted(w[0] for w in words if text in ((w[1] if column == 'word' else w[2]) or ''))
+                    with self.subTest(column=column, text=text):
+                        rows = self.query(f'SELECT rowid FROM words_fts WHERE {column} MATCH ? ORDER BY rowid',
+                                          (json.dumps(text, ensure_ascii=False),))
+                        self.assertEqual([r[0] for r in rows], expected)
+
+
+class UpgradeTest(MigrationTestCase):
+
+    def make_baseline_db(self, schema=BASELINE_SCHEMA):
+        now = time.time()
+        conn = sqlite3.connect(self.path)
+        conn.executescript(schema)
+        conn.executemany(
+            'INSERT INTO words (word, meaning, tags, mastered, next_review_time) VALUES (?, ?, ?, ?, ?)', [
+                ('abandon', '放弃', 'CET4, GRE', 0, 0),
+                ('benevolent', '仁慈的', 'GRE', 0, now + 2 * DAY),
+                ('candid', '坦率的', 'TOEFL,GRE,', 1, now + 5 * DAY),
+                ('diligent', '勤奋的', '', 0, now - DAY),
+            ])
+        data = json.dumps({'word': 'abandon', 'meaning': '放弃 ' * 50}, ensure_ascii=False)
+        conn.execute('INSERT INTO dict_cache (word, source, data, created_at) VALUES (?, ?, ?, ?)',
+                     ('abandon', 'bing', data, now))
+        conn.commit()
+        self.assertEqual(migrations.get_version(conn), 0)
+        conn.close()
+
+    def test_baseline_db_upgraded_to_latest(self):
+        self.make_baseline_db()
+        db = self.open_db()
+        self.assertEqual(migrations.get_version(db.get_connection()), migrations.LATEST_VERSION)
+        self.assertEqual(db.get_words_count(), 4)
+        self.assertEqual(db.get_statistics()['mastered'], 1)
+        self.assertEqual(db.get_dict_cache('abandon', 'bing')['meaning'], '放弃 ' * 50)
+        self.assertEqual(self.query('SELECT COUNT(*) FROM dict_cache WHERE data IS NULL AND payload IS NOT NULL'),
+                         [(1,)])
+        if db.tag_index_enabled:
+            self.assertEqual(db.get_tag_counts(), {'CET4': 1, 'GRE': 3, 'TOEFL': 1})
+        self.assert_derived_tables_in_sync()
+
+    def test_legacy_words_table_gets_missing_columns(self):
+        schema = BASELINE_SCHEMA.replace('roots TEXT,', '').replace('synonyms TEXT,', '')
+        schema = schema.replace('repetitions INTEGER DEFAULT 0,\n        tags TEXT', 'repetitions INTEGER DEFAULT 0')
+        conn = sqlite3.connect(self.path)
+        conn.executescript(schema)
+        conn.execute("INSERT INTO words (word, meaning) VALUES ('abandon', '放弃')")
+        conn.commit()
+        conn.close()
+
+        self.open_db()
+        columns = {row[1] for row in self.query('PRAGMA table_info(words)')}
+        self.assertTrue({'roots', 'synonyms', 'tags'} <= columns)
+        self.assertEqual(migrations.get_version(self.db.get_connection()), migrations.LATEST_VERSION)
+        self.assert_derived_tables_in_sync()
+
+    def test_up_to_date_db_not_migrated_again(self):
+        self.make_baseline_db()
+        self.open_db().close()
+        with mock.patch.object(DatabaseManager, '_apply_migrations') as apply, \
+                mock.patch.object(migrations, 'migrate') as migrate:
+            self.open_db()
+        apply.assert_not_called()
+        migrate.assert_not_called()
+        self.assertEqual(self.db.get_words_count(), 4)
+
+
+class TriggerSyncTest(MigrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.open_db()
+        self.now = time.time()
+        self.db.bulk_upsert_words([
+            {'word': 'abandon', 'meaning': '放弃', 'tags': 'CET4,GRE'},
+            {'word': 'benevolent', 'meaning': '仁慈的', 'tags': 'GRE'},
+            {'word': 'candid', 'meaning': '坦率的'},
+        ])
+
+    def test_new_database_in_sync(self):
+        self.assertEqual(migrations.get_version(self.db.get_connection()), migrations.LATEST_VERSION)
+        self.assert_derived_tables_in_sync()
+
+    def test_insert_update_delete(self):
+        steps = [
+            lambda: self.db.add_word({'word': 'diligent', 'meaning': '勤奋的', 'tags': 'TOEFL, GRE'}),
+            lambda: self.db.update_sm2_status('abandon', 2.5, 3, 1, self.now + 3 * DAY, 4),
+            lambda: self.db.update_sm2_status('candid', 2.5, 1, 1, self.now - 3600, 3),
+            lambda: self.db.update_sm2_status('candid', 2.5, 6, 2, self.now + 6 * DAY, 4),
+            lambda: self.db.mark_word_mastered('abandon'),
+            lambda: self.db.retag(['benevolent', 'candid'], ['IELTS', 'GRE']),
+            lambda: self.db.retag(['diligent'], ''),
+            lambda: self.db.bulk_upsert_words([{'word': 'benevolent', 'meaning': '善意的'},
+                                               {'word': 'earnest', 'meaning': '认真的', 'tags': 'CET6'}]),
+            lambda: self.db.delete_word('benevolent'),
+            lambda: self.db.delete_words(['abandon', 'earnest']),
+        ]
+        for i, step in enumerate(steps):
+            step()
+            with self.subTest(step=i):
+                self.assert_derived_tables_in_sync()
+
+    def test_statistics_counters(self):
+        # 从未复习过的新单词 next_review_time 为 0，也算作待复习
+        self.assertEqual(self.db.get_statistics(),
+                         {'total': 3, 'mastered': 0, 'learning': 3, 'new': 3, 'due_today': 3})
+        self.db.update_sm2_status('abandon', 2.5, 1, 1, self.now - 3600, 4)
+        self.db.mark_word_mastered('benevolent')
+        self.db.delete_word('candid')
+        self.assertEqual(self.db.get_statistics(),
+                         {'total': 2, 'mastered': 1, 'learning': 1, 'new': 0, 'due_today': 1})
+
+    def test_fts_follows_updated_text(self):
+        if not self.db.fts_enabled:
+            self.skipTest("SQLite 不支持 FTS5 trigram")
+        self.db.bulk_upsert_words([{'word': 'candid', 'meaning': '直言不讳的'}])
+        self.assertEqual(self.query("SELECT rowid FROM words_fts WHERE meaning MATCH '坦率的'"), [])
+        words, total, _ = self.db.search_words(keyword='直言不讳')
+        self.assertEqual([w['word'] for w in words], ['candid'])
+        self.assert_derived_tables_in_sync()
+
+
+if __name__ == "__main__":
+    unittest.main()
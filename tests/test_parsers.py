@@ -0,0 +1,166 @@
+"""
+词典页面局部解析 (SoupStrainer) 与整页解析的一致性测试
+
+样本在 tests/fixtures/<词典源>/<单词>.html，按真实页面结构精简并去掉了脚本、统计代码
+和账号信息；benchmarks/bench_parsers.py 也使用这些样本。
+
+用法:
+    python -m pytest tests/test_parsers.py
+"""
+import glob
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services import dict_service, html_parser, multi_dict_service
+from vocab_app.services.dict_service import DictService
+from vocab_app.services.multi_dict_service import MultiDictService
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixtures(source):
+    """返回 [(单词, html)]"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, source, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    return pages
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _Session:
+    """只返回固定页面的会话，代替网络请求"""
+
+    def __init__(self, html):
+        self.html = html
+
+    def get(self, url, **kwargs):
+        return _Response(self.html)
+
+
+def full_parse(html, strainer=None):
+    """不做局部解析的整页解析（替换 html_parser 的 parse_* 函数）"""
+    return html_parser.make_soup(html)
+
+
+class ParserFixturesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.youdao = load_fixtures('youdao')
+        self.assertTrue(self.youdao, f"没有找到有道页面样本: {FIXTURES_DIR}")
+
+    def search(self, module, parse_name, search, word, html, strained=True):
+        with mock.patch.object(module, 'get_session', return_value=_Session(html)):
+            if strained:
+                result = search(word)
+            else:
+                with mock.patch.object(module, parse_name, full_parse):
+                    result = search(word)
+        if result:
+            result.pop('date', None)
+        return result
+
+    # --- 有道 ---
+
+    def test_youdao_results_contents_identical(self):
+        for word, html in self.youdao:
+            full = html_parser.make_soup(html).find('div', id='results-contents')
+            if full is None:
+                continue
+            with self.subTest(word=word):
+                strained = html_parser.parse_youdao(html).find('div', id='results-contents')
+                self.assertIsNotNone(strained)
+                self.assertEqual(str(full), str(strained))
+
+    def test_youdao_keeps_phrases_and_word_families(self):
+        for word, html in self.youdao:
+            full = html_parser.make_soup(html)
+            strained = html_parser.parse_youdao(html)
+            for section in ('webPhrase', 'wordGroup', 'relWordTab', 'synonyms', 'bilingual'):
+                expected = full.find('div', id=section)
+                with self.subTest(word=word, section=section):
+                    actual = strained.find('div', id=section)
+                    self.assertEqual(str(expected), str(actual))
+            with self.subTest(word=word, section='wordGroup phrases'):
+                self.assertEqual([p.get_text() for p in full.find_all('p', class_='wordGroup')],
+                                 [p.get_text() for p in strained.find_all('p', class_='wordGroup')])
+
+    def test_youdao_text_markers(self):
+        markers = ["词根", "同近义词"]
+        for word, html in self.youdao:
+            full = html_parser.find_text_markers(html_parser.make_soup(html), markers)
+            strained = html_parser.find_text_markers(html_parser.parse_youdao(html), markers)
+            with self.subTest(word=word):
+                self.assertEqual({m: str(t) for m, t in full.items()},
+                                 {m: str(t) for m, t in strained.items()})
+                self.assertEqual({m: t.find_parent('div').get_text() for m, t in full.items()},
+                                 {m: t.find_parent('div').get_text() for m, t in strained.items()})
+
+    def test_strainer_drops_page_chrome(self):
+        # 局部解析确实生效：页头、页脚、脚本不在解析结果中
+        pages = [(html_parser.parse_youdao, html) for word, html in self.youdao
+                 if html_parser.make_soup(html).find('div', id='results-contents') is not None]
+        pages += [(html_parser.parse_cambridge, html) for word, html in load_fixtures('cambridge')]
+        pages += [(html_parser.parse_bing, html) for word, html in load_fixtures('bing')]
+        for parse, html in pages:
+            soup = parse(html)
+            with self.subTest(parse=parse.__name__):
+                self.assertIsNone(soup.find('script'))
+                self.assertIsNone(soup.find('title'))
+                self.assertIsNone(soup.find(['footer', 'form']))
+
+    def test_youdao_fallback_without_results_container(self):
+        for word, html in self.youdao:
+            if html_parser.make_soup(html).find('div', id='results-contents') is not None:
+                continue
+            with self.subTest(word=word):
+                self.assertEqual(str(html_parser.make_soup(html)), str(html_parser.parse_youdao(html)))
+
+    def test_youdao_search_word_identical(self):
+        found = 0
+        for word, html in self.youdao:
+            with self.subTest(word=word):
+                expected = self.search(dict_service, 'parse_youdao', DictService.search_word, word, html,
+                                       strained=False)
+                actual = self.search(dict_service, 'parse_youdao', DictService.search_word, word, html)
+                self.assertEqual(expected, actual)
+                if actual:
+                    found += 1
+                    self.assertNotEqual(actual['meaning'], "暂无释义")
+                    self.assertTrue(actual['roots'])
+        self.assertGreater(found, 0)
+
+    # --- 剑桥 / Bing ---
+
+    def test_cambridge_search_identical(self):
+        for word, html in load_fixtures('cambridge'):
+            with self.subTest(word=word):
+                expected = self.search(multi_dict_service, 'parse_cambridge', MultiDictService.search_cambridge,
+                                       word, html, strained=False)
+                actual = self.search(multi_dict_service, 'parse_cambridge', MultiDictService.search_cambridge,
+                                     word, html)
+                self.assertIsNotNone(actual)
+                self.assertEqual(expected, actual)
+
+    def test_bing_search_identical(self):
+        for word, html in load_fixtures('bing'):
+            with self.subTest(word=word):
+                expected = self.search(multi_dict_service, 'parse_bing', MultiDictService.search_bing,
+                                       word, html, strained=False)
+                actual = self.search(multi_dict_service, 'parse_bing', MultiDictService.search_bing, word, html)
+                self.assertIsNotNone(actual)
+                self.assertEqual(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
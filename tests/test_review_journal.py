@@ -0,0 +1,198 @@
+"""
+ReviewJournal 测试：缓冲区中尚未写入数据库的评分在到期直方图中的计数，
+以及写库期间不阻塞记录评分
+
+用法:
+    python -m pytest tests/test_review_journal.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.models.database import DatabaseManager
+from vocab_app.services.load_balancer import ReviewLoadBalancer
+from vocab_app.services.review_journal import ReviewJournal
+
+DAY = 86400
+
+
+def day_of(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+class ReviewJournalHistogramTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.tmp_dir, 'vocab.db')
+        self.db = DatabaseManager(db_path=path, json_path=path + '.no-json')
+        self.now = time.time()
+        # 10 个今天到期、5 个三天后到期、3 个新单词
+        for i in range(18):
+            self.db.add_word({'word': f'w{i}', 'meaning': f'释义 {i}'})
+        for i in range(15):
+            due = self.now - 3600 if i < 10 else self.now + 3 * DAY
+            self.db.update_sm2_status(f'w{i}', 2.5, 1, 1, due, 4)
+        self.journal = ReviewJournal(self.db, os.path.join(self.tmp_dir, 'journal.jsonl'),
+                                     flush_interval=3600, max_pending=1000)
+        self.start = day_of(self.now - 30 * DAY)
+        self.end = day_of(self.now + 60 * DAY)
+
+    def tearDown(self):
+        self.journal.close()
+        self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def rate(self, word, interval, rating=4):
+        row = self.db.get_word(word)
+        next_time = self.now + interval * DAY
+        self.journal.record(row, 2.5, interval, 2, next_time, rating)
+        return next_time
+
+    def assert_matches_flushed(self):
+        pending = self.journal.get_due_histogram(self.start, self.end)
+        self.journal.flush()
+        self.assertEqual(pending, self.db.get_due_histogram(self.start, self.end))
+        return pending
+
+    def test_rated_word_leaves_old_day(self):
+        today = day_of(self.now - 3600)
+        before = self.db.get_due_histogram(self.start, self.end)
+        self.rate('w0', 6)
+        histogram = self.journal.get_due_histogram(self.start, self.end)
+        self.assertEqual(histogram[today], before[today] - 1)
+        self.assertEqual(histogram[day_of(self.now + 6 * DAY)], 1)
+        self.assert_matches_flushed()
+
+    def test_matches_database_after_flush(self):
+        for i in range(10):
+            self.rate(f'w{i}', 4 + i % 3)
+        self.rate('w12', 10)      # 三天后到期的单词提前复习
+        self.rate('w16', 1)       # 新单词：原来不在直方图中
+        self.rate('w3', 1, 2)     # 同一单词再次评分：只按最后一次计
+        self.rate('w14', 400)     # 间隔过大视为掌握：不再计入
+        self.assert_matches_flushed()
+
+    def test_already_flushed_events_not_counted_twice(self):
+        for i in range(5):
+            self.rate(f'w{i}', 5)
+        events = list(self.journal._pending)
+        self.journal.flush()
+        # 模拟取事件后、读数据库前刚好完成的一次写入
+        self.journal._pending = events
+        self.assertEqual(self.journal.get_due_histogram(self.start, self.end),
+                         self.db.get_due_histogram(self.start, self.end))
+        self.journal._pending = []
+
+    def test_balancer_sees_freed_day(self):
+        balancer = ReviewLoadBalancer(self.db, journal=self.journal)
+        today = day_of(self.now - 3600)
+        for i in range(10):
+            row = self.db.get_word(f'w{i}')
+            next_time = balancer.next_review_time(10, now=self.now)
+            self.journal.record(row, 2.5, 10, 2, next_time, 4)
+        forecast = dict(balancer.forecast(30, now=self.now))
+        self.assertEqual(forecast[today], 0)
+        self.assertEqual(sum(forecast.values()), 15)
+        self.assertEqual(self.assert_matches_flushed(), self.db.get_due_histogram(self.start, self.end))
+
+
+class ReviewJournalFlushTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.tmp_dir, 'vocab.db')
+        self.db = DatabaseManager(db_path=path, json_path=path + '.no-json')
+        for i in range(5):
+            self.db.add_word({'word': f'w{i}', 'meaning': f'释义 {i}'})
+        self.journal_path = os.path.join(self.tmp_dir, 'journal.jsonl')
+        self.journal = ReviewJournal(self.db, self.journal_path, flush_interval=3600, max_pending=1000)
+
+    def tearDown(self):
+        self.journal.close()
+        self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def rate(self, word):
+        self.journal.record(self.db.get_word(word), 2.5, 1, 1, time.time() + DAY, 4)
+
+    def journal_lines(self):
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            return [line for line in f if line.strip()]
+
+    def start_slow_flush(self):
+        """在后台线程中 flush，apply_review_batch 阻塞到返回的 Event 被 set"""
+        entered, release = threading.Event(), threading.Event()
+        apply = self.db.apply_review_batch
+
+        def slow_apply(events):
+            entered.set()
+            release.wait(5)
+            return apply(events)
+
+        patcher = mock.patch.object(self.db, 'apply_review_batch', side_effect=slow_apply)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        thread = threading.Thread(target=self.journal.flush)
+        thread.start()
+        self.assertTrue(entered.wait(5))
+        return release, thread
+
+    def test_record_not_blocked_by_flush(self):
+        self.rate('w0')
+        release, thread = self.start_slow_flush()
+        started = time.monotonic()
+        self.rate('w1')
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(self.journal.pending_count(), 2)
+        self.assertEqual([r for _, r in self.journal.review_history(self.db.get_word('w0'))], [4])
+        release.set()
+        thread.join(5)
+        # 写库期间记录了新评分：日志不清空，剩下的评分在下次 flush 写入后再清空
+        self.assertEqual(len(self.journal_lines()), 2)
+        self.assertEqual(self.journal.flush(), 1)
+        self.assertEqual(self.journal_lines(), [])
+        self.assertEqual(self.db.get_word('w0')['review_count'], 1)
+        self.assertEqual(self.db.get_word('w1')['review_count'], 1)
+
+    def test_flush_truncates_when_no_new_events(self):
+        self.rate('w0')
+        release, thread = self.start_slow_flush()
+        release.set()
+        thread.join(5)
+        self.assertEqual(self.journal.pending_count(), 0)
+        self.assertEqual(self.journal_lines(), [])
+
+    def test_failed_flush_requeues_events(self):
+        self.rate('w0')
+        self.rate('w1')
+        with mock.patch.object(self.db, 'apply_review_batch', side_effect=RuntimeError('disk full')):
+            self.assertEqual(self.journal.flush(), 0)
+        self.rate('w2')
+        self.assertEqual([e['word'] for e in self.journal._pending], ['w0', 'w1', 'w2'])
+        self.assertEqual(len(self.journal_lines()), 3)
+        self.assertEqual(self.journal.flush(), 3)
+        self.assertEqual(self.journal_lines(), [])
+
+    def test_full_buffer_flushed_by_background_thread(self):
+        self.journal.max_pending = 2
+        self.journal.start()
+        self.rate('w0')
+        self.rate('w1')
+        deadline = time.monotonic() + 5
+        while self.journal.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.journal.pending_count(), 0)
+        self.assertEqual(self.db.get_word('w1')['review_count'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+search_words 关键词搜索测试：全文索引 (FTS5) 和 LIKE 回退搜索相同的列
+
+用法:
+    python -m pytest tests/test_search.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.models.database import DatabaseManager
+
+WORDS = [
+    {'word': 'feline', 'meaning': '猫科的', 'example': 'The kitten sat.', 'context_en': 'a quiet house',
+     'context_cn': '一只猫在睡觉'},
+    {'word': 'canine', 'meaning': '犬科的', 'example': 'A puppy barked.', 'context_en': 'in the yard',
+     'context_cn': '院子里的狗'},
+    {'word': 'rabbit', 'meaning': '兔子'},
+]
+
+
+class KeywordSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.tmp_dir, 'vocab.db')
+        self.db = DatabaseManager(db_path=path, json_path=path + '.no-json')
+        self.db.bulk_upsert_words(WORDS)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def search(self, keyword):
+        words, total, _ = self.db.search_words(keyword=keyword, sort_by='word')
+        self.assertEqual(total, len(words))
+        return sorted(w['word'] for w in words)
+
+    def test_short_and_long_keywords_search_same_columns(self):
+        # 每组：(短关键词, 长关键词, 期望结果)，分别命中 word / meaning / example / 两种语境
+        cases = [
+            ('fe', 'fel', ['feline']),
+            ('科', '科的', ['canine', 'feline']),
+            ('kit', 'kitten', ['feline']),
+            ('pu', 'puppy', ['canine']),
+            ('ya', 'yard', ['canine']),
+            ('睡觉', '在睡觉', ['feline']),
+            ('狗', '里的狗', ['canine']),
+            ('兔', '兔子', ['rabbit']),
+        ]
+        for short, long, expected in cases:
+            with self.subTest(short=short, long=long):
+                self.assertEqual(self.search(short), expected)
+                self.assertEqual(self.search(long), expected)
+
+    def test_like_fallback_without_fts(self):
+        self.db._features = {'fts': False, 'tags': self.db.tag_index_enabled}
+        self.assertEqual(self.search('kitten'), ['feline'])
+        self.assertEqual(self.search('院子'), ['canine'])
+        self.assertEqual(self.search('100%'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+sm2_engine.schedule_sm2 与 ReviewService.calculate_sm2 的一致性测试
+
+向量化版本的每张卡片结果必须与逐张计算完全相同（浮点 easiness 逐位相等）。
+标量版本的输入是数据库行：缺失的字段为 None 或不存在，向量版本对应 NaN。
+
+用法:
+    python -m pytest tests/test_sm2_engine.py
+"""
+import itertools
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocab_app.services.review_service import ReviewService
+from vocab_app.services import sm2_engine
+
+
+def scalar_row(easiness, interval, repetitions, stage):
+    """把向量版本的一组输入转成 calculate_sm2 使用的单词行（NaN -> 缺失字段）"""
+    row = {}
+    for key, value in (('easiness', easiness), ('interval', interval),
+                       ('repetitions', repetitions), ('stage', stage)):
+        if value is None or math.isnan(value):
+            if key == 'easiness':
+                row[key] = None
+            continue
+        row[key] = value if key == 'easiness' else int(value)
+    return row
+
+
+class ScheduleSm2Test(unittest.TestCase):
+
+    def assert_matches_scalar(self, easiness, interval, repetitions, stage, quality):
+        easiness = np.asarray(easiness, dtype=np.float64)
+        interval = np.asarray(interval, dtype=np.float64)
+        repetitions = np.asarray(repetitions, dtype=np.float64)
+        stage = np.asarray(stage, dtype=np.float64)
+        quality = np.broadcast_to(np.asarray(quality, dtype=np.int64), easiness.shape)
+
+        e, i, r = sm2_engine.schedule_sm2(easiness, interval, repetitions, stage, quality)
+        self.assertEqual(e.dtype, np.float64)
+        self.assertEqual(i.dtype, np.int64)
+        self.assertEqual(r.dtype, np.int64)
+
+        for k in range(len(easiness)):
+            row = scalar_row(easiness[k], interval[k], repetitions[k], stage[k])
+            expected = ReviewService.calculate_sm2(int(quality[k]), row)
+            with self.subTest(row=row, quality=int(quality[k])):
+                self.assertEqual(expected, (e[k], i[k], r[k]))
+
+    def test_random_cards(self):
+        rng = np.random.default_rng(20240601)
+        n = 20000
+        easiness = rng.uniform(1.0, 3.2, n).round(3)
+        easiness[rng.random(n) < 0.05] = np.nan
+        easiness[rng.random(n) < 0.02] = 0
+        interval = rng.integers(0, 400, n).astype(np.float64)
+        repetitions = rng.integers(0, 12, n).astype(np.float64)
+        repetitions[rng.random(n) < 0.3] = 0
+        stage = rng.integers(0, 9, n).astype(np.float64)
+        quality = rng.integers(0, 6, n)
+        self.assert_matches_scalar(easiness, interval, repetitions, stage, quality)
+
+    def test_edge_grid(self):
+        # 全部评分 × 重复次数 0/1/2 × 下限附近和缺失的 easiness × 有无旧 stage
+        grid = list(itertools.product(
+            [np.nan, 0.0, 1.1, 1.3, 1.36, 2.5, 3.0],   # easiness
+            [0, 1, 6, 15],                              # interval
+            [0, 1, 2],                                  # repetitions
+            [0, 1, 3, 6, 7, 8],                         # stage
+            range(6),                                   # quality
+        ))
+        easiness, interval, repetitions, stage, quality = (np.array(col) for col in zip(*grid))
+        self.assert_matches_scalar(easiness, interval, repetitions, stage, quality)
+
+    def test_missing_fields(self):
+        # 没有 interval / repetitions / stage 的新单词
+        self.assert_matches_scalar([np.nan] * 6, [np.nan] * 6, [np.nan] * 6, [np.nan] * 6, range(6))
+
+    def test_scalar_quality_broadcast(self):
+        easiness, interval, repetitions = sm2_engine.schedule_sm2([2.5, 1.3], [6, 10], [2, 5], [0, 0], 3)
+        for k, row in enumerate([{'easiness': 2.5, 'interval': 6, 'repetitions': 2},
+                                 {'easiness': 1.3, 'interval': 10, 'repetitions': 5}]):
+            self.assertEqual(ReviewService.calculate_sm2(3, row),
+                             (easiness[k], interval[k], repetitions[k]))
+
+    def test_easiness_floor(self):
+        easiness, _, _ = sm2_engine.schedule_sm2([1.3, 1.1, 1.4], [10, 10, 10], [3, 3, 3], [0, 0, 0], 3)
+        self.assertTrue((easiness >= 1.3).all())
+        self.assertEqual(easiness[0], 1.3)
+        self.assertEqual(easiness[1], 1.3)
+
+    def test_legacy_stage(self):
+        # repetitions 为 0 而 stage > 0 的旧数据：按 stage 的固定间隔继续
+        for stage, stage_interval in [(1, 1), (2, 2), (4, 7), (6, 30), (8, 30)]:
+            e, i, r = sm2_engine.schedule_sm2([2.5], [0], [0], [stage], 4)
+            expected = ReviewService.calculate_sm2(4, {'easiness': 2.5, 'interval': 0,
+                                                       'repetitions': 0, 'stage': stage})
+            self.assertEqual(expected, (e[0], i[0], r[0]))
+            self.assertEqual(r[0], stage + 1)
+            if stage >= 2:
+                self.assertEqual(i[0], int(stage_interval * e[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,6 @@
 import os
 import sys
 import json
-import customtkinter as ctk
 
 # Base paths
 if getattr(sys, 'frozen', False):
@@ -41,6 +40,52 @@ if os.path.exists(_version_file):
         pass
     del _version_file
 
+# SQLite 性能配置，每个数据库连接打开时应用（config.json 的 "db_profile" 选择）
+# mmap_size / cache_size（负数为 KiB）/ temp_store / wal_autocheckpoint（页）/ journal_size_limit（字节）/
+# busy_timeout（毫秒）为 PRAGMA；cached_statements 为每个连接的预编译语句缓存条数；
+# maintenance_interval 为后台维护（词典缓存清理、PRAGMA optimize、WAL 被动检查点）的间隔（秒），0 表示不运行
+DB_PROFILES = {
+    # 低内存：接近 SQLite 默认值
+    "low_memory": {
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "wal_autocheckpoint": 1000,
+        "journal_size_limit": 4 * 1024 * 1024,
+        "cached_statements": 128,
+        "busy_timeout": 5000,
+        "maintenance_interval": 600,
+    },
+    "balanced": {
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 1000,
+        "journal_size_limit": 16 * 1024 * 1024,
+        "cached_statements": 256,
+        "busy_timeout": 5000,
+        "maintenance_interval": 300,
+    },
+    # 大词库：更大的内存映射和页缓存，检查点间隔更长（WAL 文件由 journal_size_limit 截断）
+    "performance": {
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "wal_autocheckpoint": 4000,
+        "journal_size_limit": 64 * 1024 * 1024,
+        "cached_statements": 512,
+        "busy_timeout": 5000,
+        "maintenance_interval": 300,
+    },
+}
+DEFAULT_DB_PROFILE = "balanced"
+
+
+def get_db_profile(config=None):
+    """返回配置选择的数据库性能配置（名称无效时使用默认配置）"""
+    name = (config or {}).get("db_profile", DEFAULT_DB_PROFILE)
+    return dict(DB_PROFILES.get(name, DB_PROFILES[DEFAULT_DB_PROFILE]))
+
 def init_resources():
     """Ensure necessary directories exist"""
     if not os.path.exists(SOUNDS_DIR):
@@ -62,6 +107,12 @@ def get_default_config():
         "hotkey": "ctrl+alt+v",
         "close_action": "ask",  # "ask" | "minimize" | "exit"
         "reminder_interval": 30,  # 复习提醒间隔（分钟）
+        "review_load_balance": True,  # 复习日期负载均衡（在间隔附近选择复习量最少的一天）
+        "review_algorithm": "sm2",  # 复习间隔算法："sm2" | "fsrs"
+        "fsrs_params": None,  # 拟合得到的 FSRS 参数，None 使用默认参数
+        "fsrs_retention": 0.9,  # FSRS 目标记忆保持率
+        "db_profile": DEFAULT_DB_PROFILE,  # 数据库性能配置，见 DB_PROFILES
+        "dict_cache_max_mb": 20,  # 词典查询缓存容量上限（压缩后，MB），超出后按最近访问时间淘汰
         # 多词典配置
         "dict_sources": {
             "youdao": True,    # 有道词典（默认开启）
@@ -70,6 +121,8 @@ def get_default_config():
             "freedict": True,  # Free Dictionary API（默认开启）
         },
         "dict_primary": "youdao",  # 主词典（用于保存到数据库）
+        # 词典站点地址覆盖，如 {"youdao": "http://127.0.0.1:8765"}；为空则使用官方地址
+        "dict_base_urls": {},
     }
 
 def save_config(config):
@@ -80,6 +133,8 @@ def save_config(config):
         print(f"Config save error: {e}")
 
 def setup_theme(config=None):
+    import customtkinter as ctk
+
     if config is None:
         config = load_config()
 
@@ -24,8 +24,9 @@ from PIL import Image
 # Add project root to path so imports work if running from inside folder
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from vocab_app.config import load_config, save_config, setup_theme, init_resources, DB_PATH, BASE_DIR, APP_VERSION
+from vocab_app.config import load_config, save_config, setup_theme, init_resources, get_db_profile, DB_PATH, BASE_DIR, APP_VERSION
 from vocab_app.models.database import DatabaseManager
+from vocab_app.models.vocab_store import VocabStore
 from vocab_app.views.add_view import AddView
 from vocab_app.views.list_view import ListView
 from vocab_app.views.review_view import ReviewView
@@ -34,6 +35,9 @@ from vocab_app.views.close_dialog import CloseDialog
 from vocab_app.views.base_view import CTkToolTip
 from vocab_app.services.tray_service import TrayService
 from vocab_app.services.notification_service import NotificationService, ReviewScheduler
+from vocab_app.services.review_journal import ReviewJournal
+from vocab_app.services.load_balancer import ReviewLoadBalancer
+from vocab_app.services.multi_dict_service import set_base_urls
 
 class VocabApp(ctk.CTk):
     def __init__(self):
@@ -42,16 +46,30 @@ class VocabApp(ctk.CTk):
         # Init resources and theme
         init_resources()
         self.config = load_config()
+        if self.config.get("dict_base_urls"):
+            set_base_urls(self.config["dict_base_urls"])
         # Schedule icon setup to run after window initialization to prevent overrides
         self.after(300, self.setup_icon)
 
         # Database
-        self.db = DatabaseManager(db_path=DB_PATH, json_path=os.path.join(BASE_DIR, 'vocab.json'))
-        self.vocab_list = []
-        self.reload_vocab_list()
+        self.db = DatabaseManager.shared(db_path=DB_PATH, json_path=os.path.join(BASE_DIR, 'vocab.json'),
+                                         profile=get_db_profile(self.config))
+        self.db.dict_cache_max_bytes = int(self.config.get("dict_cache_max_mb", 20) * 1024 * 1024)
+        # In-memory word table, kept current by row-level deltas from the DB
+        self.vocab_store = VocabStore(self.db)
+        self.vocab_store.subscribe(self._on_vocab_change)
+        # Write-behind buffer for review ratings (replays leftovers from a crash)
+        self.review_journal = ReviewJournal(self.db, os.path.join(BASE_DIR, 'review_journal.jsonl'))
+        self.review_journal.start()
+        # Spreads due dates over the least-loaded nearby day
+        self.review_balancer = ReviewLoadBalancer(self.db, enabled=self.config.get("review_load_balance", True),
+                                                   journal=self.review_journal)
+        # Optional FSRS interval model (None = plain SM-2)
+        self.fsrs = None
+        self.setup_review_algorithm()
 
         # Window setup
-        word_count = len(self.vocab_list)
+        word_count = len(self.vocab_store)
         self.title(f"智能生词本 v{APP_VERSION} - {word_count} 个单词")
         self.geometry("1000x800")
         self.grid_columnconfigure(1, weight=1)
@@ -95,7 +113,7 @@ class VocabApp(ctk.CTk):
         self.review_scheduler = ReviewScheduler(
             db_manager=self.db,
             notification_service=self.notification_service,
-            check_interval=1800  # 30分钟检查一次
+            check_interval=1800  # 两次提醒至少间隔30分钟
         )
         self.review_scheduler.start()
 
@@ -266,18 +284,30 @@ class VocabApp(ctk.CTk):
         if hasattr(view, 'on_show'):
             view.on_show()
 
-    def reload_vocab_list(self):
+    def _on_vocab_change(self, change):
+        # May be called from a worker thread (e.g. AddView search), hop to Tk
         try:
-            self.vocab_list = self.db.get_all_words()
-            self.update_title()
-        except Exception as e:
-            print(f"Error reloading vocab list: {e}")
-            self.vocab_list = []
+            self.after(0, self.update_title)
+        except Exception:
+            pass
 
     def update_title(self):
-        word_count = len(self.vocab_list)
+        word_count = len(self.vocab_store)
         self.title(f"智能生词本 v{APP_VERSION} - {word_count} 个单词")
 
+    def setup_review_algorithm(self):
+        """Build the FSRS model from config, or drop it when SM-2 is selected."""
+        if self.config.get("review_algorithm", "sm2") != "fsrs":
+            self.fsrs = None
+            return
+        try:
+            # numpy is only needed when FSRS is enabled
+            from vocab_app.services.fsrs_service import FSRS
+            self.fsrs = FSRS(self.config.get("fsrs_params"), self.config.get("fsrs_retention", 0.9))
+        except Exception as e:
+            print(f"FSRS unavailable, using SM-2: {e}")
+            self.fsrs = None
+
     def setup_hotkey(self):
         try:
             keyboard.unhook_all_hotkeys()
@@ -387,6 +417,11 @@ class VocabApp(ctk.CTk):
     def quit_app(self):
         """完全退出应用"""
         # 停止所有后台服务
+        try:
+            if hasattr(self, 'review_journal'):
+                self.review_journal.close()
+        except Exception as e:
+            print(f"Error flushing review journal: {e}")
         try:
             if hasattr(self, 'review_scheduler'):
                 self.review_scheduler.stop()
@@ -397,10 +432,17 @@ class VocabApp(ctk.CTk):
                 self.tray_service.stop()
         except Exception as e:
             print(f"Error stopping tray service: {e}")
+        try:
+            self.db.close()
+        except Exception as e:
+            print(f"Error closing database: {e}")
 
         self.destroy()
         os._exit(0)
 
 if __name__ == "__main__":
+    # The FSRS fitting job runs in a child process; needed for the frozen exe
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = VocabApp()
     app.mainloop()
@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+
+
+class ConnectionPool:
+    """
+    SQLite 读连接池：最多 max_readers 个读连接（写连接由 DatabaseWriter 独占）。
+
+    - 读连接按线程分配（同一线程重复使用同一连接），设置 query_only，
+      WAL 模式下读不阻塞写
+    - 线程结束后其读连接会被回收；空闲超过 idle_timeout 秒的读连接由
+      后台清理线程关闭。读连接用满时，新线程等待空出的连接
+    - stats() 返回连接数、等待次数和等待时间等指标
+    """
+
+    def __init__(self, db_path, max_readers=4, idle_timeout=60, acquire_timeout=10, configure=None,
+                 cached_statements=128):
+        """
+        Args:
+            db_path: 数据库文件路径
+            max_readers: 读连接上限
+            idle_timeout: 读连接空闲多久后关闭（秒）
+            acquire_timeout: 读连接用满时最多等待多久（秒），超时抛出 sqlite3.OperationalError
+            configure: 新建连接后调用 configure(conn) 设置 PRAGMA
+            cached_statements: 每个读连接的预编译语句缓存条数
+        """
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self._configure = configure
+        self._cached_statements = cached_statements
+
+        self._cond = threading.Condition()
+        # 线程 ident -> [连接, 所属线程, 最近使用时间]
+        self._readers = {}
+
+        self._metrics = {
+            'readers_created': 0,
+            'readers_reaped': 0,
+            'reader_waits': 0,
+            'reader_wait_time': 0.0,
+        }
+
+        self._reaper_stop = threading.Event()
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=self._cached_statements)
+        if self._configure:
+            self._configure(conn)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    # --- 读连接 ---
+
+    def reader(self):
+        """返回当前线程的读连接，没有则新建（读连接用满时等待）。"""
+        ident = threading.get_ident()
+        with self._cond:
+            entry = self._readers.get(ident)
+            if entry is not None:
+                entry[2] = time.monotonic()
+                return entry[0]
+
+            started = time.monotonic()
+            waited = False
+            while len(self._readers) >= self.max_readers:
+                if self._reap_locked(dead_only=True):
+                    continue
+                remaining = started + self.acquire_timeout - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(
+                        f"connection pool exhausted ({self.max_readers} readers in use)")
+                waited = True
+                # 线程结束不会发通知，定期醒来检查
+                self._cond.wait(min(remaining, 0.5))
+            if waited:
+                self._metrics['reader_waits'] += 1
+                self._metrics['reader_wait_time'] += time.monotonic() - started
+
+            conn = self._connect()
+            self._readers[ident] = [conn, threading.current_thread(), time.monotonic()]
+            self._metrics['readers_created'] += 1
+            return conn
+
+    def release_reader(self):
+        """关闭当前线程的读连接（短生命周期线程结束前调用，可提前归还名额）。"""
+        with self._cond:
+            entry = self._readers.pop(threading.get_ident(), None)
+            self._cond.notify_all()
+        if entry is not None:
+            self._close(entry[0])
+
+    def _reap_locked(self, dead_only=False):
+        """关闭已结束线程的读连接和空闲过久的读连接（需持有 _cond），返回关闭的数量。"""
+        now = time.monotonic()
+        stale = [
+            ident for ident, (conn, thread, last_used) in self._readers.items()
+            if not thread.is_alive()
+            or (not dead_only and now - last_used > self.idle_timeout and not conn.in_transaction)
+        ]
+        for ident in stale:
+            self._close(self._readers.pop(ident)[0])
+        if stale:
+            self._metrics['readers_reaped'] += len(stale)
+            self._cond.notify_all()
+        return len(stale)
+
+    def reap(self):
+        """立即清理一次，返回关闭的连接数。"""
+        with self._cond:
+            return self._reap_locked()
+
+    def _reap_loop(self):
+        interval = max(1.0, self.idle_timeout / 2)
+        while not self._reaper_stop.wait(interval):
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"Connection reaper error: {e}")
+
+    # --- 生命周期与指标 ---
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """关闭全部连接并停止清理线程。"""
+        self._reaper_stop.set()
+        with self._cond:
+            readers = [entry[0] for entry in self._readers.values()]
+            self._readers.clear()
+            self._cond.notify_all()
+        for conn in readers:
+            self._close(conn)
+
+    def stats(self):
+        """
+        连接池指标。
+
+        Returns:
+            dict: open_readers / max_readers / readers_created / readers_reaped /
+                  reader_waits / reader_wait_time（秒）
+        """
+        with self._cond:
+            stats = dict(self._metrics)
+            stats['open_readers'] = len(self._readers)
+        stats['max_readers'] = self.max_readers
+        return stats
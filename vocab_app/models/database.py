@@ -2,81 +2,230 @@ import sqlite3
 import json
 import os
 import time
+import random
 import threading
+import functools
+import itertools
+import zlib
 from datetime import datetime, timedelta
 
-class DatabaseManager:
+from .connection_pool import ConnectionPool
+from .db_writer import DatabaseWriter
+from . import migrations
+
+
+def _writes(method):
     """
-    SQLite 数据库管理器，使用线程本地存储的长连接。
+    写方法装饰器：方法交给写线程执行，等事务提交后返回结果（异常原样抛出），
+    方法内（含嵌套调用）的 get_connection() 返回写连接。
+    words 变更通知在提交后于调用方线程中分发。
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._writer.current_task() is not None:
+            # 已在写线程的写操作中（嵌套调用）：直接执行，属于同一个 SAVEPOINT
+            return method(self, *args, **kwargs)
+        future = self._writer.submit(method, self, *args, **kwargs)
+        result = future.result()
+        self._dispatch_changes(future.changes)
+        return result
+    return wrapper
+
 
-    优化策略：
-    - 每个线程维护一个独立的数据库连接（线程本地存储）
-    - 避免频繁创建/关闭连接的开销
-    - 线程安全，支持多线程环境（如词典查询线程）
+class DatabaseManager:
+    """
+    SQLite 数据库管理器，连接由 ConnectionPool 统一管理。
+
+    连接策略：
+    - 同一数据库文件在进程内只有一个实例（见 shared），所有服务共用一个连接池
+    - 读操作使用当前线程的只读连接，WAL 模式下读不阻塞写
+    - 写操作（@_writes 标注的方法）由唯一的写线程在唯一的写连接上执行（见 DatabaseWriter），
+      同时到达的写入合并为一个事务提交，不会出现锁冲突
+    - 线程结束或长时间空闲后，其读连接由连接池回收
+    - profile（见 config.DB_PROFILES）设置每个连接的 PRAGMA，并定期在后台执行
+      PRAGMA optimize 和 WAL 被动检查点
     """
 
-    def __init__(self, db_path="vocab.db", json_path="vocab.json"):
+    # 读连接按线程分配，上限要覆盖同时存活的全部读线程，否则多出的线程会等待后报
+    # "connection pool exhausted"：词典查询线程池 8 + 批量补全线程池 4 + Tk 主线程 +
+    # 复习提醒、复习记录、数据库维护线程，再留 4 个给导入、搜索等短生命周期线程
+    _MAX_READERS = 20
+
+    # 性能配置中按连接设置的 PRAGMA
+    _PROFILE_PRAGMAS = ('mmap_size', 'cache_size', 'temp_store', 'wal_autocheckpoint',
+                        'journal_size_limit', 'busy_timeout')
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path="vocab.db", json_path="vocab.json", profile=None):
+        """返回 db_path 对应的进程内共享实例，第一次调用时创建（profile 只在创建时生效）。"""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = cls(db_path, json_path, profile=profile)
+                cls._instances[key] = instance
+            return instance
+
+    def __init__(self, db_path="vocab.db", json_path="vocab.json", profile=None):
+        """
+        Args:
+            db_path: 数据库文件路径
+            json_path: 旧版 JSON 词库路径（存在时迁移到数据库）
+            profile: 性能配置字典（见 config.DB_PROFILES），None 只使用 WAL + synchronous=NORMAL
+        """
         self.db_path = db_path
         self.json_path = json_path
-        self._local = threading.local()  # 线程本地存储
+        self.profile = dict(profile or {})
         self._lock = threading.Lock()     # 用于初始化时的锁
+        cached_statements = self.profile.get('cached_statements', 128)
+        self._pool = ConnectionPool(db_path, configure=self._configure_connection,
+                                    max_readers=self.profile.get('max_readers', self._MAX_READERS),
+                                    cached_statements=cached_statements)
+        self._writer = DatabaseWriter(db_path, configure=self._configure_connection,
+                                      on_commit=self._on_writes_committed,
+                                      cached_statements=cached_statements)
+
+        # search_words 计数缓存，words 表写入后通过 generation 失效
+        self._count_cache = {}
+        # 待复习数缓存：(数量, generation, 下一个到期时间)，见 get_due_count
+        self._due_cache = None
+        self._words_generation = 0
+        # words 表行级变更监听器（见 add_change_listener）
+        self._change_listeners = []
+
+        self._features = None  # 见 _get_features
+        # 词典缓存的访问时间 {(word, source): 时间戳}，由 maintain_dict_cache 写回
+        self._dict_cache_access = {}
+        self._migrate()
+
+        # 后台维护：词典缓存清理 + PRAGMA optimize + WAL 被动检查点
+        self._maintenance_stop = threading.Event()
+        interval = self.profile.get('maintenance_interval', 0)
+        if interval:
+            threading.Thread(target=self._maintenance_loop, args=(interval,),
+                             name="db-maintenance", daemon=True).start()
+
+    def _configure_connection(self, conn):
+        conn.execute("PRAGMA journal_mode=WAL")  # 使用 WAL 模式提升并发性能
+        conn.execute("PRAGMA synchronous=NORMAL")  # 平衡性能和安全
+        for pragma in self._PROFILE_PRAGMAS:
+            value = self.profile.get(pragma)
+            # 值来自 config.json，只接受整数和关键字，避免拼接任意 SQL
+            if isinstance(value, int) or (isinstance(value, str) and value.isalnum()):
+                conn.execute(f"PRAGMA {pragma} = {value}")
+
+    def run_maintenance(self):
+        """
+        执行 PRAGMA optimize 和 WAL 被动检查点（在写线程中、事务之外执行）。
 
-        self.init_db()
-        self.check_schema_updates()
-        self.migrate_from_json()
+        被动检查点不等待读连接，只把已经没有读者需要的 WAL 帧写回数据库；
+        WAL 全部写回后下一次写入会从头复用 WAL 文件，配合 journal_size_limit 截断文件大小。
+
+        Returns:
+            dict: {'busy', 'wal_frames', 'checkpointed'}
+        """
+        def maintain():
+            conn = self._writer.connection
+            conn.execute("PRAGMA optimize")
+            busy, wal_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            return {'busy': busy, 'wal_frames': wal_frames, 'checkpointed': checkpointed}
+        return self._writer.submit_standalone(maintain).result()
+
+    def _maintenance_loop(self, interval):
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.maintain_dict_cache()
+                self.run_maintenance()
+            except Exception as e:
+                print(f"Database maintenance error: {e}")
 
     def get_connection(self):
         """
         获取当前线程的数据库连接。
-        每个线程使用独立的连接，避免线程安全问题。
+        在写方法内返回写连接，否则返回当前线程的只读连接。
         """
-        # 检查当前线程是否已有连接
-        conn = getattr(self._local, 'connection', None)
+        if self._writer.current_task() is not None:
+            return self._writer.connection
+        return self._pool.reader()
 
-        if conn is None:
-            # 当前线程没有连接，创建新连接
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.execute("PRAGMA journal_mode=WAL")  # 使用 WAL 模式提升并发性能
-            conn.execute("PRAGMA synchronous=NORMAL")  # 平衡性能和安全
-            self._local.connection = conn
+    def close_connection(self):
+        """归还当前线程的读连接（短生命周期的后台线程结束前调用）。"""
+        self._pool.release_reader()
 
-        return conn
+    def get_pool_stats(self):
+        """连接池与写线程指标，见 ConnectionPool.stats 和 DatabaseWriter.stats。"""
+        stats = self._pool.stats()
+        stats.update(self._writer.stats())
+        return stats
 
-    def close_connection(self):
-        """关闭当前线程的数据库连接。"""
-        conn = getattr(self._local, 'connection', None)
-        if conn is not None:
-            try:
-                conn.close()
-            except Exception:
-                pass
-            self._local.connection = None
+    def submit_write(self, method, *args, **kwargs):
+        """
+        异步执行写方法，立即返回 Future（事务提交后完成）。
+
+        method 为本类的写方法，例如 db.submit_write(db.set_dict_cache, word, source, data)，
+        用于调用方不需要等待写入结果的场景。变更通知在写线程中分发。
+        """
+        future = self._writer.submit(method, *args, **kwargs)
+        future.add_done_callback(
+            lambda f: f.exception() is None and self._dispatch_changes(f.changes))
+        return future
+
+    def close(self):
+        """执行完排队的写入后关闭全部连接（程序退出时调用）。"""
+        self._maintenance_stop.set()
+        try:
+            self._flush_dict_cache_access()
+            self.run_maintenance()
+        except Exception as e:
+            print(f"Database maintenance error: {e}")
+        self._writer.close()
+        self._pool.close()
+        with self._instances_lock:
+            key = os.path.abspath(self.db_path)
+            if self._instances.get(key) is self:
+                del self._instances[key]
+
+    def add_change_listener(self, callback):
+        """
+        注册 words 表行级变更监听器。
+
+        callback(change) 在写入提交后于发起写入的线程中调用，change 为
+        {'op': 'insert'|'update'|'delete'|'reload', 'word': str|None, 'row': dict|None}。
+        'reload' 表示发生了批量变更，监听方需要整体刷新。
+        """
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _row_change(self, op, word):
+        """读取单词的最新整行，构造变更记录。"""
+        return {'op': op, 'word': word, 'row': self.get_word(word)}
 
     def execute(self, query, params=(), fetch=False, commit=True):
         """Helper to execute a single query with automatic connection handling."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
+        if not commit:
+            cursor = self.get_connection().cursor()
             cursor.execute(query, params)
-            if commit:
-                conn.commit()
-            if fetch:
-                return cursor.fetchall()
-            return None
-        except sqlite3.Error as e:
-            # 连接可能已损坏，尝试重新连接
-            if "database is locked" in str(e) or "disk I/O error" in str(e):
-                self.close_connection()
-                conn = self.get_connection()
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                if commit:
-                    conn.commit()
-                if fetch:
-                    return cursor.fetchall()
-                return None
-            raise
+            return cursor.fetchall() if fetch else None
+        return self._execute_write(query, params, fetch)
 
+    @_writes
+    def _execute_write(self, query, params, fetch):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        conn.commit()
+        if fetch:
+            return cursor.fetchall()
+        return None
+
+    @_writes
     def execute_many(self, queries):
         """Execute multiple queries in a single transaction."""
         conn = self.get_connection()
@@ -89,123 +238,58 @@ class DatabaseManager:
             conn.rollback()
             raise
 
-    def init_db(self):
-        """Initialize the database tables."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Main words table
-        # We pre-add SM-2 algorithm fields (easiness, interval, repetitions) for Step 2
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT UNIQUE NOT NULL,
-                phonetic TEXT,
-                meaning TEXT,
-                example TEXT,
-                roots TEXT,          -- New: Root/Affix
-                synonyms TEXT,       -- New: Synonyms
-                context_en TEXT,
-                context_cn TEXT,
-                date_added TEXT,
-
-                next_review_time REAL DEFAULT 0,
-                review_count INTEGER DEFAULT 0,
-                mastered INTEGER DEFAULT 0,  -- 0: Learning, 1: Mastered
-
-                -- Fields for Old Logic (Stage) and Future SM-2
-                stage INTEGER DEFAULT 0,      -- Currently used for "1,2,4,7..." logic
-                easiness REAL DEFAULT 2.5,    -- For SM-2
-                interval INTEGER DEFAULT 0,   -- For SM-2
-                repetitions INTEGER DEFAULT 0, -- For SM-2
-                tags TEXT                      -- New: Exam tags (CET4, GRE, etc.)
-            )
-        ''')
-
-        # History table for Heatmap (Step 3 preparation)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS review_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word_id INTEGER,
-                review_date TEXT,  -- YYYY-MM-DD
-                rating INTEGER,    -- 0=Forgot, 1=Remembered (Simple) / 1-4 (SM-2)
-                FOREIGN KEY(word_id) REFERENCES words(id)
-            )
-        ''')
-
-        # Word families table for derivative words (派生词群组)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS word_families (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                root TEXT NOT NULL,           -- 词根 (e.g., "creat")
-                root_meaning TEXT,            -- 词根释义 (e.g., "创造")
-                word TEXT NOT NULL,           -- 单词 (e.g., "create")
-                UNIQUE(root, word)
-            )
-        ''')
-
-        # Study Statistics table (Step 4: Review Timer & Stats)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS study_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT UNIQUE NOT NULL,    -- YYYY-MM-DD
-                total_duration INTEGER DEFAULT 0, -- Seconds
-                review_count INTEGER DEFAULT 0
-            )
-        ''')
-
-        # Create indexes for frequently queried columns to improve performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word ON words(word)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_next_review_time ON words(next_review_time)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mastered ON words(mastered)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_stage ON words(stage)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_families_root ON word_families(root)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_families_word ON word_families(word)')
-
-        # Dictionary cache table (持久化词典查询缓存)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS dict_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL,
-                source TEXT NOT NULL,
-                data TEXT,
-                created_at REAL,
-                UNIQUE(word, source)
-            )
-        ''')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_dict_cache_word ON dict_cache(word)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_dict_cache_created ON dict_cache(created_at)')
-
-        conn.commit()
-        # 注意：不再关闭连接，使用长连接
-
-    def check_schema_updates(self):
-        """Check and update database schema for new columns."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        try:
-            # Check if 'roots' column exists
-            cursor.execute("PRAGMA table_info(words)")
-            columns = [info[1] for info in cursor.fetchall()]
-
-            if 'roots' not in columns:
-                print("Adding 'roots' column to words table...")
-                cursor.execute("ALTER TABLE words ADD COLUMN roots TEXT")
-
-            if 'synonyms' not in columns:
-                print("Adding 'synonyms' column to words table...")
-                cursor.execute("ALTER TABLE words ADD COLUMN synonyms TEXT")
-
-            if 'tags' not in columns:
-                print("Adding 'tags' column to words table...")
-                cursor.execute("ALTER TABLE words ADD COLUMN tags TEXT")
-
-            conn.commit()
-        except Exception as e:
-            print(f"Schema update error: {e}")
-        # 注意：不再关闭连接，使用长连接
-
+    def _migrate(self):
+        """
+        执行尚未执行的结构迁移（见 migrations）。数据库已是最新版本时只读取一次 user_version。
+        新建或刚升级的数据库再检查是否需要从旧版 JSON 词库导入。
+        """
+        if migrations.get_version(self.get_connection()) < migrations.LATEST_VERSION:
+            if self._apply_migrations():
+                self.migrate_from_json()
+        features = migrations.sqlite_features()
+        if not (features['fts5'] and features['json1']):
+            self._drop_unavailable_triggers()
+
+    @_writes
+    def _apply_migrations(self):
+        applied = migrations.migrate(self.get_connection())
+        self._features = None
+        return applied
+
+    @_writes
+    def _drop_unavailable_triggers(self):
+        if migrations.drop_unavailable_triggers(self.get_connection().cursor()):
+            self._features = None
+
+    def _get_features(self):
+        """全文索引和标签表是否可用：SQLite 支持对应模块，且同步触发器存在（首次使用时读取一次）。"""
+        if self._features is None:
+            available = migrations.sqlite_features()
+            cursor = self.get_connection().cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN ('words_fts_ai', 'words_tags_ai')")
+            triggers = {row[0] for row in cursor.fetchall()}
+            self._features = {
+                'fts': available['fts5'] and 'words_fts_ai' in triggers,
+                'tags': available['json1'] and 'words_tags_ai' in triggers,
+            }
+        return self._features
+
+    @property
+    def fts_enabled(self):
+        """search_words 是否使用 FTS5 全文索引（否则回退到 LIKE 扫描）。"""
+        return self._get_features()['fts']
+
+    @property
+    def tag_index_enabled(self):
+        """标签过滤和标签列表是否使用 word_tags / tag_counts（否则直接读 tags 列）。"""
+        return self._get_features()['tags']
+
+    @staticmethod
+    def _escape_like(text):
+        """转义 LIKE 通配符，使关键词按字面匹配。"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @_writes
     def migrate_from_json(self):
         """Migrate data from vocab.json if DB is empty."""
         if not os.path.exists(self.json_path):
@@ -249,6 +333,7 @@ class DatabaseManager:
                     print(f"Skipping error word {item.get('word')}: {e}")
             
             conn.commit()
+            self._mark_words_changed({'op': 'reload', 'word': None, 'row': None})
             print(f"Migration complete. {len(data)} words imported.")
 
             # Optional: Rename json file to backup
@@ -260,8 +345,15 @@ class DatabaseManager:
 
     # --- CRUD Operations ---
 
+    @_writes
     def add_word(self, data):
-        """Add a new word dictionary."""
+        """
+        Add a new word dictionary.
+
+        Returns:
+            变更记录 {'op': 'insert', 'word', 'row'}（同时通知变更监听器），
+            单词已存在时返回 False。
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
@@ -280,7 +372,7 @@ class DatabaseManager:
                 0
             ))
             conn.commit()
-            return True
+            return self._mark_words_changed(self._row_change('insert', data['word']))
         except sqlite3.IntegrityError:
             return False # Already exists
 
@@ -298,6 +390,62 @@ class DatabaseManager:
             return d
         return None
 
+    def get_word_by_id(self, word_id):
+        """Get a single word as dict by primary key."""
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute('SELECT * FROM words WHERE id = ?', (word_id,))
+        row = cursor.fetchone()
+        if row:
+            d = dict(row)
+            d['mastered'] = bool(d['mastered'])
+            d['date'] = d['date_added']
+            return d
+        return None
+
+    def build_review_queue(self, now=None, cram=False, limit=None, order="random"):
+        """
+        选出本次复习的单词 id 列表。
+
+        只查询 id 列：普通模式走 idx_next_review_time 索引做范围扫描，
+        整行数据由调用方在显示卡片时再用 get_word_by_id 按需读取。
+
+        Args:
+            now: 时间戳，默认当前时间；未掌握且 next_review_time <= now 的单词为待复习
+            cram: 突击模式，包含全部单词（含已掌握、未到期的）
+            limit: 最多返回的数量，None 表示不限制
+            order: "random" 随机顺序 / "due" 按到期时间先后
+
+        Returns:
+            list[int]: 单词 id 列表
+        """
+        if now is None:
+            now = time.time()
+
+        if cram:
+            sql = 'SELECT id FROM words'
+            params = []
+            if order == "due":
+                sql += ' ORDER BY next_review_time'
+        else:
+            # "+mastered" 阻止优化器改用区分度很低的 idx_mastered
+            sql = 'SELECT id FROM words WHERE next_review_time <= ? AND +mastered = 0 ORDER BY next_review_time'
+            params = [now]
+
+        if limit is not None and order == "due":
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        cursor = self.get_connection().cursor()
+        cursor.execute(sql, params)
+        ids = [row[0] for row in cursor.fetchall()]
+
+        if order == "random":
+            random.shuffle(ids)
+            if limit is not None:
+                ids = ids[:limit]
+        return ids
+
     def get_all_words(self):
         """Get all words as list of dicts."""
         conn = self.get_connection()
@@ -314,40 +462,105 @@ class DatabaseManager:
             result.append(d)
         return result
 
+    def iter_words(self, words=None, batch_size=500):
+        """
+        流式读取单词行（按 id 顺序），每次 fetchmany 一批，内存占用与词库大小无关。
+
+        Args:
+            words: 只读取这些单词（按每批 batch_size 个参数分块查询），None 表示全部
+            batch_size: 每批读取的行数
+
+        Yields:
+            单词字典（与 get_word 格式相同）
+        """
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = sqlite3.Row
+
+        def rows_from(sql, params=()):
+            cursor.execute(sql, params)
+            while True:
+                # 刷新读连接的使用时间，避免消费方处理较慢时被连接池当作空闲连接回收
+                self.get_connection()
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    d = dict(row)
+                    d['mastered'] = bool(d['mastered'])
+                    d['date'] = d['date_added']
+                    yield d
+
+        if words is None:
+            yield from rows_from('SELECT * FROM words ORDER BY id')
+            return
+
+        words = list(words)
+        for i in range(0, len(words), batch_size):
+            chunk = words[i:i + batch_size]
+            placeholders = ','.join('?' * len(chunk))
+            yield from rows_from(f'SELECT * FROM words WHERE word IN ({placeholders}) ORDER BY id', chunk)
+
     def get_all_tags(self):
         """Get all unique tags from the database."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        cursor = self.get_connection().cursor()
+        if self.tag_index_enabled:
+            cursor.execute('SELECT tag FROM tag_counts WHERE count > 0 ORDER BY tag')
+            return [row[0] for row in cursor.fetchall()]
+
         cursor.execute('SELECT DISTINCT tags FROM words WHERE tags IS NOT NULL AND tags != ""')
-        rows = cursor.fetchall()
         tags_set = set()
-        for row in rows:
-            if row[0]:
-                for tag in row[0].split(','):
-                    tag = tag.strip()
-                    if tag:
-                        tags_set.add(tag)
-        return sorted(list(tags_set))
-
+        for row in cursor.fetchall():
+            for tag in row[0].split(','):
+                tag = tag.strip()
+                if tag:
+                    tags_set.add(tag)
+        return sorted(tags_set)
+
+    def get_tag_counts(self):
+        """返回 {标签: 单词数}，由 tag_counts 表直接读出。"""
+        if not self.tag_index_enabled:
+            counts = {}
+            cursor = self.get_connection().cursor()
+            cursor.execute('SELECT tags FROM words WHERE tags IS NOT NULL AND tags != ""')
+            for (tags,) in cursor.fetchall():
+                for tag in {t.strip() for t in tags.split(',') if t.strip()}:
+                    counts[tag] = counts.get(tag, 0) + 1
+            return counts
+
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT tag, count FROM tag_counts WHERE count > 0')
+        return dict(cursor.fetchall())
+
+    @_writes
     def update_context(self, word, en, cn):
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('UPDATE words SET context_en = ?, context_cn = ? WHERE word = ?', (en, cn, word))
         conn.commit()
+        return self._mark_words_changed(self._row_change('update', word))
 
+    @_writes
     def delete_word(self, word):
+        """Delete a word. Returns the change record, or None if the word did not exist."""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM words WHERE word = ?', (word,))
+        deleted = cursor.rowcount
         conn.commit()
+        if not deleted:
+            return None
+        return self._mark_words_changed({'op': 'delete', 'word': word, 'row': None})
 
+    @_writes
     def mark_word_mastered(self, word):
         """Mark a word as mastered."""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('UPDATE words SET mastered = 1 WHERE word = ?', (word,))
         conn.commit()
+        return self._mark_words_changed(self._row_change('update', word))
 
+    @_writes
     def update_review_status(self, word, stage, next_time, mastered, review_count_inc=True):
         """Update fields after a review."""
         conn = self.get_connection()
@@ -380,12 +593,17 @@ class DatabaseManager:
             cursor.execute('INSERT INTO review_history (word_id, review_date, rating) VALUES (?, ?, ?)', (wid, today, 1))
 
         conn.commit()
+        return self._mark_words_changed(self._row_change('update', word))
 
+    @_writes
     def update_sm2_status(self, word, easiness, interval, repetitions, next_time, rating):
-        """Update fields after a review using SM-2 algorithm."""
-        # 判断是否掌握 (例如间隔超过 180 天或重复次数超过 7 次，可自定义)
-        # 这里为了保持与旧逻辑一致，暂时不自动设为 mastered，除非间隔极大
-        mastered = 1 if interval > 180 else 0
+        """
+        Update fields after a review using SM-2 algorithm.
+
+        Returns:
+            变更记录 {'op': 'update', 'word', 'row'}，row 为更新后的整行。
+        """
+        mastered = self.sm2_mastered(interval)
 
         self.execute('''
             UPDATE words
@@ -403,6 +621,98 @@ class DatabaseManager:
                 (res[0][0], today, rating)
             )
 
+        return self._mark_words_changed(self._row_change('update', word))
+
+    @staticmethod
+    def sm2_mastered(interval):
+        """SM-2 复习后是否视为已掌握"""
+        # 判断是否掌握 (例如间隔超过 180 天或重复次数超过 7 次，可自定义)
+        # 这里为了保持与旧逻辑一致，暂时不自动设为 mastered，除非间隔极大
+        return 1 if interval > 180 else 0
+
+    def get_review_journal_seq(self):
+        """返回已写入数据库的最后一条复习日志序号（没有则为 0）"""
+        res = self.execute('SELECT last_seq FROM review_journal_state WHERE id = 1', fetch=True, commit=False)
+        return res[0][0] if res else 0
+
+    def read_with_review_journal_seq(self, method, *args):
+        """
+        在同一个读事务中调用读方法 method(*args) 并读取已写入的最后一条复习日志序号，
+        两者来自同一个数据库快照（见 ReviewJournal，用序号判断哪些事件已包含在结果中）。
+
+        Returns:
+            (method 的返回值, last_seq)
+        """
+        if self._writer.current_task() is not None:
+            return method(*args), self.get_review_journal_seq()
+        conn = self.get_connection()
+        conn.execute('BEGIN')
+        try:
+            result = method(*args)
+            cursor = conn.execute('SELECT last_seq FROM review_journal_state WHERE id = 1')
+            row = cursor.fetchone()
+        finally:
+            conn.rollback()
+        return result, row[0] if row else 0
+
+    @_writes
+    def apply_review_batch(self, events):
+        """
+        在一个事务中写入一批复习评分（见 ReviewJournal）。
+
+        每条事件更新 words 的 SM-2 字段并追加一条 review_history，
+        同时把最后一条事件的序号写入 review_journal_state。
+        序号不大于已记录值的事件会被跳过，因此同一批日志重放多次也只生效一次。
+
+        Args:
+            events: 事件字典列表，字段 seq, word, easiness, interval,
+                    repetitions, next_time, rating, review_date
+
+        Returns:
+            list: 每个受影响单词的变更记录 {'op': 'update', 'word', 'row'}
+        """
+        if not events:
+            return []
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT last_seq FROM review_journal_state WHERE id = 1')
+            row = cursor.fetchone()
+            last_seq = row[0] if row else 0
+
+            applied = [e for e in events if e['seq'] > last_seq]
+            if not applied:
+                return []
+
+            for e in applied:
+                cursor.execute('''
+                    UPDATE words
+                    SET easiness = ?, interval = ?, repetitions = ?, next_review_time = ?,
+                        mastered = ?, review_count = review_count + 1
+                    WHERE word = ?
+                ''', (e['easiness'], e['interval'], e['repetitions'], e['next_time'],
+                      self.sm2_mastered(e['interval']), e['word']))
+                cursor.execute(
+                    'INSERT INTO review_history (word_id, review_date, rating) '
+                    'SELECT id, ?, ? FROM words WHERE word = ?',
+                    (e['review_date'], e['rating'], e['word'])
+                )
+
+            cursor.execute(
+                'INSERT OR REPLACE INTO review_journal_state (id, last_seq) VALUES (1, ?)',
+                (max(e['seq'] for e in applied),)
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        changes = []
+        for word in dict.fromkeys(e['word'] for e in applied):
+            changes.append(self._mark_words_changed(self._row_change('update', word)))
+        return changes
+
     def get_review_heatmap_data(self):
         """获取过去一年的复习热力图数据 {date: count}"""
         conn = self.get_connection()
@@ -421,6 +731,17 @@ class DatabaseManager:
         rows = cursor.fetchall()
         return {row[0]: row[1] for row in rows}
 
+    def get_due_histogram(self, start_day, end_day):
+        """
+        返回 [start_day, end_day] 之间每天到期的未掌握单词数 {YYYY-MM-DD: count}。
+        读取触发器维护的 due_days 表，没有单词到期的日期不出现在结果中。
+        """
+        cursor = self.get_connection().cursor()
+        cursor.execute(
+            'SELECT day, count FROM due_days WHERE day BETWEEN ? AND ? AND count > 0',
+            (start_day, end_day))
+        return dict(cursor.fetchall())
+
     def get_word_review_history(self, word_id):
         """Get review history for a specific word"""
         conn = self.get_connection()
@@ -430,33 +751,70 @@ class DatabaseManager:
         return rows
 
     def get_statistics(self):
-        """获取学习统计信息"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # 总单词数
-        cursor.execute('SELECT COUNT(*) FROM words')
-        total = cursor.fetchone()[0]
-
-        # 已掌握数量
-        cursor.execute('SELECT COUNT(*) FROM words WHERE mastered = 1')
-        mastered = cursor.fetchone()[0]
+        """
+        获取学习统计信息。
 
-        # 今日待复习数量
-        now_ts = time.time()
-        cursor.execute('SELECT COUNT(*) FROM words WHERE mastered = 0 AND next_review_time <= ?', (now_ts,))
-        due_today = cursor.fetchone()[0]
+        总数 / 已掌握 / 新单词读自触发器维护的 word_stats 计数行，
+        待复习数见 get_due_count。
 
-        # 学习中的单词
-        learning = total - mastered
+        Returns:
+            {'total', 'mastered', 'learning', 'new', 'due_today'}，learning = total - mastered
+        """
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT total, mastered, new FROM word_stats WHERE id = 1')
+        total, mastered, new = cursor.fetchone()
 
         return {
             'total': total,
             'mastered': mastered,
-            'learning': learning,
-            'due_today': due_today
+            'learning': total - mastered,
+            'new': new,
+            'due_today': self.get_due_count()
         }
 
+    def get_due_count(self, now=None):
+        """
+        统计待复习单词数（未掌握且 next_review_time <= now）。
+
+        结果连同"下一个到期时间"一起缓存：words 没有写入且 now 还没到下一个
+        到期时间时，待复习数不可能变化，直接返回缓存。否则在 idx_next_review_time
+        上重新统计一次。
+        """
+        now_ts = time.time() if now is None else now
+
+        with self._lock:
+            cached = self._due_cache
+        if cached:
+            count, generation, computed_at, next_due = cached
+            if generation == self._words_generation and computed_at <= now_ts and (
+                    next_due is None or now_ts < next_due):
+                return count
+
+        generation = self._words_generation
+        cursor = self.get_connection().cursor()
+        # "+mastered" 让查询走 idx_next_review_time 范围扫描（同 build_review_queue）
+        cursor.execute('SELECT COUNT(*) FROM words WHERE next_review_time <= ? AND +mastered = 0', (now_ts,))
+        count = cursor.fetchone()[0]
+        cursor.execute('''SELECT next_review_time FROM words WHERE next_review_time > ? AND +mastered = 0
+                          ORDER BY next_review_time LIMIT 1''', (now_ts,))
+        row = cursor.fetchone()
+        next_due = row[0] if row else None
+
+        with self._lock:
+            self._due_cache = (count, generation, now_ts, next_due)
+        return count
+
+    def get_next_due_time(self, now=None):
+        """
+        返回 now 之后最早到期的未掌握单词的 next_review_time，没有则返回 None。
+        与 get_due_count 共用缓存。
+        """
+        now_ts = time.time() if now is None else now
+        self.get_due_count(now_ts)
+        with self._lock:
+            return self._due_cache[3]
+
+    @_writes
     def log_study_session(self, duration_seconds, review_count=0):
         """Log a study session duration."""
         if duration_seconds <= 0: return
@@ -492,8 +850,315 @@ class DatabaseManager:
         res = cursor.fetchone()
         return res[0] if res and res[0] else 0
 
+    # --- 批量操作 (Bulk Operations) ---
+
+    # 已存在的单词只用非空的新值覆盖对应字段，复习进度保持不变
+    # 批量导入：各批先写入写连接上的临时表，最后按写入顺序一次合并进 words
+    # （重复单词只用非空的新值覆盖，复习进度不变）
+    _IMPORT_COLUMNS = 'word, phonetic, meaning, example, context_en, context_cn, tags, date_added'
+    _MERGE_IMPORT_SQL = '''
+        INSERT INTO words (word, phonetic, meaning, example, context_en, context_cn, tags, date_added, next_review_time)
+        SELECT word, phonetic, meaning, example, context_en, context_cn, tags, date_added, 0
+        FROM {staging} WHERE 1 ORDER BY rowid
+        ON CONFLICT(word) DO UPDATE SET
+            phonetic = COALESCE(NULLIF(excluded.phonetic, ''), phonetic),
+            meaning = COALESCE(NULLIF(excluded.meaning, ''), meaning),
+            example = COALESCE(NULLIF(excluded.example, ''), example),
+            context_en = COALESCE(NULLIF(excluded.context_en, ''), context_en),
+            context_cn = COALESCE(NULLIF(excluded.context_cn, ''), context_cn),
+            tags = COALESCE(NULLIF(excluded.tags, ''), tags)
+    '''
+    _import_ids = itertools.count(1)
+
+    def bulk_upsert_words(self, rows, batch_size=1000, on_progress=None):
+        """
+        批量导入单词（UPSERT），整个导入在一个事务中生效：全部写入或全部不写入。
+
+        rows 在调用方线程中按批读取并整理成参数，写线程不会在事务中等待读文件。
+        每批由写线程追加到写连接上的临时表（短写操作，读取下一批与写入上一批同时进行），
+        读完后在一个写操作中把临时表合并进 words。读取或写入出错时只删除临时表。
+
+        Args:
+            rows: 单词字典的可迭代对象（可以是生成器，按批读取，不整体载入内存）
+            batch_size: 每批的行数
+            on_progress: 回调 on_progress(已读取行数)
+
+        Returns:
+            (inserted, updated): 新增和更新的单词数
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        def to_params(data):
+            return (
+                data['word'],
+                data.get('phonetic') or '',
+                data.get('meaning') or '',
+                data.get('example') or '',
+                data.get('context_en') or '',
+                data.get('context_cn') or '',
+                data.get('tags') or '',
+                data.get('date') or today,
+            )
+
+        def batches():
+            batch = []
+            for data in rows:
+                batch.append(to_params(data))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        staging = f"temp.import_{next(self._import_ids)}"
+        processed = 0
+        pending = None  # 已提交、还没等待结果的一批
+        try:
+            for batch in batches():
+                previous, pending = pending, self._writer.submit(self._stage_import_batch, staging, batch)
+                if previous is not None:
+                    previous.result()
+                processed += len(batch)
+                if on_progress:
+                    on_progress(processed)
+            previous, pending = pending, None
+            if previous is None:
+                return 0, 0
+            previous.result()
+            inserted = self._merge_import_staging(staging)
+        except BaseException:
+            # 已提交的一批执行完后再删除临时表（写线程按提交顺序执行），words 没有任何改动
+            if pending is not None:
+                try:
+                    pending.result()
+                except Exception:
+                    pass
+            try:
+                self._writer.submit(self._drop_import_staging, staging).result()
+            except Exception as e:
+                print(f"Drop import staging error: {e}")
+            raise
+        return inserted, processed - inserted
+
+    def _stage_import_batch(self, staging, params):
+        """在写线程中把一批整理好的参数追加到临时表（第一次写入时创建）。"""
+        conn = self.get_connection()
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {staging} ({self._IMPORT_COLUMNS})')
+        conn.executemany(f'INSERT INTO {staging} ({self._IMPORT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                         params)
+        conn.commit()
+
+    def _drop_import_staging(self, staging):
+        conn = self.get_connection()
+        conn.execute(f'DROP TABLE IF EXISTS {staging}')
+        conn.commit()
+
+    @_writes
+    def _merge_import_staging(self, staging):
+        """在一个事务中把临时表合并进 words 并删除临时表，返回新增的单词数。"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            # 新增数 = 临时表中 words 里还没有的不同单词
+            cursor.execute(f'''
+                SELECT COUNT(DISTINCT s.word) FROM {staging} s
+                WHERE NOT EXISTS (SELECT 1 FROM words w WHERE w.word = s.word)
+            ''')
+            inserted = cursor.fetchone()[0]
+            cursor.execute(self._MERGE_IMPORT_SQL.format(staging=staging))
+            cursor.execute(f'DROP TABLE {staging}')
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        self._mark_words_changed({'op': 'reload', 'word': None, 'row': None})
+        return inserted
+
+    # 批量操作每条语句的参数个数（低于旧版 SQLite 的 999 个参数上限）
+    _BATCH_CHUNK = 500
+
+    @_writes
+    def _run_word_batch(self, words, statements, on_progress=None):
+        """
+        按块对一组单词执行集合语句，所有块在同一个事务中提交。
+
+        Args:
+            words: 单词列表
+            statements: [(sql, 前置参数)]，sql 中的 {marks} 会替换为本块的占位符
+            on_progress: 回调 on_progress(已处理数, 总数)
+
+        Returns:
+            最后一条语句影响的总行数
+        """
+        words = list(dict.fromkeys(words))
+        if not words:
+            return 0
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        affected = 0
+        try:
+            for i in range(0, len(words), self._BATCH_CHUNK):
+                chunk = words[i:i + self._BATCH_CHUNK]
+                marks = ','.join('?' * len(chunk))
+                for sql, params in statements:
+                    cursor.execute(sql.format(marks=marks), tuple(params) + tuple(chunk))
+                affected += cursor.rowcount
+                if on_progress:
+                    on_progress(min(i + len(chunk), len(words)), len(words))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        self._mark_words_changed({'op': 'reload', 'word': None, 'row': None})
+        return affected
+
+    def delete_words(self, words, on_progress=None):
+        """批量删除单词，同时清理其复习记录和派生词关联。返回删除的单词数。"""
+        return self._run_word_batch(words, [
+            ('DELETE FROM review_history WHERE word_id IN (SELECT id FROM words WHERE word IN ({marks}))', ()),
+            ('DELETE FROM word_families WHERE word IN (SELECT lower(word) FROM words WHERE word IN ({marks}))', ()),
+            ('DELETE FROM words WHERE word IN ({marks})', ()),
+        ], on_progress)
+
+    def mark_mastered(self, words, on_progress=None):
+        """批量标记为已掌握。返回更新的单词数。"""
+        return self._run_word_batch(words, [
+            ('UPDATE words SET mastered = 1 WHERE word IN ({marks})', ()),
+        ], on_progress)
+
+    def retag(self, words, tags, on_progress=None):
+        """
+        批量设置标签（覆盖原有标签）。
+
+        Args:
+            tags: 标签列表或逗号分隔的字符串
+        """
+        if not isinstance(tags, str):
+            tags = ','.join(t.strip() for t in tags if t and t.strip())
+        return self._run_word_batch(words, [
+            ('UPDATE words SET tags = ? WHERE word IN ({marks})', (tags,)),
+        ], on_progress)
+
+    def reset_progress(self, words, on_progress=None):
+        """批量重置复习进度（恢复为新单词状态，复习记录保留）。"""
+        return self._run_word_batch(words, [
+            ('''UPDATE words
+               SET next_review_time = 0, review_count = 0, mastered = 0, stage = 0,
+                   easiness = 2.5, interval = 0, repetitions = 0
+               WHERE word IN ({marks})''', ()),
+        ], on_progress)
+
+    def get_schedule_rows(self, words=None, due_before=None):
+        """
+        读取未掌握单词的调度字段，供批量调度 (sm2_engine) 使用。
+
+        Args:
+            words: 只读取这些单词，None 表示全部
+            due_before: 只读取 next_review_time <= 该时间戳的单词
+
+        Returns:
+            [(id, easiness, interval, repetitions, stage, next_review_time)]
+        """
+        sql = '''SELECT id, easiness, interval, repetitions, stage, IFNULL(next_review_time, 0)
+                 FROM words WHERE +mastered = 0'''
+        params = []
+        if due_before is not None:
+            sql += ' AND next_review_time <= ?'
+            params.append(due_before)
+
+        cursor = self.get_connection().cursor()
+        if words is None:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+        rows = []
+        words = list(words)
+        for i in range(0, len(words), self._BATCH_CHUNK):
+            chunk = words[i:i + self._BATCH_CHUNK]
+            cursor.execute(f"{sql} AND word IN ({','.join('?' * len(chunk))})", params + chunk)
+            rows.extend(cursor.fetchall())
+        return rows
+
+    @_writes
+    def bulk_update_schedules(self, rows):
+        """
+        在一个事务中批量写回调度结果（不记录复习历史）。
+
+        Args:
+            rows: 可迭代的 (easiness, interval, repetitions, next_review_time, mastered, id)
+
+        Returns:
+            更新的单词数
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.executemany('''
+                UPDATE words SET easiness = ?, interval = ?, repetitions = ?,
+                                 next_review_time = ?, mastered = ?
+                WHERE id = ?
+            ''', rows)
+            updated = cursor.rowcount
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        self._mark_words_changed({'op': 'reload', 'word': None, 'row': None})
+        return updated
+
+    def filter_words_missing_meaning(self, words, chunk_size=500):
+        """返回 words 中在库里没有释义的单词"""
+        words = list(words)
+        missing = []
+        cursor = self.get_connection().cursor()
+        for i in range(0, len(words), chunk_size):
+            chunk = words[i:i + chunk_size]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f"SELECT word FROM words WHERE word IN ({placeholders}) AND (meaning IS NULL OR meaning = '')",
+                chunk
+            )
+            missing.extend(row[0] for row in cursor.fetchall())
+        return missing
+
+    @_writes
+    def bulk_fill_missing(self, entries):
+        """
+        在一个事务中为缺少释义的单词补全字段（只填充空字段）。
+
+        Args:
+            entries: 字典列表，字段 word, phonetic, meaning, example
+
+        Returns:
+            更新的单词数
+        """
+        if not entries:
+            return 0
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.executemany('''
+                UPDATE words SET
+                    phonetic = COALESCE(NULLIF(phonetic, ''), ?),
+                    meaning = ?,
+                    example = COALESCE(NULLIF(example, ''), ?)
+                WHERE word = ? AND (meaning IS NULL OR meaning = '')
+            ''', [(e.get('phonetic') or '', e['meaning'], e.get('example') or '', e['word']) for e in entries])
+            updated = cursor.rowcount
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        if updated:
+            self._mark_words_changed({'op': 'reload', 'word': None, 'row': None})
+        return updated
+
     # --- Word Family Operations (派生词群组) ---
 
+    @_writes
     def add_word_family(self, root, root_meaning, word):
         """Add a word to a word family."""
         conn = self.get_connection()
@@ -509,6 +1174,7 @@ class DatabaseManager:
             print(f"Add word family error: {e}")
             return False
 
+    @_writes
     def add_word_families_batch(self, root, root_meaning, words):
         """Add multiple words to a word family."""
         conn = self.get_connection()
@@ -567,39 +1233,81 @@ class DatabaseManager:
 
     # --- 搜索与分页 (性能优化) ---
 
-    def search_words(self, keyword="", tag_filter="", mastered_filter=None, status_filter=None, sort_by="next_review_time", sort_order="ASC", limit=50, offset=0):
-        """
-        在数据库层进行搜索和过滤，避免内存中遍历全部单词。
+    # 列表页排序：待复习(按到期时间) > 新单词 > 学习中(按到期时间) > 已掌握
+    _STATUS_RANK_SQL = '''CASE WHEN mastered = 1 THEN 3
+                               WHEN IFNULL(next_review_time, 0) = 0 THEN 1
+                               WHEN next_review_time <= ? THEN 0
+                               ELSE 2 END'''
+    _STATUS_TIME_SQL = '''CASE WHEN mastered = 1 THEN 0
+                               ELSE IFNULL(next_review_time, 0) END'''
 
-        Args:
-            keyword: 搜索关键词（匹配 word 或 meaning）
-            tag_filter: 标签过滤（如 "CET4", "GRE"）
-            mastered_filter: 掌握状态过滤 (True/False/None)
-            status_filter: 复习状态过滤 ("due"=待复习, "new"=新单词, "learning"=学习中, None=全部)
-            sort_by: 排序字段
-            sort_order: 排序方向 (ASC/DESC)
-            limit: 返回数量限制
-            offset: 偏移量（用于分页）
+    # 与时间相关的过滤条件，其计数缓存需要定期失效
+    _COUNT_CACHE_TTL = 60
+
+    @property
+    def words_generation(self):
+        """words 表的写入代数，每次写入后递增，可用于判断缓存是否过期。"""
+        return self._words_generation
+
+    def _mark_words_changed(self, change=None):
+        """
+        words 表发生写入后调用：使计数缓存失效，并把变更记录分发给监听器。
+        在写线程中只记录变更，等事务提交后再生效（见 _on_writes_committed）。
 
         Returns:
-            (list[dict], int): (单词列表, 总匹配数量)
+            传入的 change，便于写方法直接 return。
         """
-        conn = self.get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        task = self._writer.current_task()
+        if task is not None:
+            task.changes.append(change)
+            return change
+        self._words_generation += 1
+        self._dispatch_changes([change])
+        return change
+
+    def _on_writes_committed(self, changes):
+        """写线程提交一批写入后调用：提交之后才使缓存失效，避免读线程用旧数据填充新缓存。"""
+        self._words_generation += len(changes)
+
+    def _dispatch_changes(self, changes):
+        for change in changes:
+            if change is None:
+                continue
+            for listener in list(self._change_listeners):
+                try:
+                    listener(change)
+                except Exception as e:
+                    print(f"Change listener error: {e}")
+
+    # 关键词搜索的列，与 words_fts 全文索引的列相同（见 migrations）
+    _SEARCH_COLUMNS = ('word', 'meaning', 'example', 'context_en', 'context_cn')
 
-        # 构建 WHERE 子句
+    def _build_search_conditions(self, keyword="", tag_filter="", mastered_filter=None, status_filter=None, now_ts=None):
+        """构建 search_words / count_words 共用的 WHERE 子句，返回 (where_clause, params)。"""
         conditions = []
         params = []
 
         if keyword:
-            conditions.append("(word LIKE ? OR meaning LIKE ?)")
-            like_pattern = f"%{keyword}%"
-            params.extend([like_pattern, like_pattern])
+            if self.fts_enabled and len(keyword) >= 3:
+                # FTS5 trigram 索引：覆盖 word/meaning/example/语境，避免全表扫描
+                conditions.append("id IN (SELECT rowid FROM words_fts WHERE words_fts MATCH ?)")
+                params.append('"' + keyword.replace('"', '""') + '"')
+            else:
+                # trigram 至少需要 3 个字符；短关键词（如一两个汉字）或无 FTS5 时回退到 LIKE，
+                # 搜索与全文索引相同的列，结果不因关键词长度而变化
+                conditions.append("(" + " OR ".join(
+                    f"{column} LIKE ? ESCAPE '\\'" for column in self._SEARCH_COLUMNS) + ")")
+                like_pattern = f"%{self._escape_like(keyword)}%"
+                params.extend([like_pattern] * len(self._SEARCH_COLUMNS))
 
         if tag_filter:
-            conditions.append("tags LIKE ?")
-            params.append(f"%{tag_filter}%")
+            if self.tag_index_enabled:
+                # 按标签精确匹配，走 word_tags 主键索引（CET4 不会匹配到 CET4X）
+                conditions.append("id IN (SELECT word_id FROM word_tags WHERE tag = ?)")
+                params.append(tag_filter)
+            else:
+                conditions.append("(',' || replace(IFNULL(tags, ''), ', ', ',') || ',') LIKE ? ESCAPE '\\'")
+                params.append(f"%,{self._escape_like(tag_filter)},%")
 
         if mastered_filter is not None:
             conditions.append("mastered = ?")
@@ -607,7 +1315,8 @@ class DatabaseManager:
 
         # 复习状态过滤（基于 next_review_time）
         if status_filter:
-            now_ts = time.time()
+            if now_ts is None:
+                now_ts = time.time()
             if status_filter == "due":
                 # 待复习：未掌握 且 next_review_time > 0 且 <= 当前时间
                 conditions.append("mastered = 0 AND next_review_time > 0 AND next_review_time <= ?")
@@ -621,37 +1330,157 @@ class DatabaseManager:
                 params.append(now_ts)
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return where_clause, params
 
-        # 验证排序字段（防止 SQL 注入）
-        valid_sort_fields = {"word", "next_review_time", "date_added", "review_count", "mastered", "easiness", "interval"}
-        if sort_by not in valid_sort_fields:
-            sort_by = "next_review_time"
-        if sort_order.upper() not in ("ASC", "DESC"):
-            sort_order = "ASC"
-
-        # 查询总数
-        count_sql = f"SELECT COUNT(*) FROM words WHERE {where_clause}"
-        cursor.execute(count_sql, params)
-        total_count = cursor.fetchone()[0]
-
-        # 查询数据
-        query_sql = f"""
-            SELECT * FROM words
-            WHERE {where_clause}
-            ORDER BY {sort_by} {sort_order}
-            LIMIT ? OFFSET ?
-        """
-        cursor.execute(query_sql, params + [limit, offset])
-        rows = cursor.fetchall()
+    @staticmethod
+    def _encode_cursor(now_ts, row):
+        """把一页最后一行的排序键编码为游标字符串。"""
+        return f"{now_ts!r}:{row['match_rank']}:{row['status_rank']}:{row['status_time']!r}:{row['id']}"
+
+    @staticmethod
+    def _decode_cursor(token):
+        """解析游标，返回 (now_ts, (match_rank, status_rank, status_time, id))。"""
+        try:
+            now_ts, match_rank, status_rank, status_time, row_id = token.split(':')
+            return float(now_ts), (int(match_rank), int(status_rank), float(status_time), int(row_id))
+        except (AttributeError, ValueError):
+            raise ValueError(f"Invalid search cursor: {token!r}")
+
+    def search_words(self, keyword="", tag_filter="", mastered_filter=None, status_filter=None, sort_by="next_review_time", sort_order="ASC", limit=50, offset=0, cursor=None, now=None):
+        """
+        在数据库层进行搜索和过滤，避免内存中遍历全部单词。
+
+        sort_by="status" 时按列表页的复习状态排序（待复习 > 新单词 > 学习中 > 已掌握），
+        排序键在 SQL 中计算，并使用游标（keyset）分页：传入上一页返回的 next_cursor
+        即可取下一页，不需要 OFFSET 跳过前面的行。
+
+        Args:
+            keyword: 搜索关键词（匹配 word/meaning/example/语境，3 个字符以上且 FTS5 可用时
+                     走全文索引，否则用 LIKE；单词前缀匹配的结果排在前面）
+            tag_filter: 标签过滤（如 "CET4", "GRE"）
+            mastered_filter: 掌握状态过滤 (True/False/None)
+            status_filter: 复习状态过滤 ("due"=待复习, "new"=新单词, "learning"=学习中, None=全部)
+            sort_by: 排序字段，或 "status"（复习状态排序 + 游标分页）
+            sort_order: 排序方向 (ASC/DESC)，sort_by="status" 时忽略
+            limit: 返回数量限制
+            offset: 偏移量（用于分页），sort_by="status" 时忽略
+            cursor: 上一页返回的游标（仅 sort_by="status"），None 表示第一页
+            now: 计算"待复习"所用的时间戳，默认当前时间；带游标时沿用游标中的时间
+
+        Returns:
+            (list[dict], int, str|None): (单词列表, 总匹配数量, 下一页游标)
+            仅 sort_by="status" 且可能还有下一页时返回游标，否则为 None。
+        """
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        db_cursor.row_factory = sqlite3.Row
+
+        after_key = None
+        if cursor:
+            now, after_key = self._decode_cursor(cursor)
+        now_ts = time.time() if now is None else now
+
+        where_clause, params = self._build_search_conditions(keyword, tag_filter, mastered_filter, status_filter, now_ts)
+        total_count = self.count_words(keyword, tag_filter, mastered_filter, status_filter, now_ts)
+
+        # 有关键词时，单词完全匹配 > 前缀匹配 > 其他匹配
+        match_rank_sql = "0"
+        match_params = []
+        if keyword:
+            match_rank_sql = "CASE WHEN word = ? COLLATE NOCASE THEN 0 WHEN word LIKE ? ESCAPE '\\' THEN 1 ELSE 2 END"
+            match_params = [keyword, f"{self._escape_like(keyword)}%"]
+
+        next_cursor = None
+        if sort_by == "status":
+            keyset_clause = ""
+            keyset_params = []
+            if after_key:
+                keyset_clause = "WHERE (match_rank, status_rank, status_time, id) > (?, ?, ?, ?)"
+                keyset_params = list(after_key)
+
+            query_sql = f"""
+                SELECT * FROM (
+                    SELECT *, {match_rank_sql} AS match_rank,
+                           {self._STATUS_RANK_SQL} AS status_rank,
+                           {self._STATUS_TIME_SQL} AS status_time
+                    FROM words
+                    WHERE {where_clause}
+                )
+                {keyset_clause}
+                ORDER BY match_rank, status_rank, status_time, id
+                LIMIT ?
+            """
+            db_cursor.execute(query_sql, match_params + [now_ts] + params + keyset_params + [limit])
+            rows = db_cursor.fetchall()
+            if len(rows) == limit:
+                next_cursor = self._encode_cursor(now_ts, rows[-1])
+        else:
+            # 验证排序字段（防止 SQL 注入）
+            valid_sort_fields = {"word", "next_review_time", "date_added", "review_count", "mastered", "easiness", "interval"}
+            if sort_by not in valid_sort_fields:
+                sort_by = "next_review_time"
+            if sort_order.upper() not in ("ASC", "DESC"):
+                sort_order = "ASC"
+
+            # 没有关键词时不加匹配排名：常量 "0" 会被 SQLite 当作列序号
+            order_sql = f"{match_rank_sql}, {sort_by} {sort_order}" if keyword else f"{sort_by} {sort_order}"
+            query_sql = f"""
+                SELECT * FROM words
+                WHERE {where_clause}
+                ORDER BY {order_sql}
+                LIMIT ? OFFSET ?
+            """
+            db_cursor.execute(query_sql, params + match_params + [limit, offset])
+            rows = db_cursor.fetchall()
 
         result = []
         for row in rows:
             d = dict(row)
+            for key in ('match_rank', 'status_rank', 'status_time'):
+                d.pop(key, None)
             d['mastered'] = bool(d['mastered'])
             d['date'] = d['date_added']
             result.append(d)
 
-        return result, total_count
+        return result, total_count, next_cursor
+
+    def count_words(self, keyword="", tag_filter="", mastered_filter=None, status_filter=None, now=None):
+        """
+        统计匹配过滤条件的单词数量（带缓存）。
+
+        缓存在 words 表写入后失效；"待复习"/"学习中"的数量随时间变化，
+        额外在 _COUNT_CACHE_TTL 秒后失效。翻页时不会重复执行 COUNT。
+        """
+        key = (keyword, tag_filter, mastered_filter, status_filter)
+        now_ts = time.time() if now is None else now
+
+        with self._lock:
+            cached = self._count_cache.get(key)
+        if cached:
+            count, generation, computed_at = cached
+            time_dependent = status_filter in ("due", "learning")
+            if generation == self._words_generation and (
+                    not time_dependent or abs(now_ts - computed_at) < self._COUNT_CACHE_TTL):
+                return count
+
+        generation = self._words_generation
+        where_clause, params = self._build_search_conditions(keyword, tag_filter, mastered_filter, status_filter, now_ts)
+        cursor = self.get_connection().cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM words WHERE {where_clause}", params)
+        count = cursor.fetchone()[0]
+
+        with self._lock:
+            if len(self._count_cache) > 256:
+                self._count_cache.clear()
+            self._count_cache[key] = (count, generation, now_ts)
+        return count
+
+    def get_matching_words(self, keyword="", tag_filter="", mastered_filter=None, status_filter=None, now=None):
+        """返回匹配过滤条件的全部单词文本（只取 word 列，用于列表页全选）。"""
+        where_clause, params = self._build_search_conditions(keyword, tag_filter, mastered_filter, status_filter, now)
+        cursor = self.get_connection().cursor()
+        cursor.execute(f"SELECT word FROM words WHERE {where_clause}", params)
+        return [row[0] for row in cursor.fetchall()]
 
     def get_words_count(self):
         """获取单词总数"""
@@ -661,6 +1490,14 @@ class DatabaseManager:
         return cursor.fetchone()[0]
 
     # --- 词典缓存操作 (Dict Cache) ---
+    # 数据以 zlib 压缩的 JSON 存储。过期和超出容量的记录由后台维护任务
+    # (maintain_dict_cache) 分小批删除，读写路径上不做清理。
+
+    # 词典缓存有效期（秒）和压缩后的总容量上限（字节）
+    dict_cache_ttl = 86400
+    dict_cache_max_bytes = 20 * 1024 * 1024
+    # 后台清理每批删除的记录数，避免长时间占用写线程
+    _DICT_CACHE_BATCH = 200
 
     def get_dict_cache(self, word, source, ttl=86400):
         """
@@ -674,31 +1511,29 @@ class DatabaseManager:
         Returns:
             缓存的数据字典，或 None（未找到/已过期）
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
+        cursor = self.get_connection().cursor()
         now = time.time()
         cursor.execute('''
-            SELECT data, created_at FROM dict_cache
+            SELECT payload, data, created_at FROM dict_cache
             WHERE word = ? AND source = ?
         ''', (word.lower(), source))
 
         row = cursor.fetchone()
-        if row:
-            data_json, created_at = row
-            # 检查是否过期
-            if now - created_at < ttl:
-                try:
-                    return json.loads(data_json)
-                except (json.JSONDecodeError, TypeError):
-                    return None
-            else:
-                # 过期，删除旧缓存
-                cursor.execute('DELETE FROM dict_cache WHERE word = ? AND source = ?',
-                              (word.lower(), source))
-                conn.commit()
-        return None
+        if not row or now - row[2] >= ttl:
+            return None  # 过期记录由后台维护任务删除
+        payload, data_json = row[0], row[1]
+        try:
+            if payload is not None:
+                data_json = zlib.decompress(payload).decode('utf-8')
+            result = json.loads(data_json)
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError, TypeError):
+            return None
+        # 访问时间先记在内存里，由维护任务批量写回（读缓存不产生写入）
+        with self._lock:
+            self._dict_cache_access[(word.lower(), source)] = now
+        return result
 
+    @_writes
     def set_dict_cache(self, word, source, data):
         """
         设置词典缓存。
@@ -713,17 +1548,67 @@ class DatabaseManager:
 
         try:
             data_json = json.dumps(data, ensure_ascii=False)
+            raw = data_json.encode('utf-8')
+            payload = zlib.compress(raw)
+            if len(payload) < len(raw):
+                data_json = None
+            else:
+                payload = None  # 很短的结果压缩后反而更大，直接存 JSON 文本
+            now = time.time()
             cursor.execute('''
-                INSERT OR REPLACE INTO dict_cache (word, source, data, created_at)
-                VALUES (?, ?, ?, ?)
-            ''', (word.lower(), source, data_json, time.time()))
+                INSERT OR REPLACE INTO dict_cache (word, source, data, payload, raw_size, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (word.lower(), source, data_json, payload, len(raw), len(payload or raw), now, now))
             conn.commit()
         except Exception as e:
             print(f"Set dict cache error: {e}")
 
+    @_writes
+    def _flush_dict_cache_access(self):
+        """把内存中记录的缓存访问时间写回 last_access。"""
+        with self._lock:
+            touched, self._dict_cache_access = self._dict_cache_access, {}
+        if touched:
+            conn = self.get_connection()
+            conn.executemany(
+                'UPDATE dict_cache SET last_access = ? WHERE word = ? AND source = ?',
+                [(at, word, source) for (word, source), at in touched.items()]
+            )
+            conn.commit()
+        return len(touched)
+
+    @_writes
+    def _delete_dict_cache_batch(self, where, params=(), order_by='id', max_bytes=None):
+        """
+        删除一批（最多 _DICT_CACHE_BATCH 条）满足条件的缓存记录，每批是写线程中的一个短写操作。
+        给定 max_bytes 时，释放的字节数达到 max_bytes 后不再继续删除。
+
+        Returns:
+            (删除的记录数, 释放的压缩后字节数)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            f'SELECT id, IFNULL(size, LENGTH(data)) FROM dict_cache WHERE {where} ORDER BY {order_by} LIMIT ?',
+            (*params, self._DICT_CACHE_BATCH)
+        )
+        rows = cursor.fetchall()
+        if max_bytes is not None:
+            freed = 0
+            for i, row in enumerate(rows):
+                freed += row[1] or 0
+                if freed >= max_bytes:
+                    rows = rows[:i + 1]
+                    break
+        if rows:
+            placeholders = ','.join('?' * len(rows))
+            cursor.execute(f'DELETE FROM dict_cache WHERE id IN ({placeholders})', [row[0] for row in rows])
+            conn.commit()
+        return len(rows), sum(row[1] or 0 for row in rows)
+
     def clear_expired_dict_cache(self, ttl=86400):
         """
-        清理过期的词典缓存。
+        清理过期的词典缓存（分批删除）。
 
         Args:
             ttl: 缓存有效期（秒），默认 24 小时
@@ -731,29 +1616,76 @@ class DatabaseManager:
         Returns:
             删除的记录数
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         expired_time = time.time() - ttl
-        cursor.execute('DELETE FROM dict_cache WHERE created_at < ?', (expired_time,))
-        deleted = cursor.rowcount
-        conn.commit()
-        return deleted
+        deleted = 0
+        while True:
+            count, _ = self._delete_dict_cache_batch('created_at < ?', (expired_time,))
+            deleted += count
+            if count < self._DICT_CACHE_BATCH:
+                return deleted
+
+    def evict_dict_cache(self, max_bytes):
+        """
+        按最近访问时间 (LRU) 淘汰缓存，直到压缩后总大小不超过 max_bytes 的 90%
+        （留出余量，避免每次维护都只淘汰几条）。
+
+        Returns:
+            淘汰的记录数
+        """
+        cursor = self.get_connection().cursor()
+        cursor.execute('SELECT IFNULL(SUM(IFNULL(size, LENGTH(data))), 0) FROM dict_cache')
+        total = cursor.fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        evicted = 0
+        target = int(max_bytes * 0.9)
+        while total > target:
+            count, freed = self._delete_dict_cache_batch('1', order_by='last_access', max_bytes=total - target)
+            if not count:
+                break
+            evicted += count
+            total -= freed
+        return evicted
+
+    def maintain_dict_cache(self):
+        """
+        词典缓存后台维护：写回访问时间、删除过期记录、按 LRU 淘汰超出容量的记录。
+
+        Returns:
+            dict: {'expired', 'evicted'}
+        """
+        self._flush_dict_cache_access()
+        return {
+            'expired': self.clear_expired_dict_cache(self.dict_cache_ttl),
+            'evicted': self.evict_dict_cache(self.dict_cache_max_bytes),
+        }
 
     def get_dict_cache_stats(self):
-        """获取词典缓存统计信息"""
+        """
+        获取词典缓存统计信息
+
+        Returns:
+            dict: total / by_source / bytes（压缩后大小）/ raw_bytes（压缩前大小）/
+                  saved_bytes（压缩节省的字节数）
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT COUNT(*) FROM dict_cache')
-        total = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT COUNT(*), IFNULL(SUM(IFNULL(size, LENGTH(data))), 0),
+                   IFNULL(SUM(IFNULL(raw_size, LENGTH(data))), 0)
+            FROM dict_cache
+        ''')
+        total, size, raw_size = cursor.fetchone()
 
         # 按来源统计
         cursor.execute('SELECT source, COUNT(*) FROM dict_cache GROUP BY source')
         by_source = {row[0]: row[1] for row in cursor.fetchall()}
 
-        return {'total': total, 'by_source': by_source}
+        return {'total': total, 'by_source': by_source, 'bytes': size,
+                'raw_bytes': raw_size, 'saved_bytes': raw_size - size}
 
+    @_writes
     def clear_all_dict_cache(self):
         """清空所有词典缓存"""
         conn = self.get_connection()
@@ -761,4 +1693,6 @@ class DatabaseManager:
         cursor.execute('DELETE FROM dict_cache')
         deleted = cursor.rowcount
         conn.commit()
+        with self._lock:
+            self._dict_cache_access = {}
         return deleted
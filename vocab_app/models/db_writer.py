@@ -0,0 +1,271 @@
+"""
+DatabaseWriter - 单写线程
+
+所有写操作提交到队列，由唯一的写线程在唯一的写连接上执行：
+1. 写入之间不会争抢数据库锁，不再需要 "database is locked" 重试
+2. 组提交：写线程每次取出队列中全部待执行的写操作（最多 max_batch 个），放在
+   同一个事务中执行。每个写操作包在自己的 SAVEPOINT 里，失败只回滚它自己，
+   整批只提交一次
+3. submit_standalone()：不放进事务单独执行的操作（PRAGMA optimize、WAL 检查点等）
+4. submit() 返回 concurrent.futures.Future，事务提交后才完成，
+   调用方拿到结果时其他连接已经能读到这次写入
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+
+class _WriterConnection(sqlite3.Connection):
+    """写连接：组提交期间 commit() 推迟到整批结束，rollback() 只回滚当前写操作。"""
+
+    batching = False
+
+    def commit(self):
+        if not self.batching:
+            super().commit()
+
+    def rollback(self):
+        if self.batching:
+            self.execute('ROLLBACK TO write_task')
+        else:
+            super().rollback()
+
+
+class WriteTask:
+    """队列中的一个写操作。changes 收集该写操作产生的 words 变更记录，提交后交给调用方。"""
+
+    __slots__ = ('fn', 'args', 'kwargs', 'future', 'changes', 'standalone')
+
+    def __init__(self, fn, args, kwargs, standalone=False):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.standalone = standalone
+        self.future = Future()
+        self.future.changes = self.changes = []
+
+
+class DatabaseWriter:
+    def __init__(self, db_path, configure=None, max_batch=64, on_commit=None, cached_statements=128):
+        """
+        Args:
+            db_path: 数据库文件路径
+            configure: 打开写连接后调用 configure(conn) 设置 PRAGMA
+            max_batch: 一个事务最多合并的写操作数
+            on_commit: 每批提交成功后在写线程中调用 on_commit(changes)，
+                       changes 为本批成功写操作的变更记录
+            cached_statements: 写连接的预编译语句缓存条数
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self._configure = configure
+        self._on_commit = on_commit
+        self._cached_statements = cached_statements
+
+        self._queue = queue.SimpleQueue()
+        self._conn = None
+        self._current = None  # 写线程正在执行的 WriteTask
+        self._closed = False
+
+        self._metrics = {
+            'writes': 0,
+            'failed_writes': 0,
+            'write_batches': 0,
+            'max_write_batch': 0,
+            'write_time': 0.0,
+        }
+
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    # --- 提交写操作 ---
+
+    def on_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def current_task(self):
+        """在写线程的写操作内部调用时返回当前 WriteTask，否则返回 None。"""
+        return self._current if self.on_writer_thread() else None
+
+    @property
+    def connection(self):
+        """写连接，只能在写线程中使用。"""
+        return self._conn
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        提交写操作 fn(*args, **kwargs)，返回 Future。
+
+        fn 在写线程中执行，内部通过 connection 访问写连接，可以照常调用
+        commit()/rollback()。在写线程的写操作内部不要调用 submit，直接执行即可。
+        """
+        return self._submit(WriteTask(fn, args, kwargs))
+
+    def submit_standalone(self, fn, *args, **kwargs):
+        """提交不能在事务中执行的操作，在当前批次之后单独执行（写连接处于自动提交状态）。"""
+        return self._submit(WriteTask(fn, args, kwargs, standalone=True))
+
+    def _submit(self, task):
+        if self._closed:
+            raise sqlite3.ProgrammingError("database writer is closed")
+        if self.on_writer_thread():
+            # 写线程中的提交回调又发起写入：就地执行，避免等待自己
+            self._run_task(task)
+        else:
+            self._queue.put(task)
+        return task.future
+
+    # --- 写线程 ---
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=_WriterConnection,
+                               cached_statements=self._cached_statements)
+        if self._configure:
+            self._configure(conn)
+        return conn
+
+    def _reset_connection(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            task = self._queue.get()
+            if task is None:
+                break
+            if task.standalone:
+                self._run_standalone(task)
+                continue
+            batch = [task]
+            standalone = None
+            while len(batch) < self.max_batch:
+                try:
+                    task = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if task is None:
+                    stopping = True
+                    break
+                if task.standalone:
+                    standalone = task
+                    break
+                batch.append(task)
+            self._run_batch(batch)
+            if standalone is not None:
+                self._run_standalone(standalone)
+
+    def _run_task(self, task):
+        if task.standalone:
+            self._run_standalone(task)
+        else:
+            self._run_batch([task])
+
+    def _run_standalone(self, task):
+        if not task.future.set_running_or_notify_cancel():
+            return
+        try:
+            if self._conn is None:
+                self._conn = self._connect()
+            self._current = task
+            result = task.fn(*task.args, **task.kwargs)
+        except Exception as e:
+            task.future.set_exception(e)
+        else:
+            task.future.set_result(result)
+        finally:
+            self._current = None
+
+    def _run_batch(self, batch):
+        started = time.perf_counter()
+        succeeded = []
+        failed = []
+        try:
+            if self._conn is None:
+                self._conn = self._connect()
+            conn = self._conn
+            conn.execute('BEGIN IMMEDIATE')
+            conn.batching = True
+            try:
+                for task in batch:
+                    if not task.future.set_running_or_notify_cancel():
+                        continue
+                    self._current = task
+                    conn.execute('SAVEPOINT write_task')
+                    try:
+                        result = task.fn(*task.args, **task.kwargs)
+                    except Exception as e:
+                        conn.execute('ROLLBACK TO write_task')
+                        conn.execute('RELEASE write_task')
+                        task.changes.clear()
+                        failed.append((task, e))
+                    else:
+                        conn.execute('RELEASE write_task')
+                        succeeded.append((task, result))
+                    finally:
+                        self._current = None
+            finally:
+                conn.batching = False
+            conn.commit()
+        except sqlite3.Error as e:
+            # 事务本身失败（磁盘错误、连接损坏等）：整批回滚，下次重新打开写连接
+            self._current = None
+            try:
+                if self._conn is not None:
+                    self._conn.rollback()
+            except sqlite3.Error:
+                pass
+            self._reset_connection()
+            own_errors = {id(task): error for task, error in failed}
+            failed = [(task, own_errors.get(id(task), e)) for task in batch if not task.future.cancelled()]
+            succeeded = []
+
+        if succeeded and self._on_commit:
+            try:
+                self._on_commit([change for task, _ in succeeded for change in task.changes])
+            except Exception as e:
+                print(f"Write commit hook error: {e}")
+
+        m = self._metrics
+        m['writes'] += len(succeeded)
+        m['failed_writes'] += len(failed)
+        m['write_batches'] += 1
+        m['max_write_batch'] = max(m['max_write_batch'], len(batch))
+        m['write_time'] += time.perf_counter() - started
+
+        for task, result in succeeded:
+            task.future.set_result(result)
+        for task, error in failed:
+            if not task.future.done():
+                task.future.set_exception(error)
+
+    # --- 生命周期与指标 ---
+
+    def close(self, timeout=10):
+        """执行完已提交的写操作后停止写线程并关闭写连接。"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        if not self.on_writer_thread():
+            self._thread.join(timeout)
+        self._reset_connection()
+
+    def stats(self):
+        """
+        写线程指标。
+
+        Returns:
+            dict: queued_writes / writes / failed_writes / write_batches / max_write_batch /
+                  write_time（秒）
+        """
+        stats = dict(self._metrics)
+        stats['queued_writes'] = self._queue.qsize()
+        return stats
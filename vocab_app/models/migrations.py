@@ -0,0 +1,520 @@
+"""
+数据库结构版本迁移
+
+PRAGMA user_version 记录数据库已执行到的迁移版本。MIGRATIONS 为按版本号排序的
+(版本号, 说明, 迁移函数) 列表，migrate() 只执行版本号大于 user_version 的迁移，
+每个迁移与更新 user_version 在同一个事务中完成。已是最新版本的数据库启动时
+只读取一次 user_version，不再执行任何建表语句。
+
+迁移函数签名为 migrate(cursor)，只使用 SQL，不依赖 DatabaseManager，
+可以对任意连接单独执行和检查：
+
+    conn = sqlite3.connect(':memory:')
+    migrations.migrate(conn)
+
+新增表、索引或触发器时在 MIGRATIONS 末尾追加一个新版本，不要修改已发布的迁移。
+引入版本号之前创建的数据库 user_version 为 0，会从第 1 个迁移开始执行；
+这些迁移都可以在已有对应结构的数据库上重复执行。
+"""
+
+import sqlite3
+import zlib
+
+# 把逗号分隔的 tags 列转成 JSON 数组文本，供 json_each 拆分（转义引号、反斜杠和控制字符）
+TAG_ARRAY_SQL = (
+    "'[\"' || replace(replace(replace(replace(replace(replace({col}, "
+    "'\\', '\\\\'), '\"', '\\\"'), char(9), ' '), char(10), ' '), char(13), ' '), "
+    "',', '\",\"') || '\"]'"
+)
+
+# 单词是否计入"新单词"：未掌握且从未安排过复习
+IS_NEW_SQL = "({r}.mastered = 0 AND IFNULL({r}.next_review_time, 0) = 0)"
+
+# 单词是否计入到期直方图：未掌握且已安排了复习时间
+IS_SCHEDULED_SQL = "({r}.mastered = 0 AND IFNULL({r}.next_review_time, 0) > 0)"
+DUE_DAY_SQL = "date({r}.next_review_time, 'unixepoch', 'localtime')"
+
+
+def sqlite_features():
+    """当前 SQLite 是否支持 FTS5 (trigram) 和 JSON1，结果在进程内缓存（只用内存数据库检查）。"""
+    global _features
+    if _features is None:
+        conn = sqlite3.connect(':memory:')
+        features = {}
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+            features['fts5'] = True
+        except sqlite3.OperationalError:
+            features['fts5'] = False
+        try:
+            conn.execute("SELECT value FROM json_each('[]')")
+            features['json1'] = True
+        except sqlite3.OperationalError:
+            features['json1'] = False
+        conn.close()
+        _features = features
+    return _features
+
+
+_features = None
+
+# 依赖可选模块的同步触发器：模块不可用时必须移除，否则对 words 的写入会失败
+FTS_TRIGGERS = ('words_fts_ai', 'words_fts_ad', 'words_fts_au')
+TAG_TRIGGERS = ('words_tags_ai', 'words_tags_ad', 'words_tags_au')
+
+
+def _drop_triggers(cursor, triggers):
+    for trigger in triggers:
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+
+
+def drop_unavailable_triggers(cursor, features=None):
+    """
+    移除当前 SQLite 缺少的模块对应的同步触发器（数据库从支持 FTS5/JSON1 的环境拷贝过来时）。
+    索引表保留，但没有触发器时不再使用，对应功能回退到直接扫描 words。
+
+    Returns:
+        移除的触发器数量
+    """
+    features = features or sqlite_features()
+    triggers = ()
+    if not features['fts5']:
+        triggers += FTS_TRIGGERS
+    if not features['json1']:
+        triggers += TAG_TRIGGERS
+    if not triggers:
+        return 0
+    placeholders = ','.join('?' * len(triggers))
+    cursor.execute(f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})", triggers)
+    count = cursor.fetchone()[0]
+    if count:
+        _drop_triggers(cursor, triggers)
+    return count
+
+
+def _base_schema(cursor):
+    """基础表和索引"""
+    # Main words table
+    # We pre-add SM-2 algorithm fields (easiness, interval, repetitions) for Step 2
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS words (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT UNIQUE NOT NULL,
+            phonetic TEXT,
+            meaning TEXT,
+            example TEXT,
+            roots TEXT,          -- New: Root/Affix
+            synonyms TEXT,       -- New: Synonyms
+            context_en TEXT,
+            context_cn TEXT,
+            date_added TEXT,
+
+            next_review_time REAL DEFAULT 0,
+            review_count INTEGER DEFAULT 0,
+            mastered INTEGER DEFAULT 0,  -- 0: Learning, 1: Mastered
+
+            -- Fields for Old Logic (Stage) and Future SM-2
+            stage INTEGER DEFAULT 0,      -- Currently used for "1,2,4,7..." logic
+            easiness REAL DEFAULT 2.5,    -- For SM-2
+            interval INTEGER DEFAULT 0,   -- For SM-2
+            repetitions INTEGER DEFAULT 0, -- For SM-2
+            tags TEXT                      -- New: Exam tags (CET4, GRE, etc.)
+        )
+    ''')
+
+    # History table for Heatmap (Step 3 preparation)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word_id INTEGER,
+            review_date TEXT,  -- YYYY-MM-DD
+            rating INTEGER,    -- 0=Forgot, 1=Remembered (Simple) / 1-4 (SM-2)
+            FOREIGN KEY(word_id) REFERENCES words(id)
+        )
+    ''')
+
+    # Word families table for derivative words (派生词群组)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS word_families (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            root TEXT NOT NULL,           -- 词根 (e.g., "creat")
+            root_meaning TEXT,            -- 词根释义 (e.g., "创造")
+            word TEXT NOT NULL,           -- 单词 (e.g., "create")
+            UNIQUE(root, word)
+        )
+    ''')
+
+    # Study Statistics table (Step 4: Review Timer & Stats)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS study_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT UNIQUE NOT NULL,    -- YYYY-MM-DD
+            total_duration INTEGER DEFAULT 0, -- Seconds
+            review_count INTEGER DEFAULT 0
+        )
+    ''')
+
+    # 复习日志写回进度：记录已写入数据库的最后一条日志序号，重放时跳过
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_journal_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_seq INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    # Create indexes for frequently queried columns to improve performance
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_word ON words(word)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_next_review_time ON words(next_review_time)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_mastered ON words(mastered)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stage ON words(stage)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_families_root ON word_families(root)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_families_word ON word_families(word)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_review_history_word ON review_history(word_id, review_date)')
+
+    # Dictionary cache table (持久化词典查询缓存)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dict_cache (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word TEXT NOT NULL,
+            source TEXT NOT NULL,
+            data TEXT,
+            created_at REAL,
+            UNIQUE(word, source)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_dict_cache_word ON dict_cache(word)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_dict_cache_created ON dict_cache(created_at)')
+
+
+def _legacy_columns(cursor):
+    """早期版本创建的 words 表缺少的列"""
+    cursor.execute("PRAGMA table_info(words)")
+    columns = [info[1] for info in cursor.fetchall()]
+    for column in ('roots', 'synonyms', 'tags'):
+        if column not in columns:
+            print(f"Adding '{column}' column to words table...")
+            cursor.execute(f"ALTER TABLE words ADD COLUMN {column} TEXT")
+
+
+def _fts_index(cursor):
+    """
+    创建 words 表的 FTS5 全文索引（trigram 分词，中英文均可做子串匹配）。
+
+    使用外部内容表 (content='words')，由触发器与 words 表保持同步，
+    索引不额外保存正文。当前 SQLite 不支持 FTS5/trigram 时跳过，
+    search_words 会回退到 LIKE 扫描。
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE name IN ('words_fts', 'words_fts_ai')")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    try:
+        if 'words_fts' not in existing:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE words_fts USING fts5(
+                    word, meaning, example, context_en, context_cn,
+                    content='words', content_rowid='id', tokenize='trigram'
+                )
+            ''')
+        else:
+            # 表已存在，但当前 SQLite 可能缺少 fts5 模块（数据库被拷贝到其他环境）
+            cursor.execute('SELECT rowid FROM words_fts LIMIT 0')
+    except sqlite3.OperationalError as e:
+        print(f"FTS5 unavailable, search falls back to LIKE: {e}")
+        # 移除同步触发器，否则对 words 的写入会因缺少模块而失败
+        _drop_triggers(cursor, FTS_TRIGGERS)
+        return
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS words_fts_ai AFTER INSERT ON words BEGIN
+            INSERT INTO words_fts(rowid, word, meaning, example, context_en, context_cn)
+            VALUES (new.id, new.word, new.meaning, new.example, new.context_en, new.context_cn);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS words_fts_ad AFTER DELETE ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, word, meaning, example, context_en, context_cn)
+            VALUES ('delete', old.id, old.word, old.meaning, old.example, old.context_en, old.context_cn);
+        END
+    ''')
+    # 只在被索引的列变化时更新索引，复习时改 next_review_time 等字段不会触发
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS words_fts_au
+        AFTER UPDATE OF word, meaning, example, context_en, context_cn ON words BEGIN
+            INSERT INTO words_fts(words_fts, rowid, word, meaning, example, context_en, context_cn)
+            VALUES ('delete', old.id, old.word, old.meaning, old.example, old.context_en, old.context_cn);
+            INSERT INTO words_fts(rowid, word, meaning, example, context_en, context_cn)
+            VALUES (new.id, new.word, new.meaning, new.example, new.context_en, new.context_cn);
+        END
+    ''')
+
+    if 'words_fts_ai' not in existing:
+        # 新建索引或触发器曾被移除：从 words 表全量重建一次
+        cursor.execute("INSERT INTO words_fts(words_fts) VALUES('rebuild')")
+
+
+def _tag_index(cursor):
+    """
+    创建规范化的标签表：word_tags(word_id, tag) 存每个单词的各个标签，
+    tag_counts(tag, count) 存每个标签的单词数。
+
+    words.tags 仍是标签的原始数据，两张表由触发器随 words 的写入增量维护，
+    首次创建时从已有的 tags 列迁移。SQLite 缺少 JSON1 (json_each) 时跳过，
+    标签过滤和标签列表回退到直接读 tags 列。
+    """
+    try:
+        cursor.execute("SELECT value FROM json_each('[]')")
+    except sqlite3.OperationalError as e:
+        print(f"JSON1 unavailable, tag filtering falls back to LIKE: {e}")
+        _drop_triggers(cursor, TAG_TRIGGERS)
+        return
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE name = 'words_tags_ai'")
+    needs_rebuild = cursor.fetchone() is None
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS word_tags (
+            tag TEXT NOT NULL,
+            word_id INTEGER NOT NULL,
+            PRIMARY KEY (tag, word_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_tags_word_id ON word_tags(word_id)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tag_counts (
+            tag TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+
+    split_new = (
+        "INSERT OR IGNORE INTO word_tags(tag, word_id) "
+        "SELECT trim(value), new.id FROM json_each(" + TAG_ARRAY_SQL.format(col='new.tags') + ") "
+        "WHERE trim(value) != '';"
+    )
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_tags_ai
+        AFTER INSERT ON words WHEN IFNULL(new.tags, '') != '' BEGIN
+            {split_new}
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS words_tags_ad AFTER DELETE ON words BEGIN
+            DELETE FROM word_tags WHERE word_id = old.id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_tags_au
+        AFTER UPDATE OF tags ON words WHEN IFNULL(old.tags, '') IS NOT IFNULL(new.tags, '') BEGIN
+            DELETE FROM word_tags WHERE word_id = old.id;
+            {split_new}
+        END
+    ''')
+
+    # 标签计数随 word_tags 的增删同步更新，标签列表不用再扫描 words
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_tags_count_ai AFTER INSERT ON word_tags BEGIN
+            INSERT INTO tag_counts(tag, count) VALUES (new.tag, 1)
+            ON CONFLICT(tag) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS word_tags_count_ad AFTER DELETE ON word_tags BEGIN
+            UPDATE tag_counts SET count = count - 1 WHERE tag = old.tag;
+            DELETE FROM tag_counts WHERE tag = old.tag AND count <= 0;
+        END
+    ''')
+
+    if needs_rebuild:
+        # 新建或触发器曾被移除：从 words.tags 全量迁移一次
+        cursor.execute('DELETE FROM word_tags')
+        cursor.execute(
+            "INSERT OR IGNORE INTO word_tags(tag, word_id) "
+            "SELECT trim(j.value), w.id FROM words w, json_each(" + TAG_ARRAY_SQL.format(col='w.tags') + ") j "
+            "WHERE IFNULL(w.tags, '') != '' AND trim(j.value) != ''"
+        )
+        cursor.execute('DELETE FROM tag_counts')
+        cursor.execute('INSERT INTO tag_counts(tag, count) SELECT tag, COUNT(*) FROM word_tags GROUP BY tag')
+
+
+def _word_stats(cursor):
+    """
+    创建单行计数表 word_stats（总数 / 已掌握 / 新单词），由 words 上的触发器增量维护，
+    get_statistics 读取时不再对 words 做 COUNT。首次创建时从 words 统计一次。
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE name = 'words_stats_ai'")
+    needs_rebuild = cursor.fetchone() is None
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS word_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL DEFAULT 0,
+            mastered INTEGER NOT NULL DEFAULT 0,
+            new INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    old_new = IS_NEW_SQL.format(r='old')
+    new_new = IS_NEW_SQL.format(r='new')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_stats_ai AFTER INSERT ON words BEGIN
+            UPDATE word_stats SET total = total + 1,
+                                  mastered = mastered + (new.mastered = 1),
+                                  new = new + {new_new}
+            WHERE id = 1;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_stats_ad AFTER DELETE ON words BEGIN
+            UPDATE word_stats SET total = total - 1,
+                                  mastered = mastered - (old.mastered = 1),
+                                  new = new - {old_new}
+            WHERE id = 1;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_stats_au
+        AFTER UPDATE OF mastered, next_review_time ON words BEGIN
+            UPDATE word_stats SET mastered = mastered + (new.mastered = 1) - (old.mastered = 1),
+                                  new = new + {new_new} - {old_new}
+            WHERE id = 1;
+        END
+    ''')
+
+    if needs_rebuild:
+        cursor.execute('DELETE FROM word_stats')
+        cursor.execute(f'''
+            INSERT INTO word_stats (id, total, mastered, new)
+            SELECT 1, COUNT(*), IFNULL(SUM(w.mastered = 1), 0), IFNULL(SUM({IS_NEW_SQL.format(r='w')}), 0)
+            FROM words w
+        ''')
+
+
+def _due_histogram(cursor):
+    """
+    创建每日到期数直方图 due_days(day, count)：day 为本地日期 YYYY-MM-DD，
+    count 为当天到期的未掌握单词数。由 words 上的触发器增量维护，
+    负载均衡调度 (ReviewLoadBalancer) 和复习量预测只读这张小表。
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE name = 'words_due_ai'")
+    needs_rebuild = cursor.fetchone() is None
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS due_days (
+            day TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+
+    add_new = f'''
+        INSERT INTO due_days(day, count)
+        SELECT {DUE_DAY_SQL.format(r='new')}, 1 WHERE {IS_SCHEDULED_SQL.format(r='new')}
+        ON CONFLICT(day) DO UPDATE SET count = count + 1;'''
+    remove_old = f'''
+        UPDATE due_days SET count = count - 1
+        WHERE day = {DUE_DAY_SQL.format(r='old')} AND {IS_SCHEDULED_SQL.format(r='old')};
+        DELETE FROM due_days WHERE day = {DUE_DAY_SQL.format(r='old')} AND count <= 0;'''
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_due_ai AFTER INSERT ON words BEGIN
+            {add_new}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_due_ad AFTER DELETE ON words BEGIN
+            {remove_old}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS words_due_au
+        AFTER UPDATE OF mastered, next_review_time ON words BEGIN
+            {remove_old}
+            {add_new}
+        END
+    ''')
+
+    if needs_rebuild:
+        cursor.execute('DELETE FROM due_days')
+        cursor.execute(f'''
+            INSERT INTO due_days(day, count)
+            SELECT {DUE_DAY_SQL.format(r='w')}, COUNT(*) FROM words w
+            WHERE {IS_SCHEDULED_SQL.format(r='w')}
+            GROUP BY 1
+        ''')
+
+
+def _dict_cache_compression(cursor):
+    """
+    词典缓存改为压缩存储：payload 为 zlib 压缩的 JSON，raw_size / size 为压缩前后的字节数，
+    last_access 为最近一次读取时间（按 LRU 淘汰）。已有记录在这里一次性压缩，data 列置空；
+    压缩后反而更大的短记录保留在 data 列。
+    """
+    cursor.execute("PRAGMA table_info(dict_cache)")
+    columns = {info[1] for info in cursor.fetchall()}
+    for column, column_type in (('payload', 'BLOB'), ('raw_size', 'INTEGER'),
+                                ('size', 'INTEGER'), ('last_access', 'REAL')):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE dict_cache ADD COLUMN {column} {column_type}")
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_dict_cache_access ON dict_cache(last_access)')
+
+    cursor.execute('SELECT id, data FROM dict_cache WHERE data IS NOT NULL')
+    rows = []
+    for cache_id, data in cursor.fetchall():
+        raw = data.encode('utf-8')
+        payload = zlib.compress(raw)
+        if len(payload) < len(raw):
+            rows.append((payload, len(raw), len(payload), None, cache_id))
+        else:
+            rows.append((None, len(raw), len(raw), data, cache_id))
+    cursor.executemany(
+        'UPDATE dict_cache SET payload = ?, raw_size = ?, size = ?, data = ? WHERE id = ?', rows)
+    cursor.execute('UPDATE dict_cache SET last_access = created_at WHERE last_access IS NULL')
+
+
+MIGRATIONS = [
+    (1, "基础表和索引", _base_schema),
+    (2, "words 表补充 roots / synonyms / tags 列", _legacy_columns),
+    (3, "FTS5 全文索引", _fts_index),
+    (4, "标签表 word_tags / tag_counts", _tag_index),
+    (5, "统计计数 word_stats", _word_stats),
+    (6, "每日到期数直方图 due_days", _due_histogram),
+    (7, "词典缓存压缩存储与 LRU", _dict_cache_compression),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, target=None):
+    """
+    执行所有待执行的迁移（到 target 版本为止，默认最新版本）
+
+    conn 不在事务中时每个迁移自己开启并提交事务；已在事务中时（单写线程的组提交）
+    迁移随外层事务一起提交或回滚。
+
+    Returns:
+        本次执行的版本号列表
+    """
+    target = LATEST_VERSION if target is None else target
+    version = get_version(conn)
+    applied = []
+    for number, description, func in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute('BEGIN')
+        try:
+            func(conn.cursor())
+            conn.execute(f'PRAGMA user_version = {int(number)}')
+            if own_transaction:
+                conn.commit()
+        except Exception:
+            if own_transaction:
+                conn.rollback()
+            raise
+        print(f"Database migrated to version {number}: {description}")
+        applied.append(number)
+    return applied
@@ -0,0 +1,59 @@
+import threading
+
+
+class VocabStore:
+    """
+    单词表的变更分发与单词计数。
+
+    - 订阅 DatabaseManager 的行级变更，按变更维护单词总数（用于窗口标题），
+      一次复习评分不再 SELECT * 整表重载
+    - 视图通过 subscribe() 接收同样的变更记录，自行按需从数据库读取行数据
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._count = None       # 单词数，None 表示需要重新查询
+        self._lock = threading.RLock()
+        self._subscribers = []
+
+        db.add_change_listener(self.apply_change)
+
+    def __len__(self):
+        with self._lock:
+            if self._count is None:
+                self._count = self.db.get_words_count()
+            return self._count
+
+    def apply_change(self, change):
+        """应用一条行级变更记录，然后通知订阅者。"""
+        op = change.get('op')
+
+        with self._lock:
+            if op == 'reload':
+                self._count = None
+            elif op == 'delete':
+                if self._count is not None:
+                    self._count = max(0, self._count - 1)
+            elif op == 'insert' and change.get('row') is not None:
+                if self._count is not None:
+                    self._count += 1
+
+        for callback in list(self._subscribers):
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"Vocab store subscriber error: {e}")
+
+    def subscribe(self, callback):
+        """
+        订阅变更记录。
+
+        注意：callback 在执行写入的线程中调用（可能是后台查询线程），
+        Tk 视图需要自行通过 after() 切回主线程。
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
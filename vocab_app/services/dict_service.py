@@ -1,10 +1,10 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 from .tag_service import TagService
 from .word_family_service import WordFamilyService
-from .multi_dict_service import get_session
+from .multi_dict_service import get_session, get_base_url
+from .html_parser import make_soup, parse_youdao, find_text_markers
 
 
 class DictService:
@@ -16,7 +16,7 @@ class DictService:
             data = {"inputtext": text, "type": "AUTO"}
             session = get_session()
             r = session.post(url, data=data, timeout=5)
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = make_soup(r.text)
 
             res_ul = soup.find('ul', id='translateResult')
             if res_ul:
@@ -39,12 +39,12 @@ class DictService:
         dict keys: word, phonetic, meaning, example, date
         """
         try:
-            url = f"https://dict.youdao.com/w/eng/{word}"
+            url = f"{get_base_url('youdao')}/w/eng/{word}"
             session = get_session()
             resp = session.get(url, timeout=10)
 
             if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, 'html.parser')
+                soup = parse_youdao(resp.text)
                 if soup.find('div', class_='error-wrapper'):
                     return None
 
@@ -80,10 +80,13 @@ class DictService:
                             except (IndexError, AttributeError):
                                 example = ""
 
+                # "词根" / "同近义词" 文本标记：一次遍历同时查找
+                markers = find_text_markers(soup, ["词根", "同近义词"])
+
                 # Parse Roots
                 roots = ""
                 # Strategy 1: Look for "词根" text marker
-                root_marker = soup.find(string=lambda t: "词根" in t if t else False)
+                root_marker = markers.get("词根")
                 if root_marker:
                     root_container = root_marker.find_parent('div')
                     if root_container:
@@ -107,7 +110,7 @@ class DictService:
                     synonyms = syn_div.get_text(separator=' ', strip=True)
                 # Strategy 2: "同近义词" marker
                 if not synonyms:
-                    syn_marker = soup.find(string=lambda t: "同近义词" in t if t else False)
+                    syn_marker = markers.get("同近义词")
                     if syn_marker:
                         syn_container = syn_marker.find_parent('div')
                         if syn_container:
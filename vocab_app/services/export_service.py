@@ -1,56 +1,136 @@
 import csv
+import html
 import json
 import os
-from datetime import datetime
+
+from .import_service import ImportService
 
 class ExportService:
+    CSV_HEADERS = ['Word', 'Phonetic', 'Meaning', 'Example', 'Context_En', 'Context_Cn', 'Date_Added', 'Review_Count', 'Mastered', 'Tags']
+
+    # 导出格式 -> (显示名称, 扩展名)
+    FORMATS = {
+        "csv": ("CSV", ".csv"),
+        "jsonl": ("JSON Lines", ".jsonl"),
+        "anki": ("Anki 文本 (TSV)", ".txt"),
+    }
+
+    @staticmethod
+    def format_from_path(filepath):
+        """按扩展名判断导出格式，无法识别时为 CSV"""
+        ext = os.path.splitext(filepath)[1].lower()
+        for fmt, (_, fmt_ext) in ExportService.FORMATS.items():
+            if ext == fmt_ext:
+                return fmt
+        return "csv"
+
+    @staticmethod
+    def filetypes():
+        """文件对话框使用的 filetypes 列表"""
+        return [(name, f"*{ext}") for name, ext in ExportService.FORMATS.values()]
+
+    @staticmethod
+    def _write_csv(f, rows):
+        writer = csv.writer(f)
+        writer.writerow(ExportService.CSV_HEADERS)
+        for w in rows:
+            writer.writerow([
+                w['word'],
+                w.get('phonetic', ''),
+                w.get('meaning', ''),
+                w.get('example', ''),
+                w.get('context_en', ''),
+                w.get('context_cn', ''),
+                w.get('date', ''),
+                w.get('review_count', 0),
+                1 if w.get('mastered') else 0,
+                w.get('tags') or '',
+            ])
+            yield
+
+    @staticmethod
+    def _write_jsonl(f, rows):
+        for w in rows:
+            f.write(json.dumps(w, ensure_ascii=False) + '\n')
+            yield
+
+    @staticmethod
+    def _anki_field(text):
+        """Anki 文本导入（#html:true）：转义 HTML 特殊字符，字段内不能有制表符，换行用 <br>"""
+        text = html.escape(text or '').replace('\t', ' ').replace('\r\n', '\n')
+        return text.replace('\n', '<br>')
+
+    @staticmethod
+    def _write_anki(f, rows):
+        # 文件头让 Anki 自动识别分隔符、HTML 和标签列
+        f.write('#separator:tab\n#html:true\n#tags column:3\n')
+        for w in rows:
+            front = ExportService._anki_field(w['word'])
+            if w.get('phonetic'):
+                front += '<br>' + ExportService._anki_field(w['phonetic'])
+            back = ExportService._anki_field(w.get('meaning', ''))
+            example = w.get('example') or w.get('context_en') or ''
+            if example:
+                back += '<br><br>' + ExportService._anki_field(example)
+            # 标签以空格分隔，标签内的空格换成下划线
+            tags = ' '.join(t.strip().replace(' ', '_') for t in (w.get('tags') or '').split(',') if t.strip())
+            f.write(f"{front}\t{back}\t{tags}\n")
+            yield
+
+    @staticmethod
+    def export(filepath, db, fmt=None, words=None, on_progress=None, batch_size=500):
+        """
+        流式导出单词（行直接来自数据库游标，不整体载入内存）
+
+        Args:
+            filepath: 输出文件路径
+            db: DatabaseManager 实例
+            fmt: "csv" / "jsonl" / "anki"，None 时按扩展名判断
+            words: 只导出这些单词，None 表示全部
+            on_progress: 回调 on_progress(已导出数量)，每批调用一次
+            batch_size: 每批从数据库读取的行数
+
+        Returns:
+            (success, message)
+        """
+        fmt = fmt or ExportService.format_from_path(filepath)
+        writers = {
+            "csv": ExportService._write_csv,
+            "jsonl": ExportService._write_jsonl,
+            "anki": ExportService._write_anki,
+        }
+        try:
+            count = 0
+            # CSV 使用 utf-8-sig 以便 Excel 正确识别中文
+            encoding = 'utf-8-sig' if fmt == "csv" else 'utf-8'
+            with open(filepath, 'w', newline='', encoding=encoding) as f:
+                rows = db.iter_words(words=words, batch_size=batch_size)
+                for _ in writers[fmt](f, rows):
+                    count += 1
+                    if on_progress and count % batch_size == 0:
+                        on_progress(count)
+            if on_progress:
+                on_progress(count)
+            return True, f"成功导出 {count} 个单词"
+        except Exception as e:
+            return False, str(e)
+
     @staticmethod
     def export_to_csv(filepath, words):
+        """把已有的单词列表（或任意可迭代对象）写为 CSV"""
         try:
             with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Word', 'Phonetic', 'Meaning', 'Example', 'Context_En', 'Context_Cn', 'Date_Added', 'Review_Count', 'Mastered'])
-                for w in words:
-                    writer.writerow([
-                        w['word'],
-                        w.get('phonetic', ''),
-                        w.get('meaning', ''),
-                        w.get('example', ''),
-                        w.get('context_en', ''),
-                        w.get('context_cn', ''),
-                        w.get('date', ''),
-                        w.get('review_count', 0),
-                        1 if w.get('mastered') else 0
-                    ])
+                for _ in ExportService._write_csv(f, words):
+                    pass
             return True, "导出成功"
         except Exception as e:
             return False, str(e)
 
     @staticmethod
     def import_from_csv(filepath, db):
+        """导入 CSV（批量写入，见 ImportService）"""
         try:
-            count = 0
-            with open(filepath, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Basic mapping
-                    word_data = {
-                        'word': row.get('Word'),
-                        'phonetic': row.get('Phonetic', ''),
-                        'meaning': row.get('Meaning', ''),
-                        'example': row.get('Example', ''),
-                        'context_en': row.get('Context_En', ''),
-                        'context_cn': row.get('Context_Cn', ''),
-                        'date': row.get('Date_Added', datetime.now().strftime('%Y-%m-%d')),
-                    }
-                    if not word_data['word']: continue
-
-                    # Try to add
-                    if db.add_word(word_data):
-                        # If added successfully, update context if present
-                        if word_data['context_en']:
-                            db.update_context(word_data['word'], word_data['context_en'], word_data['context_cn'])
-                        count += 1
-            return True, f"成功导入 {count} 个单词"
+            result = ImportService.import_csv(filepath, db)
+            return True, f"成功导入 {result['inserted']} 个单词，更新 {result['updated']} 个"
         except Exception as e:
             return False, str(e)
@@ -0,0 +1,272 @@
+"""
+FSRS 记忆模型（可选的复习调度算法）
+
+功能：
+1. FSRS (Free Spaced Repetition Scheduler) 风格的记忆模型：每张卡片有稳定性 S
+   和难度 D，按目标记忆保持率 (desired_retention) 计算间隔，比 SM-2 用更少的
+   复习达到相同的记忆保持率
+2. fit_params：从 review_history 离线拟合个人参数。所有卡片的复习序列补齐成
+   矩阵后逐步向量化计算损失，用有限差分梯度 + Adam 优化
+3. fit_from_db：供后台进程调用的拟合入口（只读打开数据库，不阻塞界面）
+
+评分映射：复习界面的 忘了(1) / 模糊(3) / 熟悉(5) 分别对应 FSRS 的
+Again(1) / Hard(2) / Good(3)，评分 4 也视为 Good。同一天内的多次复习只取第一次。
+review_history 里旧版拼写模式的记录 rating 固定为 1，无法区分对错，会被当作 Again。
+"""
+
+import pathlib
+import sqlite3
+from datetime import date
+
+import numpy as np
+
+DECAY = -0.5
+FACTOR = 0.9 ** (1 / DECAY) - 1  # 19/81，使 R(S, S) = 0.9
+
+# FSRS-4.5 默认参数
+DEFAULT_PARAMS = (
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031,
+    1.6474, 0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+)
+
+# 拟合时各参数的取值范围
+PARAM_BOUNDS = np.array([
+    (0.1, 100), (0.1, 100), (0.1, 100), (0.1, 100), (1, 10), (0.1, 5), (0.1, 5), (0, 0.75),
+    (0, 4), (0, 0.8), (0.01, 3), (0.5, 5), (0.01, 0.2), (0.01, 0.9), (0.01, 3), (0, 1), (1, 6),
+])
+
+MAX_INTERVAL = 36500
+
+
+def quality_to_grade(quality):
+    """SM-2 评分 (0-5) 转为 FSRS 评分 (1-4)，支持数组"""
+    quality = np.asarray(quality)
+    return np.select([quality < 3, quality == 3], [1, 2], 3)
+
+
+class FSRS:
+    def __init__(self, params=None, desired_retention=0.9):
+        """
+        Args:
+            params: 17 个模型参数，None 使用默认参数
+            desired_retention: 目标记忆保持率，越高间隔越短
+        """
+        self.w = np.asarray(params if params is not None else DEFAULT_PARAMS, dtype=np.float64)
+        self.desired_retention = desired_retention
+
+    # --- 模型公式（标量和数组均可） ---
+
+    def init_stability(self, grade):
+        return self.w[np.asarray(grade, dtype=np.int64) - 1]
+
+    def init_difficulty(self, grade):
+        return np.clip(self.w[4] - (np.asarray(grade) - 3) * self.w[5], 1, 10)
+
+    @staticmethod
+    def retrievability(elapsed, stability):
+        return (1 + FACTOR * np.asarray(elapsed) / stability) ** DECAY
+
+    def next_difficulty(self, difficulty, grade):
+        d = difficulty - self.w[6] * (np.asarray(grade) - 3)
+        d = self.w[7] * self.init_difficulty(3) + (1 - self.w[7]) * d  # 均值回归
+        return np.clip(d, 1, 10)
+
+    def next_stability(self, difficulty, stability, r, grade):
+        w = self.w
+        grade = np.asarray(grade)
+        hard_penalty = np.where(grade == 2, w[15], 1.0)
+        easy_bonus = np.where(grade == 4, w[16], 1.0)
+        recall = stability * (1 + np.exp(w[8]) * (11 - difficulty) * stability ** -w[9]
+                              * (np.exp((1 - r) * w[10]) - 1) * hard_penalty * easy_bonus)
+        forget = (w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1)
+                  * np.exp((1 - r) * w[14]))
+        return np.where(grade == 1, np.minimum(forget, stability), recall)
+
+    def step(self, stability, difficulty, elapsed, grade):
+        """一次复习后的 (稳定性, 难度)"""
+        r = self.retrievability(elapsed, stability)
+        return (self.next_stability(difficulty, stability, r, grade),
+                self.next_difficulty(difficulty, grade))
+
+    def interval(self, stability):
+        """达到目标记忆保持率的间隔（天），至少 1 天"""
+        days = stability / FACTOR * (self.desired_retention ** (1 / DECAY) - 1)
+        return np.clip(np.round(days), 1, MAX_INTERVAL).astype(np.int64)
+
+    # --- 单张卡片调度 ---
+
+    def replay(self, reviews):
+        """
+        按顺序重放一张卡片的复习记录
+
+        Args:
+            reviews: [(YYYY-MM-DD, quality)]，按时间排序
+
+        Returns:
+            (stability, difficulty, 最后一次复习的日期序号)，没有记录时为 None
+        """
+        state = None
+        last_day = None
+        for review_date, quality in reviews:
+            day = date.fromisoformat(review_date).toordinal()
+            grade = int(quality_to_grade(quality))
+            if state is None:
+                state = (float(self.init_stability(grade)), float(self.init_difficulty(grade)))
+            elif day == last_day:
+                continue
+            else:
+                s, d = self.step(state[0], state[1], day - last_day, grade)
+                state = (float(s), float(d))
+            last_day = day
+        if state is None:
+            return None
+        return state[0], state[1], last_day
+
+    def next_interval(self, reviews, quality, today=None):
+        """
+        根据历史复习记录和本次评分计算下一次间隔（天）
+
+        Args:
+            reviews: 此前的复习记录 [(YYYY-MM-DD, quality)]
+            quality: 本次评分 (0-5)
+            today: 本次复习日期，默认今天
+        """
+        today = (today or date.today()).isoformat()
+        state = self.replay(list(reviews) + [(today, quality)])
+        return int(self.interval(state[0]))
+
+
+# --- 参数拟合 ---
+
+def build_sequences(rows):
+    """
+    把 review_history 行转为补齐的矩阵
+
+    Args:
+        rows: 按 (word_id, 时间) 排序的 (word_id, YYYY-MM-DD, rating)
+
+    Returns:
+        (elapsed, grade, mask)：形状均为 [卡片数, 最长复习次数]；
+        第 0 列为首次复习，elapsed 为距上次复习的天数
+    """
+    sequences = []
+    current_id = None
+    for word_id, review_date, rating in rows:
+        try:
+            day = date.fromisoformat(review_date).toordinal()
+        except (TypeError, ValueError):
+            continue
+        if word_id != current_id:
+            current_id = word_id
+            sequences.append([])
+        seq = sequences[-1]
+        if seq and seq[-1][0] == day:
+            continue  # 同一天只取第一次
+        seq.append((day, rating))
+
+    sequences = [seq for seq in sequences if len(seq) >= 2]
+    if not sequences:
+        return np.zeros((0, 0)), np.zeros((0, 0), dtype=np.int64), np.zeros((0, 0), dtype=bool)
+
+    length = max(len(seq) for seq in sequences)
+    elapsed = np.zeros((len(sequences), length))
+    grade = np.ones((len(sequences), length), dtype=np.int64)
+    mask = np.zeros((len(sequences), length), dtype=bool)
+    for i, seq in enumerate(sequences):
+        days = np.array([d for d, _ in seq])
+        elapsed[i, 1:len(seq)] = np.diff(days)
+        grade[i, :len(seq)] = quality_to_grade([q for _, q in seq])
+        mask[i, :len(seq)] = True
+    return elapsed, grade, mask
+
+
+def log_loss(params, elapsed, grade, mask):
+    """所有卡片第 2 次起每次复习的预测记忆概率与实际结果的平均交叉熵"""
+    model = FSRS(params)
+    stability = model.init_stability(grade[:, 0])
+    difficulty = model.init_difficulty(grade[:, 0])
+    total = 0.0
+    count = 0
+    for k in range(1, grade.shape[1]):
+        active = mask[:, k]
+        if not active.any():
+            break
+        r = np.clip(model.retrievability(elapsed[:, k], stability), 1e-6, 1 - 1e-6)
+        recalled = grade[:, k] > 1
+        total += -np.sum(np.where(recalled, np.log(r), np.log(1 - r))[active])
+        count += int(active.sum())
+        s, d = model.step(stability, difficulty, elapsed[:, k], grade[:, k])
+        stability = np.where(active, s, stability)
+        difficulty = np.where(active, d, difficulty)
+    return total / max(count, 1)
+
+
+def fit_params(elapsed, grade, mask, iterations=150, lr=0.05, init=None):
+    """
+    用 Adam（有限差分梯度）最小化 log_loss
+
+    Returns:
+        (params, 初始损失, 拟合后损失)
+    """
+    params = np.array(init if init is not None else DEFAULT_PARAMS, dtype=np.float64)
+    low, high = PARAM_BOUNDS[:, 0], PARAM_BOUNDS[:, 1]
+    scale = high - low
+    m = np.zeros_like(params)
+    v = np.zeros_like(params)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+    initial_loss = log_loss(params, elapsed, grade, mask)
+    best, best_loss = params.copy(), initial_loss
+    for t in range(1, iterations + 1):
+        grad = np.zeros_like(params)
+        for i in range(len(params)):
+            h = 1e-4 * scale[i]
+            up, down = params.copy(), params.copy()
+            up[i] = min(high[i], params[i] + h)
+            down[i] = max(low[i], params[i] - h)
+            grad[i] = (log_loss(up, elapsed, grade, mask) - log_loss(down, elapsed, grade, mask)) / (up[i] - down[i])
+        # 在归一化的参数空间中更新，各参数步长与其取值范围成比例
+        grad *= scale
+        m = beta1 * m + (1 - beta1) * grad
+        v = beta2 * v + (1 - beta2) * grad ** 2
+        step = lr * (m / (1 - beta1 ** t)) / (np.sqrt(v / (1 - beta2 ** t)) + eps)
+        params = np.clip(params - step * scale / 10, low, high)
+
+        loss = log_loss(params, elapsed, grade, mask)
+        if loss < best_loss:
+            best, best_loss = params.copy(), loss
+    return best, initial_loss, best_loss
+
+
+def load_history(db_path):
+    """只读打开数据库，读出全部复习记录 (word_id, review_date, rating)"""
+    # 路径转为 file: URI（转义 ?、#、% 和 Windows 反斜杠），再以只读方式打开
+    conn = sqlite3.connect(pathlib.Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            'SELECT word_id, review_date, rating FROM review_history ORDER BY word_id, review_date, id'
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def fit_from_db(db_path, iterations=150, min_reviews=100):
+    """
+    从数据库的 review_history 拟合参数（在后台进程中运行）
+
+    Returns:
+        dict: {'ok', 'params', 'reviews', 'cards', 'loss_before', 'loss_after', 'message'}
+    """
+    elapsed, grade, mask = build_sequences(load_history(db_path))
+    reviews = int(mask[:, 1:].sum()) if mask.size else 0
+    result = {'ok': False, 'params': list(DEFAULT_PARAMS), 'reviews': reviews, 'cards': len(mask),
+              'loss_before': None, 'loss_after': None}
+    if reviews < min_reviews:
+        result['message'] = f"复习记录不足（{reviews} 次重复复习，至少需要 {min_reviews} 次），继续使用默认参数"
+        return result
+
+    params, before, after = fit_params(elapsed, grade, mask, iterations=iterations)
+    result.update(ok=True, params=[round(float(p), 4) for p in params],
+                  loss_before=round(float(before), 4), loss_after=round(float(after), 4),
+                  message=f"已根据 {result['cards']} 个单词的 {reviews} 次复习拟合参数")
+    return result
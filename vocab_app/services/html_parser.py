@@ -0,0 +1,137 @@
+"""
+词典页面 HTML 解析层
+
+功能：
+1. 安装了 lxml 时使用其 C 实现的解析器，否则回退到内置的 html.parser
+2. 按词典只保留需要的子树（SoupStrainer 局部解析），减少建树开销
+3. 单次遍历文本节点查找多个标记（如有道的 "词根"、"同近义词"）
+"""
+
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def _has_class(attrs, class_name):
+    """attrs 中的 class 在解析阶段可能是字符串，也可能已拆分为列表"""
+    value = attrs.get('class') if attrs else None
+    if not value:
+        return False
+    if isinstance(value, str):
+        value = value.split()
+    return class_name in value
+
+
+def make_strainer(tags_by_class=(), tags_by_id=()):
+    """
+    构造只保留指定元素（及其子树）的 SoupStrainer
+
+    Args:
+        tags_by_class: (标签名, class) 列表
+        tags_by_id: (标签名, id) 列表
+    """
+    tags_by_class = tuple(tags_by_class)
+    tags_by_id = tuple(tags_by_id)
+
+    def matcher(name, attrs=None):
+        attrs = attrs or {}
+        if isinstance(attrs, list):
+            attrs = dict(attrs)
+        for tag, class_name in tags_by_class:
+            if name == tag and _has_class(attrs, class_name):
+                return True
+        for tag, elem_id in tags_by_id:
+            if name == tag and attrs.get('id') == elem_id:
+                return True
+        return False
+
+    return _AttrsStrainer(matcher)
+
+
+class _AttrsStrainer(SoupStrainer):
+    """
+    按 matcher(name, attrs) 决定保留哪些顶层元素的 SoupStrainer
+
+    bs4 4.13 之前，传给 SoupStrainer 的函数在解析时以 (name, attrs) 调用；
+    4.13 起只以标签名调用，解析阶段改由 allow_tag_creation 判断，这里覆盖它
+    """
+
+    def __init__(self, matcher):
+        super().__init__(matcher)
+        self._matcher = matcher
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._matcher(name, attrs)
+
+
+def make_soup(html, strainer=None):
+    """用当前可用的最快解析器解析 HTML，可选只保留 strainer 匹配的子树"""
+    return BeautifulSoup(html, PARSER, parse_only=strainer)
+
+
+# 有道：所有释义内容都在 results-contents 容器中，另外保留“未找到”提示
+YOUDAO_STRAINER = make_strainer(
+    tags_by_class=[('div', 'error-wrapper')],
+    tags_by_id=[('div', 'results-contents')],
+)
+
+# 剑桥：标题、音标、释义块
+CAMBRIDGE_STRAINER = make_strainer(
+    tags_by_class=[('div', 'di-title'), ('span', 'us'), ('div', 'def-block')],
+)
+
+# Bing：释义、美式音标、例句
+BING_STRAINER = make_strainer(
+    tags_by_class=[('div', 'qdef'), ('div', 'hd_prUS')],
+    tags_by_id=[('div', 'sentenceSeg')],
+)
+
+
+def parse_youdao(html):
+    """
+    解析有道页面，只保留结果容器
+
+    页面结构变化导致找不到 results-contents 时，回退到整页解析
+    """
+    soup = make_soup(html, YOUDAO_STRAINER)
+    if soup.find('div', id='results-contents') or soup.find('div', class_='error-wrapper'):
+        return soup
+    return make_soup(html)
+
+
+def parse_cambridge(html):
+    return make_soup(html, CAMBRIDGE_STRAINER)
+
+
+def parse_bing(html):
+    return make_soup(html, BING_STRAINER)
+
+
+def find_text_markers(soup, markers):
+    """
+    单次遍历文本节点，返回每个标记首次出现的文本节点
+
+    Args:
+        soup: BeautifulSoup 对象
+        markers: 要查找的子串列表
+
+    Returns:
+        dict: marker -> NavigableString（未找到的不包含在内）
+    """
+    found = {}
+    remaining = list(markers)
+    for text in soup.descendants:
+        if not isinstance(text, NavigableString):
+            continue
+        for marker in remaining:
+            if marker in text:
+                found[marker] = text
+        if found:
+            remaining = [m for m in remaining if m not in found]
+            if not remaining:
+                break
+    return found
@@ -0,0 +1,163 @@
+"""
+ImportService - 批量导入单词
+
+功能：
+1. 流式读取 CSV，在导入线程中按批整理后交给写线程，整个导入在一个事务中生效
+2. 重复单词使用 UPSERT 合并（只用非空的新值覆盖，复习进度不变）
+3. 可选：并发查询词典，为没有释义的单词补全释义（并发数有上限，查询结果走缓存）
+4. 通过回调报告进度，适合在后台线程中运行
+"""
+
+import csv
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+
+
+class ImportService:
+    BATCH_SIZE = 1000
+    # 补全释义时同时进行的词典查询数量
+    ENRICH_WORKERS = 4
+    # 补全结果每积累多少条写入一次数据库
+    ENRICH_FLUSH_SIZE = 200
+
+    @staticmethod
+    def count_csv_rows(filepath):
+        """统计 CSV 数据行数（不含表头），用于显示进度"""
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+    @staticmethod
+    def read_csv(filepath):
+        """逐行读取导出格式的 CSV，生成单词字典（跳过没有单词的行）"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                word = (row.get('Word') or '').strip()
+                if not word:
+                    continue
+                yield {
+                    'word': word,
+                    'phonetic': row.get('Phonetic', ''),
+                    'meaning': row.get('Meaning', ''),
+                    'example': row.get('Example', ''),
+                    'context_en': row.get('Context_En', ''),
+                    'context_cn': row.get('Context_Cn', ''),
+                    'tags': row.get('Tags', ''),
+                    'date': row.get('Date_Added') or today,
+                }
+
+    @staticmethod
+    def import_csv(filepath, db, enrich=False, on_progress=None, cancel_event=None):
+        """
+        导入 CSV 文件
+
+        Args:
+            filepath: CSV 路径（ExportService 导出的格式）
+            db: DatabaseManager 实例
+            enrich: 是否为没有释义的单词查询词典补全
+            on_progress: 回调 on_progress(stage, done, total)，stage 为 "import" 或 "enrich"
+            cancel_event: threading.Event，置位后停止补全（已导入的数据保留）
+
+        Returns:
+            dict: inserted, updated, enriched, missing（补全阶段仍未找到释义的单词数）
+        """
+        total = ImportService.count_csv_rows(filepath)
+        missing_meaning = []
+
+        def rows():
+            for data in ImportService.read_csv(filepath):
+                if not (data['meaning'] or '').strip():
+                    missing_meaning.append(data['word'])
+                yield data
+
+        def import_progress(done):
+            if on_progress:
+                on_progress("import", done, total)
+
+        inserted, updated = db.bulk_upsert_words(rows(), batch_size=ImportService.BATCH_SIZE,
+                                                 on_progress=import_progress)
+        result = {'inserted': inserted, 'updated': updated, 'enriched': 0, 'missing': 0}
+
+        if enrich and missing_meaning:
+            # 已有释义的重复单词不需要补全
+            words = db.filter_words_missing_meaning(missing_meaning)
+            enriched = ImportService.enrich_words(db, words, on_progress=on_progress, cancel_event=cancel_event)
+            result['enriched'] = enriched
+            result['missing'] = len(words) - enriched
+
+        return result
+
+    @staticmethod
+    def enrich_words(db, words, on_progress=None, cancel_event=None):
+        """
+        并发查询词典，为缺少释义的单词补全音标、释义和例句
+
+        同时进行的查询数不超过 ENRICH_WORKERS，且只保留这么多个待完成任务，
+        不会一次性提交上万个查询；查询经过 MultiDictService 的缓存。
+
+        Returns:
+            补全成功的单词数
+        """
+        # 延迟导入：词典服务依赖网络库，只有需要补全时才加载
+        from .multi_dict_service import MultiDictService
+
+        total = len(words)
+        done = 0
+        enriched = 0
+        pending_updates = []
+        cancel_event = cancel_event or threading.Event()
+
+        def flush():
+            nonlocal enriched, pending_updates
+            if pending_updates:
+                enriched += db.bulk_fill_missing(pending_updates)
+                pending_updates = []
+
+        with ThreadPoolExecutor(max_workers=ImportService.ENRICH_WORKERS,
+                                thread_name_prefix="import-enrich") as executor:
+            word_iter = iter(words)
+            running = {}
+
+            def submit_next():
+                if cancel_event.is_set():
+                    return False
+                word = next(word_iter, None)
+                if word is None:
+                    return False
+                future = executor.submit(MultiDictService.lookup, word, MultiDictService.DICT_YOUDAO)
+                running[future] = word
+                return True
+
+            for _ in range(ImportService.ENRICH_WORKERS):
+                if not submit_next():
+                    break
+
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    word = running.pop(future)
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        print(f"Enrich {word} error: {e}")
+                        data = None
+                    meaning = (data or {}).get('meaning', '')
+                    if meaning and meaning != "暂无释义":
+                        pending_updates.append({
+                            'word': word,
+                            'phonetic': data.get('phonetic', ''),
+                            'meaning': meaning,
+                            'example': data.get('example', ''),
+                        })
+                    done += 1
+                    submit_next()
+
+                if len(pending_updates) >= ImportService.ENRICH_FLUSH_SIZE:
+                    flush()
+                if on_progress:
+                    on_progress("enrich", done, total)
+
+        flush()
+        return enriched
@@ -0,0 +1,90 @@
+"""
+ReviewLoadBalancer - 复习负载均衡
+
+功能：
+1. 在 SM-2 算出的间隔附近的有限窗口内（fuzz），选择到期单词最少的一天，
+   避免批量导入或同一天复习的单词在以后某天集中到期
+2. forecast(days)：未来每天的复习量预测，供设置页绘制图表
+
+每日到期数来自数据库触发器维护的 due_days 直方图；新安排、但还在复习日志
+缓冲区中没写入数据库的单词由 ReviewJournal 计入，写入后直方图中已包含。
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+
+class ReviewLoadBalancer:
+    # 间隔小于该天数时不做调整，短间隔对记忆效果更敏感
+    MIN_FUZZ_INTERVAL = 3
+    # 调整幅度：间隔的 10%，至少 1 天，最多 7 天
+    FUZZ_RATIO = 0.1
+    MAX_FUZZ_DAYS = 7
+
+    def __init__(self, db_manager, enabled=True, journal=None):
+        """
+        Args:
+            db_manager: DatabaseManager 实例
+            enabled: 是否启用负载均衡；关闭时与 ReviewService.calculate_next_review_time 相同
+            journal: ReviewJournal 实例，计入尚未写入数据库的评分；None 只读数据库
+        """
+        self.db = db_manager
+        self.enabled = enabled
+        self.journal = journal
+
+    @classmethod
+    def fuzz_days(cls, interval):
+        """间隔 interval 天的单词允许前后调整的天数"""
+        if interval < cls.MIN_FUZZ_INTERVAL:
+            return 0
+        return max(1, min(cls.MAX_FUZZ_DAYS, int(interval * cls.FUZZ_RATIO + 0.5)))
+
+    def _load(self, start_day, end_day):
+        """读取 [start_day, end_day] 的每日到期数（含复习日志中未写入的安排）"""
+        source = self.journal if self.journal is not None else self.db
+        return source.get_due_histogram(start_day, end_day)
+
+    def next_review_time(self, interval, now=None):
+        """
+        计算下一次复习时间
+
+        在 [interval - fuzz, interval + fuzz] 天中选择到期单词最少的一天，
+        数量相同时取离 interval 最近的一天（再相同则随机），保持一天中的时刻不变。
+
+        Returns:
+            时间戳
+        """
+        now = time.time() if now is None else now
+        base = datetime.fromtimestamp(now)
+        fuzz = self.fuzz_days(interval) if self.enabled else 0
+        if not fuzz:
+            return (base + timedelta(days=interval)).timestamp()
+
+        candidates = range(max(1, interval - fuzz), interval + fuzz + 1)
+        days = {offset: (base + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in candidates}
+        histogram = self._load(days[candidates[0]], days[candidates[-1]])
+
+        best = min(candidates, key=lambda d: (histogram.get(days[d], 0), abs(d - interval), random.random()))
+        return (base + timedelta(days=best)).timestamp()
+
+    def forecast(self, days=30, now=None):
+        """
+        未来 days 天每天的复习量预测
+
+        已过期未复习的单词计入今天。新单词（从未安排复习）不计入。
+
+        Returns:
+            [(YYYY-MM-DD, count)]，共 days 项，从今天开始
+        """
+        now = time.time() if now is None else now
+        base = datetime.fromtimestamp(now)
+        dates = [(base + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+        if not dates:
+            return []
+
+        histogram = self._load('', dates[-1])
+        overdue = sum(count for day, count in histogram.items() if day < dates[0])
+        result = [(day, histogram.get(day, 0)) for day in dates]
+        result[0] = (dates[0], result[0][1] + overdue)
+        return result
@@ -2,17 +2,38 @@
 多词典聚合查询服务
 支持: 有道词典、剑桥词典 (Cambridge)、Bing词典、Free Dictionary
 """
+import os
 import re
 import time
+import threading
 import requests
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ..utils.lru_cache import LRUCache
+from .html_parser import parse_cambridge, parse_bing
 
 
 # 全局共享 Session，复用 TCP 连接，提升性能
 _session = None
 # 数据库管理器引用（延迟初始化）
 _db_manager = None
+# 共享的词典查询线程池（延迟初始化，进程内长期复用）
+_lookup_executor = None
+_lookup_executor_lock = threading.Lock()
+LOOKUP_MAX_WORKERS = 8
+
+# 各词典源的站点地址（可通过配置 dict_base_urls 或环境变量 VOCAB_DICT_BASE_URL 覆盖，
+# 例如指向本地的 benchmarks/dict_standin_server.py）
+DEFAULT_BASE_URLS = {
+    "youdao": "https://dict.youdao.com",
+    "cambridge": "https://dictionary.cambridge.org",
+    "bing": "https://cn.bing.com",
+    "freedict": "https://api.dictionaryapi.dev",
+}
+_base_urls = dict(DEFAULT_BASE_URLS)
+if os.environ.get("VOCAB_DICT_BASE_URL"):
+    _base_urls = {source: os.environ["VOCAB_DICT_BASE_URL"] for source in DEFAULT_BASE_URLS}
 
 def get_session():
     """获取共享的 requests Session"""
@@ -37,21 +58,119 @@ def get_session():
     return _session
 
 
+def set_base_urls(base_urls):
+    """
+    覆盖词典源站点地址
+
+    Args:
+        base_urls: {词典源: 地址}，未列出的词典源恢复默认地址；
+                   传入字符串时所有词典源都使用该地址
+    """
+    global _base_urls
+    if isinstance(base_urls, str):
+        _base_urls = {source: base_urls for source in DEFAULT_BASE_URLS}
+    else:
+        _base_urls = dict(DEFAULT_BASE_URLS)
+        _base_urls.update(base_urls or {})
+
+
+def get_base_url(source):
+    """获取词典源站点地址（不带末尾斜杠）"""
+    return _base_urls.get(source, DEFAULT_BASE_URLS[source]).rstrip('/')
+
+
+def set_db_manager(db_manager):
+    """指定缓存使用的数据库管理器（如应用已创建的实例）"""
+    global _db_manager
+    _db_manager = db_manager
+
+
 def get_db_manager():
     """获取数据库管理器（延迟加载，避免循环导入）"""
     global _db_manager
     if _db_manager is None:
         try:
             from ..models.database import DatabaseManager
-            from ..config import DB_PATH
+            from ..config import DB_PATH, get_db_profile, load_config
             import os
-            _db_manager = DatabaseManager(db_path=DB_PATH)
+            _db_manager = DatabaseManager.shared(db_path=DB_PATH, profile=get_db_profile(load_config()))
         except Exception as e:
             print(f"Failed to init DB manager for cache: {e}")
             return None
     return _db_manager
 
 
+def get_lookup_executor():
+    """获取共享的词典查询线程池（有界，所有聚合查询共用）"""
+    global _lookup_executor
+    if _lookup_executor is None:
+        with _lookup_executor_lock:
+            if _lookup_executor is None:
+                _lookup_executor = ThreadPoolExecutor(
+                    max_workers=LOOKUP_MAX_WORKERS,
+                    thread_name_prefix="dict-lookup"
+                )
+    return _lookup_executor
+
+
+class _LookupStats:
+    """线程池排队深度与各词典源耗时统计"""
+
+    def __init__(self, window=100):
+        self._lock = threading.Lock()
+        self._window = window
+        self.queued = 0      # 已提交、尚未开始执行
+        self.running = 0     # 正在执行
+        self._sources = {}
+
+    def _source(self, source):
+        if source not in self._sources:
+            self._sources[source] = {
+                'count': 0, 'errors': 0, 'timeouts': 0,
+                'latencies': deque(maxlen=self._window),
+            }
+        return self._sources[source]
+
+    def on_submit(self):
+        with self._lock:
+            self.queued += 1
+
+    def on_start(self):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+
+    def on_finish(self, source, elapsed, ok):
+        with self._lock:
+            self.running -= 1
+            entry = self._source(source)
+            entry['count'] += 1
+            entry['latencies'].append(elapsed)
+            if not ok:
+                entry['errors'] += 1
+
+    def on_timeout(self, source):
+        with self._lock:
+            self._source(source)['timeouts'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            by_source = {}
+            for source, entry in self._sources.items():
+                lat = sorted(entry['latencies'])
+                by_source[source] = {
+                    'count': entry['count'],
+                    'errors': entry['errors'],
+                    'timeouts': entry['timeouts'],
+                    'avg_ms': sum(lat) / len(lat) * 1000 if lat else 0.0,
+                    'p95_ms': lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000 if lat else 0.0,
+                }
+            return {'queue_depth': self.queued, 'running': self.running, 'by_source': by_source}
+
+
+_lookup_stats = _LookupStats()
+
+
 def _get_clean_text(el):
     """Helper to safely extract clean text from a BeautifulSoup element."""
     if not el:
@@ -77,9 +196,15 @@ class MultiDictService:
         DICT_FREE: "Free Dictionary",
     }
 
-    # 内存缓存（一级缓存，快速访问）
-    _memory_cache = {}
-    _memory_cache_ttl = 1800  # 内存缓存 30 分钟
+    # 内存缓存（一级缓存，快速访问）：有容量上限的 LRU，按 (单词, 词典源) 存储
+    _memory_cache = LRUCache(max_entries=500, max_bytes=8 * 1024 * 1024, default_ttl=1800)
+    # 各词典源的内存缓存有效期（秒），未列出的使用默认 30 分钟
+    _memory_cache_ttl = {
+        DICT_YOUDAO: 1800,
+        DICT_CAMBRIDGE: 3600,
+        DICT_BING: 1800,
+        DICT_FREE: 3600,
+    }
 
     # 持久化缓存 TTL（二级缓存，24小时）
     _db_cache_ttl = 86400
@@ -87,18 +212,12 @@ class MultiDictService:
     @classmethod
     def get_cached(cls, word, source):
         """获取缓存的词典结果（先查内存，再查数据库）"""
-        word_lower = word.lower()
+        key = (word.lower(), source)
 
         # 一级缓存：内存
-        if word_lower in cls._memory_cache:
-            cache_entry = cls._memory_cache[word_lower]
-            if time.time() - cache_entry.get("timestamp", 0) < cls._memory_cache_ttl:
-                result = cache_entry.get(source)
-                if result is not None:
-                    return result
-            else:
-                # 内存缓存过期，清除
-                del cls._memory_cache[word_lower]
+        result = cls._memory_cache.get(key)
+        if result is not None:
+            return result
 
         # 二级缓存：数据库
         db = get_db_manager()
@@ -120,22 +239,132 @@ class MultiDictService:
         # 写入内存缓存
         cls._update_memory_cache(word, source, result)
 
-        # 写入数据库缓存
+        # 写入数据库缓存（内存缓存已可用，不等待写入完成，由写线程与其他写入合并提交）
         db = get_db_manager()
         if db:
             try:
-                db.set_dict_cache(word, source, result)
+                db.submit_write(db.set_dict_cache, word, source, result)
             except Exception as e:
                 print(f"DB cache write error: {e}")
 
     @classmethod
     def _update_memory_cache(cls, word, source, result):
         """更新内存缓存"""
-        word_lower = word.lower()
-        if word_lower not in cls._memory_cache:
-            cls._memory_cache[word_lower] = {"timestamp": time.time()}
-        cls._memory_cache[word_lower][source] = result
-        cls._memory_cache[word_lower]["timestamp"] = time.time()
+        ttl = cls._memory_cache_ttl.get(source)
+        cls._memory_cache.set((word.lower(), source), result, ttl=ttl)
+
+    # 正在进行中的网络查询 (单词, 词典源) -> Future，用于合并并发的重复请求
+    _inflight = {}
+    _inflight_lock = threading.Lock()
+    # 等待其他线程的同一查询完成的最长时间（秒）
+    _inflight_wait = 30
+
+    @classmethod
+    def _fetch(cls, word, source):
+        """直接从网络查询指定词典源（不经过缓存）"""
+        if source == cls.DICT_YOUDAO:
+            # 延迟导入：dict_service 在模块级导入了本模块的 get_session
+            from .dict_service import DictService
+            return DictService.search_word(word)
+        if source == cls.DICT_CAMBRIDGE:
+            return cls.search_cambridge(word)
+        if source == cls.DICT_BING:
+            return cls.search_bing(word)
+        if source == cls.DICT_FREE:
+            return cls.search_free_dict(word)
+        raise ValueError(f"Unknown dict source: {source}")
+
+    @classmethod
+    def lookup(cls, word, source, use_cache=True):
+        """
+        查询单个词典源：内存缓存 -> 数据库缓存 -> 网络
+
+        同一 (单词, 词典源) 同时只会发出一个网络请求，
+        其他线程的相同查询等待并共用这次请求的结果。
+
+        Args:
+            word: 单词
+            source: 词典源标识 (DICT_YOUDAO 等)
+            use_cache: 为 False 时跳过缓存读取，强制联网（结果仍会写入缓存）
+
+        Returns:
+            查询结果字典，未找到或出错返回 None
+        """
+        if use_cache:
+            cached = cls.get_cached(word, source)
+            if cached is not None:
+                return cached
+
+        key = (word.lower(), source)
+        with cls._inflight_lock:
+            future = cls._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                cls._inflight[key] = future
+
+        if not is_owner:
+            try:
+                return future.result(timeout=cls._inflight_wait)
+            except Exception as e:
+                print(f"Dict {source} wait error: {e}")
+                return None
+
+        result = None
+        try:
+            # 上面查缓存之后、登记之前，同一查询可能刚好完成并写入了缓存
+            if use_cache:
+                result = cls.get_cached(word, source)
+            if result is None:
+                result = cls._fetch(word, source)
+                if result:
+                    cls.set_cache(word, source, result)
+        except Exception as e:
+            print(f"Dict {source} error: {e}")
+        finally:
+            with cls._inflight_lock:
+                cls._inflight.pop(key, None)
+            future.set_result(result)
+        return result
+
+    @classmethod
+    def _timed_lookup(cls, word, source, use_cache):
+        """在共享线程池中执行的查询任务，记录排队与耗时统计"""
+        _lookup_stats.on_start()
+        start = time.perf_counter()
+        result = None
+        try:
+            result = cls.lookup(word, source, use_cache)
+            return result
+        finally:
+            _lookup_stats.on_finish(source, time.perf_counter() - start, result is not None)
+
+    @classmethod
+    def submit_lookup(cls, word, source, use_cache=True):
+        """把单个词典源的查询提交到共享线程池，返回 Future"""
+        _lookup_stats.on_submit()
+        return get_lookup_executor().submit(cls._timed_lookup, word, source, use_cache)
+
+    @staticmethod
+    def get_lookup_stats():
+        """
+        查询线程池统计
+
+        Returns:
+            {'queue_depth': 排队数, 'running': 执行中,
+             'by_source': {源: {'count', 'errors', 'timeouts', 'avg_ms', 'p95_ms'}}}
+        """
+        return _lookup_stats.snapshot()
+
+    @classmethod
+    def get_memory_cache_stats(cls):
+        """内存缓存统计：条目数、估算字节数、命中/未命中/淘汰/过期次数"""
+        return cls._memory_cache.stats()
+
+    @classmethod
+    def clear_memory_cache(cls):
+        """清空内存缓存（统计计数保留）"""
+        cls._memory_cache.clear()
 
     @staticmethod
     def search_cambridge(word):
@@ -144,14 +373,14 @@ class MultiDictService:
         """
         try:
             # 剑桥词典 URL (English-Chinese Simplified)
-            url = f"https://dictionary.cambridge.org/dictionary/english-chinese-simplified/{word}"
+            url = f"{get_base_url(MultiDictService.DICT_CAMBRIDGE)}/dictionary/english-chinese-simplified/{word}"
             session = get_session()
             resp = session.get(url, timeout=10)
 
             if resp.status_code != 200:
                 return None
 
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = parse_cambridge(resp.text)
 
             # 检查是否找到单词 (di-title)
             if not soup.find('div', class_='di-title'):
@@ -224,14 +453,14 @@ class MultiDictService:
         """Bing 词典查询"""
         try:
             # 使用 mkt=zh-cn 强制中文版，setlang 备用
-            url = f"https://cn.bing.com/dict/search?q={word}&mkt=zh-cn&setlang=zh-hans"
+            url = f"{get_base_url(MultiDictService.DICT_BING)}/dict/search?q={word}&mkt=zh-cn&setlang=zh-hans"
             session = get_session()
             resp = session.get(url, timeout=8)
 
             if resp.status_code != 200:
                 return None
 
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = parse_bing(resp.text)
 
             if not soup.find('div', class_='qdef'):
                 return None
@@ -279,7 +508,7 @@ class MultiDictService:
     def search_free_dict(word):
         """Free Dictionary API 查询"""
         try:
-            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+            url = f"{get_base_url(MultiDictService.DICT_FREE)}/api/v2/entries/en/{word}"
             session = get_session()
             resp = session.get(url, timeout=8)
 
@@ -321,10 +550,34 @@ class MultiDictService:
             print(f"Free Dictionary search error: {e}")
             return None
 
+    # 各词典源的查询截止时间（秒，从聚合查询开始计时）
+    SOURCE_DEADLINES = {
+        DICT_YOUDAO: 10,
+        DICT_CAMBRIDGE: 10,
+        DICT_BING: 8,
+        DICT_FREE: 8,
+    }
+    # 主词典源返回后，再等待其他词典源的时间（秒）
+    PRIMARY_GRACE = 1.0
+
     @staticmethod
-    def aggregate_search(word, enabled_dicts=None, youdao_result=None):
+    def aggregate_search(word, enabled_dicts=None, youdao_result=None, use_cache=True,
+                         primary_grace=PRIMARY_GRACE, on_result=None):
         """
         聚合查询，包含 Youdao, Cambridge, Bing, FreeDict
+
+        所有启用的词典源（含有道）同时提交到共享线程池，每个源有各自的截止时间。
+        有道结果到达后最多再等 primary_grace 秒即返回已有结果；
+        之后才完成的查询仍会写入缓存，下次查询直接命中。
+
+        Args:
+            word: 单词
+            enabled_dicts: 启用的词典源列表，默认全部
+            youdao_result: 已有的有道结果（提供时不再查询有道）
+            use_cache: 是否读取缓存
+            primary_grace: 主结果到达后的额外等待秒数，None 表示等待所有词典源
+            on_result: 流式回调 on_result(source, result)，每个词典源查到结果时
+                       立即调用一次（在调用 aggregate_search 的线程中执行）
         """
         if enabled_dicts is None:
             enabled_dicts = [
@@ -336,35 +589,73 @@ class MultiDictService:
 
         results = {"primary": None, "sources": {}}
 
-        # 有道
-        if youdao_result:
+        def emit(source):
+            if on_result:
+                try:
+                    on_result(source, results["sources"][source])
+                except Exception as e:
+                    print(f"Dict result callback error: {e}")
+
+        def add_youdao(result):
             results["sources"][MultiDictService.DICT_YOUDAO] = {
                 "source": MultiDictService.DICT_YOUDAO,
                 "source_name": MultiDictService.DICT_NAMES[MultiDictService.DICT_YOUDAO],
-                **youdao_result
+                **result
             }
-            results["primary"] = youdao_result
+            results["primary"] = result
+            emit(MultiDictService.DICT_YOUDAO)
 
-        # 并发查询其他
-        tasks = {}
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            if MultiDictService.DICT_CAMBRIDGE in enabled_dicts:
-                tasks[executor.submit(MultiDictService.search_cambridge, word)] = MultiDictService.DICT_CAMBRIDGE
-            
-            if MultiDictService.DICT_BING in enabled_dicts:
-                tasks[executor.submit(MultiDictService.search_bing, word)] = MultiDictService.DICT_BING
+        # 有道
+        if youdao_result:
+            add_youdao(youdao_result)
 
-            if MultiDictService.DICT_FREE in enabled_dicts:
-                tasks[executor.submit(MultiDictService.search_free_dict, word)] = MultiDictService.DICT_FREE
+        # 所有词典源同时查询
+        start = time.monotonic()
+        tasks = {}
+        for source in enabled_dicts:
+            if source == MultiDictService.DICT_YOUDAO and youdao_result:
+                continue
+            if source not in MultiDictService.DICT_NAMES:
+                continue
+            tasks[MultiDictService.submit_lookup(word, source, use_cache)] = source
+
+        pending = set(tasks)
+        primary_at = start if youdao_result or MultiDictService.DICT_YOUDAO not in enabled_dicts else None
+
+        while pending:
+            now = time.monotonic()
+
+            # 超过截止时间的词典源不再等待
+            for future in [f for f in pending if now - start >= MultiDictService.SOURCE_DEADLINES.get(tasks[f], 10)]:
+                pending.discard(future)
+                _lookup_stats.on_timeout(tasks[future])
+                print(f"Dict {tasks[future]} timed out")
+            if not pending:
+                break
+
+            wait_until = min(start + MultiDictService.SOURCE_DEADLINES.get(tasks[f], 10) for f in pending)
+            if primary_at is not None and primary_grace is not None:
+                if now - primary_at >= primary_grace:
+                    break
+                wait_until = min(wait_until, primary_at + primary_grace)
 
-            for future in as_completed(tasks, timeout=12):
+            done, _ = wait(pending, timeout=max(0, wait_until - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
                 source = tasks[future]
                 try:
                     result = future.result()
-                    if result:
-                        results["sources"][source] = result
                 except Exception as e:
                     print(f"Dict {source} error: {e}")
+                    result = None
+
+                if source == MultiDictService.DICT_YOUDAO:
+                    if result:
+                        add_youdao(result)
+                        primary_at = time.monotonic()
+                elif result:
+                    results["sources"][source] = result
+                    emit(source)
 
         # 确定主要结果 (有道 > 剑桥 > Bing)
         if not results["primary"]:
@@ -94,24 +94,41 @@ class NotificationService:
 
 
 class ReviewScheduler:
-    """复习提醒调度器"""
+    """
+    复习提醒调度器（事件驱动）
 
-    def __init__(self, db_manager, notification_service, check_interval=1800):
+    不再按固定间隔轮询：每次检查后向数据库查询下一个单词的到期时间，
+    在条件变量上一直等到那时（再加上合并窗口）。单词表有写入时
+    （添加、复习、批量操作）会提前唤醒重新计算。同一窗口内陆续到期的
+    单词合并成一条通知。
+    """
+
+    def __init__(self, db_manager, notification_service, check_interval=1800, batch_window=300,
+                 startup_delay=60):
         """
         初始化调度器
 
         Args:
             db_manager: 数据库管理器
             notification_service: 通知服务
-            check_interval: 检查间隔（秒），默认30分钟
+            check_interval: 两次提醒之间的最短间隔（秒），默认30分钟
+            batch_window: 合并窗口（秒），下一个单词到期后再等这么久，
+                          让窗口内到期的单词合并为一条通知
+            startup_delay: 启动后首次检查前的等待（秒），避免刚打开就弹通知
         """
         self.db = db_manager
         self.notifier = notification_service
         self.check_interval = check_interval
+        self.batch_window = batch_window
+        self.startup_delay = startup_delay
         self.running = False
         self._thread = None
         self._last_notified_count = -1
+        self._last_notify_time = 0
         self._lock = threading.Lock()  # 数据库访问锁
+        self._wakeup = threading.Condition()
+        self._dirty = False  # 等待期间单词表有写入
+        self._pending_since = None  # 待复习数增加、尚未提醒的起始时间
 
     def start(self):
         """启动调度器"""
@@ -119,22 +136,24 @@ class ReviewScheduler:
             return
 
         self.running = True
+        self._dirty = False
+        self.db.add_change_listener(self._on_words_changed)
 
         def _scheduler_loop():
-            # 首次启动延迟 60 秒再检查，避免刚打开就弹通知
-            time.sleep(60)
+            self._wait_until(time.time() + self.startup_delay, wake_on_change=False)
 
             while self.running:
                 try:
-                    self._check_and_notify()
+                    deadline = self._check_and_notify()
                 except Exception as e:
                     print(f"Scheduler error: {e}")
+                    deadline = time.time() + self.check_interval
 
-                # 等待下一次检查
-                for _ in range(self.check_interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                woken_by_change = self._wait_until(deadline)
+                while woken_by_change and self.running:
+                    # 写入只更新待复习数和下一次检查时间，不直接弹通知
+                    deadline = self._check_and_notify(allow_notify=False)
+                    woken_by_change = self._wait_until(deadline)
 
         self._thread = threading.Thread(target=_scheduler_loop, daemon=True)
         self._thread.start()
@@ -142,25 +161,88 @@ class ReviewScheduler:
     def stop(self):
         """停止调度器"""
         self.running = False
+        self.db.remove_change_listener(self._on_words_changed)
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def _on_words_changed(self, change):
+        """单词表写入回调（在写入线程中调用），只做标记并唤醒调度线程。"""
+        with self._wakeup:
+            self._dirty = True
+            self._wakeup.notify_all()
+
+    def _wait_until(self, deadline, wake_on_change=True):
+        """
+        在条件变量上等待到 deadline（None 表示无期限），stop() 会提前结束等待。
+
+        Returns:
+            bool: 是否因单词表写入而提前唤醒
+        """
+        with self._wakeup:
+            while self.running:
+                if wake_on_change and self._dirty:
+                    self._dirty = False
+                    return True
+                if deadline is None:
+                    self._wakeup.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.wait(remaining)
+            self._dirty = False
+            return False
+
+    def _check_and_notify(self, allow_notify=True):
+        """
+        检查待复习单词，必要时发送通知，并计算下一次检查的时间
+
+        待复习数比上次提醒时增加后，等合并窗口结束（且距上次提醒不少于
+        check_interval）再提醒，窗口内陆续到期的单词合并为一条通知。
+
+        Args:
+            allow_notify: False 时只更新状态不发通知（被单词表写入唤醒时）
 
-    def _check_and_notify(self):
-        """检查待复习单词并发送通知"""
+        Returns:
+            下一次检查的时间戳，None 表示没有待安排的单词，等待写入唤醒
+        """
         try:
+            now = time.time()
             # 使用锁保护数据库访问
             with self._lock:
-                stats = self.db.get_statistics()
-                due_count = stats.get('due_today', 0)
-
-            # 只有当数量变化且有待复习时才通知
-            # 避免重复通知同一数量
-            if due_count > 0 and due_count != self._last_notified_count:
+                due_count = self.db.get_due_count(now)
+                next_due = self.db.get_next_due_time(now)
+
+            if due_count <= self._last_notified_count or due_count == 0:
+                # 没有新到期的单词；复习掉一部分时降低基准，之后新到期的单词仍会提醒
+                self._last_notified_count = min(self._last_notified_count, due_count)
+                self._pending_since = None
+            elif self._pending_since is None:
+                # 定时唤醒本身已经等过了合并窗口（或启动延迟），写入唤醒则从现在开始等
+                self._pending_since = now - self.batch_window if allow_notify else now
+
+            if self._pending_since is not None:
+                notify_at = max(self._pending_since + self.batch_window,
+                                self._last_notify_time + self.check_interval)
+                if not allow_notify or now < notify_at:
+                    return notify_at
                 self.notifier.notify_review_reminder(due_count)
                 self._last_notified_count = due_count
+                self._last_notify_time = now
+                self._pending_since = None
+
+            if next_due is None:
+                return None
+            return max(next_due + self.batch_window, self._last_notify_time + self.check_interval)
 
         except Exception as e:
+            # 查询失败（数据库暂时不可用等）：过一个检查间隔再试，而不是无限期等待写入唤醒
             print(f"Check review error: {e}")
+            return time.time() + self.check_interval
 
     def force_check(self):
         """强制检查一次（用于测试）"""
         self._last_notified_count = -1
+        self._last_notify_time = 0
+        self._pending_since = None
         self._check_and_notify()
@@ -0,0 +1,291 @@
+"""
+ReviewJournal - 复习评分的延迟批量写入
+
+功能：
+1. 评分先记入内存缓冲区，并追加到磁盘日志文件（每条一行 JSON）
+2. 定时、缓冲区满、复习结束或退出应用时，在一个事务中写入数据库
+3. 启动时重放上次未写入的日志，进程崩溃不会丢失评分
+
+持久性：
+- 日志行写入后立即 flush 到操作系统，应用崩溃后可恢复；
+  fsync=True 时每条都会 fsync，断电也不丢，但每次评分多一次磁盘同步
+- 每条事件带有递增序号，数据库记录已写入的最后序号，
+  重放时跳过已写入的事件（写库成功但未来得及清空日志的情况）
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class ReviewJournal:
+    def __init__(self, db_manager, journal_path, flush_interval=10, max_pending=50, fsync=False):
+        """
+        初始化复习日志
+
+        Args:
+            db_manager: DatabaseManager 实例
+            journal_path: 日志文件路径
+            flush_interval: 定时写入间隔（秒）
+            max_pending: 缓冲区达到多少条时立即写入
+            fsync: 是否每条评分都 fsync 日志文件
+        """
+        self.db = db_manager
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+
+        self._pending = []
+        self._flushing = []       # 正在写入数据库的事件（flush 不持有 _lock 写库）
+        self._journal_writes = 0  # 追加到日志文件的事件数，flush 据此判断能否清空日志
+        # 从数据库记录的最后序号接着编号：系统时钟回拨后新事件的序号仍大于已写入的序号，
+        # 不会在 apply_review_batch 中被当作已写入而跳过
+        self._last_seq = self.db.get_review_journal_seq()
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # 同一时间只有一个 flush
+        self._file = None
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Event()     # 缓冲区满时唤醒后台线程提前写入
+        self._thread = None
+
+        self.replay()
+
+    # --- 日志文件 ---
+
+    def _open_journal(self):
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        return self._file
+
+    def _truncate_journal(self):
+        """清空日志文件，只保留仍未写入数据库的事件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            for event in self._pending:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_journal(self):
+        """读取日志文件中的事件，忽略崩溃时写了一半的最后一行"""
+        events = []
+        if not os.path.exists(self.journal_path):
+            return events
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print("Review journal: skipping torn entry")
+        return events
+
+    def replay(self):
+        """把日志文件中遗留的事件写入数据库（启动时调用）"""
+        with self._lock:
+            events = self._read_journal()
+            if not events:
+                return 0
+            self._last_seq = max(self._last_seq, max(e['seq'] for e in events))
+            self._pending = events + self._pending
+            count = len(events)
+        self.flush()
+        print(f"Review journal: replayed {count} pending review(s)")
+        return count
+
+    # --- 记录与写入 ---
+
+    def _next_seq(self):
+        self._last_seq = max(self._last_seq + 1, time.time_ns())
+        return self._last_seq
+
+    def record(self, word_row, easiness, interval, repetitions, next_time, rating):
+        """
+        记录一次评分（不直接写数据库）
+
+        Args:
+            word_row: 评分前的单词行
+            easiness, interval, repetitions, next_time: SM-2 计算结果
+            rating: 评分
+
+        Returns:
+            变更记录 {'op': 'update', 'word', 'row'}，row 为合并评分后的单词行
+        """
+        row = dict(word_row)
+        word = row['word']
+        with self._lock:
+            event = {
+                'seq': self._next_seq(),
+                'word': word,
+                'easiness': easiness,
+                'interval': interval,
+                'repetitions': repetitions,
+                'next_time': next_time,
+                'rating': rating,
+                'review_date': datetime.now().strftime('%Y-%m-%d'),
+                # 评分前的到期安排，写入数据库前用于修正到期直方图（见 get_due_histogram）
+                'prev_time': row.get('next_review_time') or 0,
+                'prev_mastered': bool(row.get('mastered')),
+            }
+            f = self._open_journal()
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self._pending.append(event)
+            self._journal_writes += 1
+            should_flush = len(self._pending) >= self.max_pending
+
+        if should_flush:
+            # record 在界面线程中调用：交给后台线程写入，不在这里等待写线程
+            if self._thread is not None and self._thread.is_alive():
+                self._wakeup.set()
+            else:
+                self.flush()
+
+        row.update({
+            'easiness': easiness,
+            'interval': interval,
+            'repetitions': repetitions,
+            'next_review_time': next_time,
+            'mastered': bool(self.db.sm2_mastered(interval)),
+            'review_count': (row.get('review_count') or 0) + 1,
+        })
+        return {'op': 'update', 'word': word, 'row': row}
+
+    def _unwritten_events(self):
+        """尚未确认写入数据库的事件（正在写入的 + 缓冲区中的），按序号排列"""
+        with self._lock:
+            return self._flushing + self._pending
+
+    def review_history(self, word_row):
+        """
+        单词的全部复习记录：数据库中的记录加上尚未写入数据库的评分
+
+        Args:
+            word_row: 单词行（需要 id 和 word）
+
+        Returns:
+            [(YYYY-MM-DD, rating)]，按时间排序
+        """
+        events = [e for e in self._unwritten_events() if e['word'] == word_row['word']]
+        # 先取事件再读数据库：读取前已写入的事件按序号跳过，不会重复
+        rows, last_seq = self.db.read_with_review_journal_seq(
+            self.db.get_word_review_history, word_row['id'])
+        history = [tuple(row) for row in rows]
+        history.extend((e['review_date'], e['rating']) for e in events if e['seq'] > last_seq)
+        return history
+
+    def get_due_histogram(self, start_day, end_day):
+        """
+        与 DatabaseManager.get_due_histogram 相同，另外计入尚未写入数据库的评分：
+        每个有待写评分的单词从数据库中的原到期日减一、在最后一次评分安排的到期日加一
+
+        Returns:
+            {YYYY-MM-DD: count}
+        """
+        events = self._unwritten_events()
+        # 先取事件再读数据库：读取前已写入的事件按序号跳过，不会重复计算
+        histogram, last_seq = self.db.read_with_review_journal_seq(
+            self.db.get_due_histogram, start_day, end_day)
+
+        first, last = {}, {}
+        for e in events:
+            if e['seq'] > last_seq:
+                first.setdefault(e['word'], e)
+                last[e['word']] = e
+
+        def add(timestamp, delta):
+            day = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+            if start_day <= day <= end_day:
+                count = histogram.get(day, 0) + delta
+                if count > 0:
+                    histogram[day] = count
+                else:
+                    histogram.pop(day, None)
+
+        for word, e in first.items():
+            # 与 due_days 触发器的条件一致：未掌握且安排了复习时间
+            if e.get('prev_time') and not e.get('prev_mastered'):
+                add(e['prev_time'], -1)
+            e = last[word]
+            if e['next_time'] and not self.db.sm2_mastered(e['interval']):
+                add(e['next_time'], 1)
+        return histogram
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._flushing) + len(self._pending)
+
+    def flush(self):
+        """
+        把缓冲区中的评分在一个事务中写入数据库，成功后清空日志文件
+
+        写库期间不持有 _lock，record() 不会因等待写线程而阻塞界面；
+        正在进行的 flush 结束后才开始下一次，返回时之前记录的评分都已写入。
+
+        Returns:
+            写入的事件数；写入失败时返回 0，事件保留在缓冲区和日志中等待下次写入
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                events, self._pending = self._pending, []
+                self._flushing = events
+                journal_writes = self._journal_writes
+            try:
+                self.db.apply_review_batch(events)
+            except Exception as e:
+                print(f"Review journal flush failed: {e}")
+                with self._lock:
+                    self._pending = events + self._pending
+                    self._flushing = []
+                return 0
+            with self._lock:
+                self._flushing = []
+                # 写库期间又记录了评分时不清空：日志里已写入的事件重放时会按序号跳过
+                if self._journal_writes == journal_writes:
+                    try:
+                        self._truncate_journal()
+                    except OSError as e:
+                        print(f"Review journal truncate failed: {e}")
+            return len(events)
+
+    # --- 定时写入 ---
+
+    def start(self):
+        """启动后台定时写入线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stop_event.is_set():
+                break
+            self.flush()
+
+    def close(self):
+        """停止定时线程并写入剩余评分（退出应用时调用）"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,162 @@
+"""
+SM-2 批量调度引擎（NumPy 向量化）
+
+功能：
+1. schedule_sm2：一次计算成千上万张卡片的新 (easiness, interval, repetitions)，
+   结果与 ReviewService.calculate_sm2 逐张计算完全一致（含旧 stage 数据兼容）
+2. bulk_reschedule：对一批单词统一评分并写回（如休假回来把过期单词按"模糊"重排）
+3. simulate_workload：按当前词库预测未来每天的复习量
+"""
+
+import time
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# 旧的 stage 固定间隔（与 ReviewService.calculate_sm2 一致），stage > 6 按 30 天
+_STAGE_INTERVALS = np.array([1, 2, 4, 7, 15, 30], dtype=np.int64)
+
+# 与 DatabaseManager.sm2_mastered 一致：间隔超过 180 天视为已掌握
+MASTERED_INTERVAL = 180
+
+# 复习界面的三个评分按钮：忘了 / 模糊 / 熟悉
+REVIEW_QUALITIES = (1, 3, 5)
+
+
+def schedule_sm2(easiness, interval, repetitions, stage, quality):
+    """
+    向量化的 SM-2 计算
+
+    Args:
+        easiness, interval, repetitions, stage: 每张卡片当前的调度字段（数组，缺失值用 NaN 或 0）
+        quality: 评分 0-5，数组或标量
+
+    Returns:
+        (easiness, interval, repetitions)：float64 / int64 / int64 数组
+    """
+    easiness = np.asarray(easiness, dtype=np.float64)
+    n = easiness.shape[0]
+    interval = np.nan_to_num(np.asarray(interval, dtype=np.float64)).astype(np.int64)
+    repetitions = np.nan_to_num(np.asarray(repetitions, dtype=np.float64)).astype(np.int64)
+    stage = np.nan_to_num(np.asarray(stage, dtype=np.float64)).astype(np.int64)
+    quality = np.broadcast_to(np.asarray(quality, dtype=np.int64), (n,))
+
+    # `word_data.get('easiness') or 2.5`：None/NaN/0 都按默认值
+    easiness = np.where(np.isnan(easiness) | (easiness == 0), 2.5, easiness)
+
+    # 旧 stage 数据兼容
+    legacy = (repetitions == 0) & (stage > 0)
+    if legacy.any():
+        repetitions = np.where(legacy, stage, repetitions)
+        stage_interval = _STAGE_INTERVALS[np.clip(stage, 1, 6) - 1]
+        interval = np.where(legacy, stage_interval, interval)
+
+    # 1. Update Easiness Factor（运算顺序与标量版本相同，保证浮点结果一致）
+    passed = quality >= 3
+    miss = 5 - quality
+    easiness = np.where(passed, easiness + (0.1 - miss * (0.08 + miss * 0.02)), easiness)
+    easiness = np.maximum(easiness, 1.3)
+
+    # 2. Update Repetitions and Interval
+    grown = np.trunc(interval * easiness).astype(np.int64)
+    new_interval = np.select([repetitions == 0, repetitions == 1], [1, 6], grown)
+    interval = np.where(passed, new_interval, 1)
+    repetitions = np.where(passed, repetitions + 1, 0)
+
+    return easiness, interval, repetitions
+
+
+def next_review_times(interval, now=None):
+    """与 ReviewService.calculate_next_review_time 相同：now + interval 天"""
+    now = time.time() if now is None else now
+    return now + np.asarray(interval, dtype=np.float64) * SECONDS_PER_DAY
+
+
+def load_schedule_arrays(db, words=None, overdue_only=False, now=None):
+    """
+    从数据库读出未掌握单词的调度字段
+
+    Returns:
+        dict: 'id', 'easiness', 'interval', 'repetitions', 'stage', 'next_review_time' 各为一个数组
+    """
+    rows = db.get_schedule_rows(words=words, due_before=(time.time() if now is None else now) if overdue_only else None)
+    columns = list(zip(*rows)) if rows else [()] * 6
+    return {
+        'id': np.array(columns[0], dtype=np.int64),
+        'easiness': np.array(columns[1], dtype=np.float64),
+        'interval': np.array(columns[2], dtype=np.float64),
+        'repetitions': np.array(columns[3], dtype=np.float64),
+        'stage': np.array(columns[4], dtype=np.float64),
+        'next_review_time': np.array(columns[5], dtype=np.float64),
+    }
+
+
+def bulk_reschedule(db, quality, words=None, overdue_only=False, now=None):
+    """
+    对一批单词按同一评分重新计算 SM-2 调度并一次写回
+
+    例如休假回来：bulk_reschedule(db, 3, overdue_only=True) 把所有过期单词按"模糊"
+    处理，从今天起重新安排，而不是一次堆在今天。不写复习记录。
+
+    Returns:
+        更新的单词数
+    """
+    now = time.time() if now is None else now
+    state = load_schedule_arrays(db, words=words, overdue_only=overdue_only, now=now)
+    if not len(state['id']):
+        return 0
+
+    easiness, interval, repetitions = schedule_sm2(
+        state['easiness'], state['interval'], state['repetitions'], state['stage'], quality)
+    next_times = next_review_times(interval, now)
+    mastered = (interval > MASTERED_INTERVAL).astype(np.int64)
+
+    return db.bulk_update_schedules(zip(
+        easiness.tolist(), interval.tolist(), repetitions.tolist(),
+        next_times.tolist(), mastered.tolist(), state['id'].tolist()))
+
+
+def simulate_workload(state, days=365, now=None, grade_probs=(0.1, 0.2, 0.7), seed=None):
+    """
+    预测未来每天的复习量
+
+    每张卡片在到期当天被复习，评分按 grade_probs 的概率取 忘了/模糊/熟悉，
+    然后用 schedule_sm2 算出下一次到期日。每天只对当天到期的卡片做一次向量运算。
+    已过期的卡片算在第 0 天。间隔超过 MASTERED_INTERVAL 的卡片视为掌握，不再复习。
+
+    Args:
+        state: load_schedule_arrays 的返回值
+        days: 预测天数
+        grade_probs: (忘了, 模糊, 熟悉) 的概率
+        seed: 随机种子
+
+    Returns:
+        np.ndarray: 长度为 days 的每日复习数
+    """
+    now = time.time() if now is None else now
+    rng = np.random.default_rng(seed)
+    load = np.zeros(days, dtype=np.int64)
+
+    easiness = state['easiness'].copy()
+    interval = state['interval'].copy()
+    repetitions = state['repetitions'].copy()
+    stage = state['stage'].copy()
+    due_day = np.maximum(np.floor((state['next_review_time'] - now) / SECONDS_PER_DAY), 0).astype(np.int64)
+    active = np.ones(len(due_day), dtype=bool)
+
+    for day in range(days):
+        idx = np.flatnonzero(active & (due_day == day))
+        if not len(idx):
+            continue
+        load[day] = len(idx)
+
+        quality = rng.choice(REVIEW_QUALITIES, size=len(idx), p=grade_probs)
+        e, i, r = schedule_sm2(easiness[idx], interval[idx], repetitions[idx], stage[idx], quality)
+        easiness[idx] = e
+        interval[idx] = i
+        repetitions[idx] = r
+        due_day[idx] = day + i
+        active[idx] = i <= MASTERED_INTERVAL
+
+    return load
@@ -0,0 +1,140 @@
+"""
+有容量上限的 LRU + TTL 内存缓存
+
+功能：
+1. 按条目数和估算字节数双重限制容量，超出时淘汰最久未使用的条目
+2. 每个条目有自己的过期时间（调用方可按词典源设置不同 TTL）
+3. 统计命中、未命中、淘汰、过期次数
+4. 线程安全（词典查询在后台线程中进行）
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """估算缓存值占用的字节数（按 JSON 序列化后的 UTF-8 长度计算）"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class LRUCache:
+    def __init__(self, max_entries=500, max_bytes=8 * 1024 * 1024, default_ttl=1800, sizeof=estimate_size):
+        """
+        Args:
+            max_entries: 最多缓存的条目数，None 表示不限制
+            max_bytes: 估算字节数上限，None 表示不限制
+            default_ttl: 默认有效期（秒）
+            sizeof: 估算单个值大小的函数
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._sizeof = sizeof
+
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key, default=None):
+        """读取缓存，命中时把条目移到最近使用端；过期条目直接删除"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """写入缓存，必要时淘汰最久未使用的条目"""
+        size = self._sizeof(value)
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # 单个值超过整体预算，不缓存
+                return
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def purge_expired(self):
+        """清除所有已过期的条目，返回清除数量"""
+        with self._lock:
+            return self._purge_expired()
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired = [k for k, (_, expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def _over_capacity(self):
+        return bool(self._data) and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        )
+
+    def _evict(self):
+        if not self._over_capacity():
+            return
+        # 优先淘汰已过期的条目（不论在 LRU 顺序中的位置），仍超出时再淘汰最久未使用的
+        self._purge_expired()
+        while self._over_capacity():
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
@@ -26,6 +26,8 @@ class AddView(BaseView):
         # 搜索锁，防止重复搜索
         self._search_lock = threading.Lock()
         self._searching = False
+        # 流式显示中已到达的词典源数量
+        self._progressive_count = 0
 
         # 使用 grid 布局实现按比例扩展
         self.grid_columnconfigure(0, weight=1)
@@ -165,7 +167,6 @@ class AddView(BaseView):
             self.update_trans_box(ctx_cn)
 
         self.controller.db.update_context(word, ctx_en, ctx_cn)
-        self.controller.reload_vocab_list()
 
         messagebox.showinfo("成功", "例句已更新！")
         self.txt_context_en.delete("0.0", "end")
@@ -214,13 +215,16 @@ class AddView(BaseView):
             self.after(0, lambda: self.search_complete(None, "未在词库中找到该单词", None))
             return
 
-        # 1. 先获取有道结果 (保留原有的丰富数据: tags, roots, families)
-        youdao_result = DictService.search_word(word)
+        # 1. 同时查询所有词典（有道保留原有的丰富数据: tags, roots, families），优先读缓存
+        #    每个词典返回时立即显示其卡片，全部返回后再合并保存一次
+        self.after(0, self._begin_progressive_results)
 
-        # 2. 始终查询所有启用的词典，确保显示多词典结果
-        agg_results = MultiDictService.aggregate_search(word, youdao_result=youdao_result)
+        def on_result(source, result):
+            self.after(0, lambda: self._show_progressive_result(word, source, result))
+
+        agg_results = MultiDictService.aggregate_search(word, primary_grace=None, on_result=on_result)
         
-        # 3. 确定主要结果 (优先使用有道，如果没有则取其他有的)
+        # 2. 确定主要结果 (优先使用有道，如果没有则取其他有的)
         primary_result = agg_results.get("primary")
         
         if primary_result:
@@ -273,13 +277,11 @@ class AddView(BaseView):
             save_data['meaning'] = full_meaning_str
             save_data['example'] = all_examples
 
-            # Ensure date is present (fallback for non-Youdao sources)
-            if 'date' not in save_data:
-                save_data['date'] = datetime.now().strftime('%Y-%m-%d')
+            # 添加日期始终为今天（缓存中的查询结果可能带有旧日期）
+            save_data['date'] = datetime.now().strftime('%Y-%m-%d')
 
-            # Add to DB
+            # Add to DB (the vocab store picks up the insert delta)
             self.controller.db.add_word(save_data)
-            self.controller.reload_vocab_list()
 
             # Save word family associations (派生词关联) - 仅 Youdao 有
             word_families = save_data.get('word_families', [])
@@ -320,7 +322,6 @@ class AddView(BaseView):
 
         # 保存到数据库
         self.controller.db.add_word(save_data)
-        self.controller.reload_vocab_list()
 
         # 保存派生词关联
         word_families = save_data.get('word_families', [])
@@ -398,6 +399,23 @@ class AddView(BaseView):
         self.btn_play_result.configure(state="normal", fg_color="green", command=lambda: self.play_audio(item['word'], self.btn_play_result))
         self.after(500, lambda: self.play_audio(item['word'], self.btn_play_result))
 
+    def _begin_progressive_results(self):
+        """开始流式显示：清空结果区域"""
+        for widget in self.result_container.winfo_children():
+            widget.destroy()
+        self._progressive_count = 0
+
+    def _show_progressive_result(self, word, source, result):
+        """某个词典源的结果到达时立即追加对应卡片"""
+        if self._progressive_count == 0:
+            self._create_header_card(word, result.get('phonetic', ''))
+        self._progressive_count += 1
+
+        meaning = (result.get('meaning') or '').strip()
+        if meaning:
+            self._create_source_card(MultiDictService.DICT_NAMES.get(source, source), meaning)
+        self.status_label.configure(text=f"查询中... 已返回 {self._progressive_count} 个词典", text_color="gray")
+
     def search_complete(self, display_text, status, word, agg_results=None):
         self.btn_search.configure(state="normal")
         self.status_label.configure(text=status, text_color="green" if "✅" in status else "red")
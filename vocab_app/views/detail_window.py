@@ -636,7 +636,6 @@ class DetailWindow(ctk.CTkToplevel):
         from tkinter import messagebox
         if messagebox.askyesno("确认", "确定删除该单词吗？"):
             self.controller.db.delete_word(self.item['word'])
-            self.controller.reload_vocab_list()
             if "list" in self.controller.frames:
                 self.controller.frames["list"].refresh_list()
             self.destroy()
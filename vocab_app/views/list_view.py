@@ -3,9 +3,11 @@ import tkinter as tk
 from tkinter import messagebox
 import re
 import time
+import threading
 from datetime import datetime
 from .base_view import BaseView
 from ..config import FONT_NORMAL, FONT_BOLD, FONT_LARGE
+from ..services.export_service import ExportService
 
 class ListView(BaseView):
     def setup_ui(self):
@@ -15,7 +17,10 @@ class ListView(BaseView):
         self.page_size = 20
         self.current_page = 1
         self.total_pages = 1
-        self.filtered_vocab_list = []
+        self.total_items = 0
+        self.page_items = []  # Rows of the current page only (fetched from DB)
+        self._page_cursors = [None]  # Keyset cursor for the start of each visited page
+        self._query_now = 0  # Timestamp the current result ordering was computed with
         self.search_query = ""
         self.status_filter = "全部"
         self.tag_filter = ""  # Tag filter state
@@ -137,6 +142,34 @@ class ListView(BaseView):
         # Keyboard navigation bindings
         self.bind_keyboard_events()
 
+        # Row-level deltas from the vocab store (reviews, saves, deletes elsewhere)
+        self._delta_refresh_timer = None
+        vocab_store = getattr(self.controller, 'vocab_store', None)
+        if vocab_store:
+            vocab_store.subscribe(self._on_vocab_change)
+
+    def _on_vocab_change(self, change):
+        """Vocab store subscriber, may run on a worker thread."""
+        try:
+            self.after(0, lambda: self._schedule_delta_refresh(change))
+        except Exception:
+            pass
+
+    def _schedule_delta_refresh(self, change):
+        """Refresh the visible page when a delta touches it (debounced)."""
+        if not self.winfo_ismapped():
+            return  # on_show refreshes anyway
+        if change['op'] not in ('insert', 'reload'):
+            if not any(item['word'] == change['word'] for item in self.page_items):
+                return
+        if self._delta_refresh_timer:
+            self.after_cancel(self._delta_refresh_timer)
+        self._delta_refresh_timer = self.after(200, self._on_delta_refresh_timer)
+
+    def _on_delta_refresh_timer(self):
+        self._delta_refresh_timer = None
+        self.refresh_list()
+
     def bind_keyboard_events(self):
         """Bind keyboard events for list navigation"""
         # Bind to the scrollable frame and main view
@@ -175,19 +208,14 @@ class ListView(BaseView):
 
     def on_key_up(self, event=None):
         """Move focus to previous row"""
-        if not self.filtered_vocab_list:
+        if not self.page_items:
             return "break"
         
-        # Calculate visible range
-        start_idx = (self.current_page - 1) * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.filtered_vocab_list))
-        page_count = end_idx - start_idx
-        
         if self.focused_index <= 0:
             # At top of page, go to previous page if possible
             if self.current_page > 1:
                 self.go_prev_page()
-                self.focused_index = min(self.page_size - 1, len(self.filtered_vocab_list) - (self.current_page - 1) * self.page_size - 1)
+                self.focused_index = len(self.page_items) - 1
                 self._update_focus_highlight()
         else:
             self.focused_index -= 1
@@ -197,13 +225,10 @@ class ListView(BaseView):
     
     def on_key_down(self, event=None):
         """Move focus to next row"""
-        if not self.filtered_vocab_list:
+        if not self.page_items:
             return "break"
         
-        # Calculate visible range
-        start_idx = (self.current_page - 1) * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.filtered_vocab_list))
-        page_count = end_idx - start_idx
+        page_count = len(self.page_items)
         
         if self.focused_index < 0:
             # No focus yet, focus first item
@@ -222,39 +247,34 @@ class ListView(BaseView):
     
     def on_key_enter(self, event=None):
         """Open detail window for focused item"""
-        if self.focused_index < 0 or not self.filtered_vocab_list:
+        if self.focused_index < 0 or not self.page_items:
             return "break"
         
-        start_idx = (self.current_page - 1) * self.page_size
-        actual_idx = start_idx + self.focused_index
-        
-        if 0 <= actual_idx < len(self.filtered_vocab_list):
-            item = self.filtered_vocab_list[actual_idx]
+        if self.focused_index < len(self.page_items):
+            item = self.page_items[self.focused_index]
             self.view_word_detail(item)
         
         return "break"
     
     def on_key_delete(self, event=None):
         """Delete focused item"""
-        if self.focused_index < 0 or not self.filtered_vocab_list:
+        if self.focused_index < 0 or not self.page_items:
             return "break"
         
-        start_idx = (self.current_page - 1) * self.page_size
-        actual_idx = start_idx + self.focused_index
-        
-        if 0 <= actual_idx < len(self.filtered_vocab_list):
-            item = self.filtered_vocab_list[actual_idx]
+        if self.focused_index < len(self.page_items):
+            item = self.page_items[self.focused_index]
             self.delete_word(item['word'])
         
         return "break"
     
     def on_key_select_all(self, event=None):
         """Select all words in the current filtered list"""
-        if not self.filtered_vocab_list:
+        if not self.page_items:
             return "break"
         
         # Toggle: if all are selected, deselect all; otherwise select all
-        all_words = {item['word'] for item in self.filtered_vocab_list}
+        # Only the word column is fetched, the full rows stay in the DB
+        all_words = set(self.controller.db.get_matching_words(now=self._query_now, **self._current_filters()))
         if all_words.issubset(self.selected_words):
             # All selected, deselect all
             self.selected_words.clear()
@@ -268,9 +288,7 @@ class ListView(BaseView):
     
     def _update_focus_highlight(self):
         """Update visual highlight for keyboard-focused row"""
-        start_idx = (self.current_page - 1) * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.filtered_vocab_list))
-        page_count = end_idx - start_idx
+        page_count = len(self.page_items)
         
         for i in range(len(self.row_pool)):
             if i >= page_count:
@@ -334,10 +352,7 @@ class ListView(BaseView):
 
     def _update_checkboxes(self):
         """Update all visible checkbox states based on selected_words"""
-        start_idx = (self.current_page - 1) * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.filtered_vocab_list))
-        
-        for i, item in enumerate(self.filtered_vocab_list[start_idx:end_idx]):
+        for i, item in enumerate(self.page_items):
             if i < len(self.row_pool):
                 if item['word'] in self.selected_words:
                     self.row_pool[i]['checkbox'].select()
@@ -509,10 +524,8 @@ class ListView(BaseView):
             def handler(e):
                 current_item = r.get('current_item')
                 if current_item:
-                    start_idx = (self.current_page - 1) * self.page_size
                     try:
-                        page_items = self.filtered_vocab_list[start_idx:start_idx + self.page_size]
-                        idx = page_items.index(current_item)
+                        idx = self.page_items.index(current_item)
                         self._on_row_click_focus(idx)
                     except (ValueError, IndexError):
                         pass
@@ -591,12 +604,7 @@ class ListView(BaseView):
 
         count = len(self.selected_words)
         if messagebox.askyesno("批量删除", f"确定要删除选中的 {count} 个单词吗？\n此操作不可撤销。"):
-            for word in list(self.selected_words): # iterate copy
-                self.controller.db.delete_word(word)
-
-            self.selected_words.clear()
-            self.refresh_list()
-            messagebox.showinfo("完成", "删除成功")
+            self._run_batch_operation(self.controller.db.delete_words, "删除", "删除成功")
 
     def batch_mark_mastered(self):
         if not self.selected_words:
@@ -605,32 +613,45 @@ class ListView(BaseView):
 
         count = len(self.selected_words)
         if messagebox.askyesno("批量操作", f"确定将选中的 {count} 个单词标记为已掌握吗？"):
-            # Update DB for each selected word
-            # Using update_review_status or similar logic, but since we just want to set mastered=1,
-            # we might need a dedicated method in DB or reuse existing one.
-            # update_review_status requires stage/next_time/mastered.
-            # Let's add a simple batch update method in controller or DB, or just loop here.
-            # Looping is fine for now as user won't select thousands at once usually.
-
-            # However, to be clean, let's just use a direct SQL update in loop via a new DB method or existing one.
-            # Reusing update_review_status might reset review count or history if not careful.
-            # Let's add a specialized method in DatabaseManager first?
-            # Or just use raw SQL via a helper if available.
-            # Looking at database.py, we don't have a simple "set_mastered" method.
-            # Let's define one locally or call a new method on DB.
-            # Since I can't edit DB file in this turn easily without switching context,
-            # I will assume I can add it or just use what I have.
-            # Wait, I CAN edit DB file. But for now let's implement the logic assuming I'll add the method.
-
-            for word in list(self.selected_words):
-                # We need to preserve other fields? No, just set mastered=1.
-                # But update_review_status updates stage and next_review_time too.
-                # Let's use a new method `mark_word_mastered(word)` in DB.
-                self.controller.db.mark_word_mastered(word)
+            self._run_batch_operation(self.controller.db.mark_mastered, "标记", "已全部标记为已掌握")
 
-            self.selected_words.clear()
+    def _run_batch_operation(self, operation, verb, done_message):
+        """
+        在后台线程执行批量数据库操作（一个事务），避免大量选中时界面卡死
+
+        Args:
+            operation: DatabaseManager 的批量方法，签名 (words, on_progress)
+            verb: 进度提示中的动作名称
+            done_message: 完成后的提示
+        """
+        words = list(self.selected_words)
+        batch_buttons = [self.btn_batch_master, self.btn_batch_export, self.btn_batch_del]
+        for btn in batch_buttons:
+            btn.configure(state="disabled")
+
+        def on_progress(done, total):
+            self.after(0, lambda: self.lbl_results_count.configure(text=f"正在{verb} {done}/{total}..."))
+
+        def finish(error=None):
+            for btn in batch_buttons:
+                btn.configure(state="normal")
+            if error:
+                messagebox.showerror("错误", f"操作失败: {error}")
+            else:
+                self.selected_words.clear()
             self.refresh_list()
-            messagebox.showinfo("完成", "已全部标记为已掌握")
+            if not error:
+                messagebox.showinfo("完成", done_message)
+
+        def worker():
+            try:
+                operation(words, on_progress=on_progress)
+                self.after(0, finish)
+            except Exception as e:
+                err = str(e)
+                self.after(0, lambda: finish(err))
+
+        threading.Thread(target=worker, daemon=True).start()
 
     def batch_export(self):
         if not self.selected_words:
@@ -638,44 +659,21 @@ class ListView(BaseView):
             return
 
         from tkinter import filedialog
-        import csv
 
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+            filetypes=ExportService.filetypes() + [("All Files", "*.*")],
             title="导出选中单词"
         )
         if not filename:
             return
 
-        try:
-            # Gather data for selected words
-            selected_items = [
-                item for item in self.controller.vocab_list
-                if item['word'] in self.selected_words
-            ]
-
-            # Define CSV headers
-            headers = ['word', 'phonetic', 'meaning', 'example', 'tags', 'mastered', 'stage']
-
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=headers)
-                writer.writeheader()
-                for item in selected_items:
-                    writer.writerow({
-                        'word': item.get('word', ''),
-                        'phonetic': item.get('phonetic', ''),
-                        'meaning': item.get('meaning', ''),
-                        'example': item.get('example', ''),
-                        'tags': item.get('tags', ''),
-                        'mastered': 'Yes' if item.get('mastered') else 'No',
-                        'stage': item.get('stage', 0)
-                    })
-
-            messagebox.showinfo("完成", f"成功导出 {len(selected_items)} 个单词")
-            # Optional: clear selection? No, user might want to keep selection.
-        except Exception as e:
-            messagebox.showerror("错误", f"导出失败: {str(e)}")
+        # 选中的单词按参数分块查询，直接从数据库流式写出
+        success, msg = ExportService.export(filename, self.controller.db, words=sorted(self.selected_words))
+        if success:
+            messagebox.showinfo("完成", msg)
+        else:
+            messagebox.showerror("错误", f"导出失败: {msg}")
 
     def create_pagination_controls(self):
         self.pagination_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -730,8 +728,11 @@ class ListView(BaseView):
             print(f"Error refreshing tag options: {e}")
 
     def refresh_list(self):
-        self.controller.reload_vocab_list()
-        self.apply_filters()
+        # Stay on the current page: its keyset cursor is still valid after edits.
+        # Later pages keep the timestamp encoded in their cursor.
+        if self.current_page == 1:
+            self._query_now = datetime.now().timestamp()
+        self._load_page()
         self.render_current_page()
         self.update_pagination_controls()
 
@@ -746,8 +747,8 @@ class ListView(BaseView):
         
         # Pass the current filtered list and the index of this item
         try:
-            current_index = self.filtered_vocab_list.index(item)
-            items_list = self.filtered_vocab_list
+            current_index = self.page_items.index(item)
+            items_list = self.page_items
         except (AttributeError, ValueError):
             # Fallback if list not found or item not in current filter
             items_list = [item]
@@ -806,7 +807,6 @@ class ListView(BaseView):
     # --- Search & Filter ---
     def _reset_and_render(self):
         """Common helper to reset page, apply filters, and render."""
-        self.current_page = 1
         self.apply_filters()
         self.render_current_page()
         self.update_pagination_controls()
@@ -836,22 +836,8 @@ class ListView(BaseView):
             self.tag_filter = value
         self._reset_and_render()
 
-    def sort_vocab_list(self, items, now_ts):
-        def sort_key(item):
-            if item.get('mastered'): return (3, 0)
-            next_time = item.get('next_review_time', 0)
-            if next_time == 0: return (1, 0)
-            elif next_time <= now_ts: return (0, next_time)
-            else: return (2, next_time)
-        return sorted(items, key=sort_key)
-
-    def apply_filters(self):
-        """
-        使用数据库层搜索和状态过滤，避免内存中二次过滤，提升大词库性能。
-        """
-        query = self.search_query.lower().strip()
-        now_ts = datetime.now().timestamp()
-
+    def _current_filters(self):
+        """Map the UI filter state to search_words keyword arguments."""
         # 映射 UI 状态到数据库层 status_filter
         status = self.status_filter
         status_filter = None
@@ -867,21 +853,55 @@ class ListView(BaseView):
             status_filter = "learning"
         # "全部" 不设置任何过滤
 
-        # 使用数据库搜索（完全在数据库层过滤，无需二次过滤）
-        results, total_count = self.controller.db.search_words(
-            keyword=query,
-            tag_filter=self.tag_filter,
-            mastered_filter=mastered_filter,
-            status_filter=status_filter,
-            limit=10000,  # 获取足够多的结果用于排序和分页
-            offset=0
+        return {
+            'keyword': self.search_query.lower().strip(),
+            'tag_filter': self.tag_filter,
+            'mastered_filter': mastered_filter,
+            'status_filter': status_filter,
+        }
+
+    def apply_filters(self):
+        """
+        按当前过滤条件重新查询，从第一页开始。
+
+        排序（待复习 > 新单词 > 学习中 > 已掌握）在 SQL 中完成，每次只取当前页，
+        翻页使用数据库返回的游标；总数来自 DatabaseManager 的计数缓存。
+        """
+        self._query_now = datetime.now().timestamp()
+        self._page_cursors = [None]
+        self.current_page = 1
+        self._load_page()
+
+    def _load_page(self):
+        """Fetch the rows of self.current_page using the stored keyset cursor."""
+        if self.current_page > len(self._page_cursors):
+            # Cursor for this page is unknown (e.g. list shrank), restart from the top
+            self.current_page = 1
+
+        results, total_count, next_cursor = self.controller.db.search_words(
+            sort_by="status",
+            limit=self.page_size,
+            cursor=self._page_cursors[self.current_page - 1],
+            now=self._query_now,
+            **self._current_filters()
         )
 
-        self.filtered_vocab_list = self.sort_vocab_list(results, now_ts)
-        total_items = len(self.filtered_vocab_list)
-        self.total_pages = max(1, (total_items + self.page_size - 1) // self.page_size)
-        if self.current_page > self.total_pages: self.current_page = self.total_pages
-        self.lbl_results_count.configure(text=f"找到 {total_items} 个单词")
+        # Remember where the next page starts so "next" never needs an OFFSET scan
+        del self._page_cursors[self.current_page:]
+        if next_cursor:
+            self._page_cursors.append(next_cursor)
+
+        if not results and self.current_page > 1:
+            # The page emptied out (e.g. its last rows were deleted), show the previous one
+            self.current_page -= 1
+            return self._load_page()
+
+        self.page_items = results
+        self.total_items = total_count
+        self.total_pages = max(1, (total_count + self.page_size - 1) // self.page_size)
+        if self.current_page > self.total_pages:
+            self.current_page = self.total_pages
+        self.lbl_results_count.configure(text=f"找到 {total_count} 个单词")
 
     def render_current_page(self):
         for row in self.row_pool:
@@ -890,7 +910,7 @@ class ListView(BaseView):
         # Reset focus when page content changes
         self.focused_index = -1
 
-        if not self.filtered_vocab_list:
+        if not self.page_items:
             for row in self.row_pool: row['frame'].pack_forget()
             if self.row_pool:
                 empty_row = self.row_pool[0]
@@ -902,9 +922,7 @@ class ListView(BaseView):
                 empty_row['frame'].pack(fill="x", pady=100)
             return
 
-        start_idx = (self.current_page - 1) * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.filtered_vocab_list))
-        page_items = self.filtered_vocab_list[start_idx:end_idx]
+        page_items = self.page_items
         now_ts = datetime.now().timestamp()
 
         while len(self.row_pool) < len(page_items):
@@ -960,12 +978,12 @@ class ListView(BaseView):
         new_page = self.current_page + delta
         if 1 <= new_page <= self.total_pages:
             self.current_page = new_page
+            self._load_page()
             self.render_current_page()
             self.update_pagination_controls()
 
     def on_page_size_change(self, value):
         self.page_size = int(value)
-        self.current_page = 1
         self.apply_filters()
         while len(self.row_pool) < self.page_size:
             row = self.create_row_widget()
@@ -17,7 +17,8 @@ class ReviewView(BaseView):
         
         # UI State
         self.spelling_checked = False
-        self.queue = []
+        self.queue = []          # 单词 id 队列，整行在显示卡片时再读取
+        self._session_rows = {}  # 本轮中被重新排队的单词的最新行数据 (id -> row)
         self.cur_word = None
         self.review_completed = 0
         self.review_total = 0
@@ -174,18 +175,13 @@ class ReviewView(BaseView):
         self.start_review()
 
     def start_review(self):
-        self.controller.reload_vocab_list()
-        vocab_list = self.controller.vocab_list
+        # 先写入上一轮缓冲的评分，保证到期筛选基于最新数据
+        self.controller.review_journal.flush()
         now_ts = datetime.now().timestamp()
 
-        self.queue = []
-        for w in vocab_list:
-            if w.get('mastered', False) and not self.is_cram_mode: continue
-            next_time = w.get('next_review_time', 0)
-            if self.is_cram_mode or next_time <= now_ts:
-                self.queue.append(w)
-
-        random.shuffle(self.queue)
+        # 只取 id，由数据库按到期时间索引筛选，不再遍历整个词库
+        self.queue = self.controller.db.build_review_queue(now=now_ts, cram=self.is_cram_mode)
+        self._session_rows = {}
         self.review_total = len(self.queue)
         self.review_completed = 0
         self.cur_word = None
@@ -293,11 +289,11 @@ class ReviewView(BaseView):
             self.lbl_review_progress.configure(text="无待复习单词")
 
 
-        if not self.queue:
+        self.cur_word = self._fetch_next_word()
+        if not self.cur_word:
             self.show_finished_screen()
             return
 
-        self.cur_word = self.queue[0]
         word = self.cur_word['word']
         example = self.cur_word.get('example', '')
         context = self.cur_word.get('context_en', '')
@@ -318,6 +314,16 @@ class ReviewView(BaseView):
         # Auto play audio for all modes including spelling
         self._safe_play_audio()
 
+    def _fetch_next_word(self):
+        """读取队首单词的整行数据；已被删除的单词直接出队跳过"""
+        while self.queue:
+            word_id = self.queue[0]
+            row = self._session_rows.pop(word_id, None) or self.controller.db.get_word_by_id(word_id)
+            if row:
+                return row
+            self.queue.pop(0)
+        return None
+
     def _safe_play_audio(self):
         """安全播放当前单词发音（类方法，避免在循环中重复定义）"""
         if self.cur_word:
@@ -479,13 +485,17 @@ class ReviewView(BaseView):
 
     def process_review_sm2(self, quality):
         if not self.cur_word: return
-        word = self.cur_word['word']
 
         easiness, interval, repetitions = ReviewService.calculate_sm2(quality, self.cur_word)
-        next_ts = ReviewService.calculate_next_review_time(interval)
-
-        self.controller.db.update_sm2_status(word, easiness, interval, repetitions, next_ts, quality)
-        self.controller.reload_vocab_list()
+        if self.controller.fsrs is not None:
+            # FSRS 替换间隔（interval 列保存的是 FSRS 间隔），easiness / repetitions 仍按 SM-2 更新，
+            # 切回 SM-2 时从当前间隔继续。历史要包含日志中尚未写入数据库的评分
+            history = self.controller.review_journal.review_history(self.cur_word)
+            interval = self.controller.fsrs.next_interval(history, quality)
+        next_ts = self.controller.review_balancer.next_review_time(interval)
+
+        # 评分进入延迟写入日志，由 ReviewJournal 批量提交
+        change = self.controller.review_journal.record(self.cur_word, easiness, interval, repetitions, next_ts, quality)
         
         # 统计评分
         if quality >= 4:
@@ -503,11 +513,12 @@ class ReviewView(BaseView):
             if quality >= 3:
                 self.review_completed += 1
             else:
-                # Re-insert for short term
-                updated_word = self.controller.db.get_word(word)
+                # Re-insert for short term (the change record carries the updated row)
+                updated_word = change['row'] if change else None
                 if updated_word:
                     insert_pos = random.randint(1, len(self.queue)) if len(self.queue) > 0 else 0
-                    self.queue.insert(insert_pos, updated_word)
+                    self.queue.insert(insert_pos, updated_word['id'])
+                    self._session_rows[updated_word['id']] = updated_word
 
         self.next_card()
 
@@ -525,6 +536,7 @@ class ReviewView(BaseView):
 
     def show_finished_screen(self):
         self.stop_timer() # Stop the timer
+        self.controller.review_journal.flush()
         # 隐藏操作区域
         for child in [self.reveal_overlay, self.exercise_overlay, self.act_frame]:
             child.pack_forget()
@@ -622,5 +634,6 @@ class ReviewView(BaseView):
         # 清空队列，触发结束统计
         with self._queue_lock:
             self.queue.clear()
+            self._session_rows.clear()
         
         self.show_finished_screen()
@@ -3,13 +3,16 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 import shutil
+import threading
 from PIL import Image
 from datetime import datetime, timedelta
 
 from .base_view import BaseView, CTkToolTip
-from ..config import SOUNDS_DIR, save_config, BASE_DIR, RESOURCE_DIR, APP_VERSION
+from ..config import SOUNDS_DIR, save_config, BASE_DIR, RESOURCE_DIR, APP_VERSION, DB_PATH
 from ..services.export_service import ExportService
+from ..services.import_service import ImportService
 from ..services.update_service import UpdateService
+from ..services.multi_dict_service import MultiDictService
 
 class SettingsView(BaseView):
     def setup_ui(self):
@@ -125,11 +128,13 @@ class SettingsView(BaseView):
         if category_name == "stats":
             self.create_stats_card(parent)
             self.create_heatmap_card(parent)
+            self.create_forecast_card(parent)
             self.create_data_card(parent)
             self.create_cache_card(parent)
 
         elif category_name == "general":
             self.create_behavior_card(parent)
+            self.create_algorithm_card(parent)
             self.create_hotkey_card(parent)
 
         elif category_name == "dicts":
@@ -212,6 +217,21 @@ class SettingsView(BaseView):
         )
         self.heatmap_canvas.pack(fill="x", expand=True)
 
+    def create_forecast_card(self, parent):
+        card = ctk.CTkFrame(parent, fg_color=("white", "#2b2b2b"), corner_radius=15)
+        card.pack(fill="x", padx=15, pady=8)
+        self.create_section_header(card, "📈", "复习量预测 (未来30天)", "#009688")
+
+        forecast_container = ctk.CTkFrame(card, fg_color="transparent")
+        forecast_container.pack(fill="x", padx=20, pady=(0, 20))
+
+        self.forecast_canvas = tk.Canvas(
+            forecast_container, height=120,
+            bg=self.get_canvas_bg().replace("gray95", "white"),
+            highlightthickness=0, bd=0
+        )
+        self.forecast_canvas.pack(fill="x", expand=True)
+
     def create_dict_sources_card(self, parent):
         """创建多词典源配置卡片"""
         card = ctk.CTkFrame(parent, fg_color=("white", "#2b2b2b"), corner_radius=15)
@@ -390,12 +410,20 @@ class SettingsView(BaseView):
 
         # 词典缓存行
         dict_cache_row = ctk.CTkFrame(cache_info_box, fg_color="transparent")
-        dict_cache_row.pack(fill="x", padx=15, pady=(0, 15))
+        dict_cache_row.pack(fill="x", padx=15, pady=(0, 8))
 
         ctk.CTkLabel(dict_cache_row, text="📚 词典缓存", font=("Microsoft YaHei UI", 13)).pack(side="left")
         self.lbl_dict_cache = ctk.CTkLabel(dict_cache_row, text="计算中...", font=("Microsoft YaHei UI", 13, "bold"))
         self.lbl_dict_cache.pack(side="left", padx=10)
 
+        # 内存缓存行（命中/淘汰统计）
+        memory_cache_row = ctk.CTkFrame(cache_info_box, fg_color="transparent")
+        memory_cache_row.pack(fill="x", padx=15, pady=(0, 15))
+
+        ctk.CTkLabel(memory_cache_row, text="⚡ 内存缓存", font=("Microsoft YaHei UI", 13)).pack(side="left")
+        self.lbl_memory_cache = ctk.CTkLabel(memory_cache_row, text="计算中...", font=("Microsoft YaHei UI", 13, "bold"))
+        self.lbl_memory_cache.pack(side="left", padx=10)
+
         # 清理按钮行
         btn_row = ctk.CTkFrame(card, fg_color="transparent")
         btn_row.pack(fill="x", padx=20, pady=(0, 20))
@@ -467,6 +495,36 @@ class SettingsView(BaseView):
         )
         self.reminder_dropdown.pack(side="right")
 
+        # 复习负载均衡
+        balance_row = ctk.CTkFrame(card, fg_color="transparent")
+        balance_row.pack(fill="x", padx=20, pady=(0, 15))
+
+        balance_left = ctk.CTkFrame(balance_row, fg_color="transparent")
+        balance_left.pack(side="left", fill="x", expand=True)
+
+        ctk.CTkLabel(
+            balance_left,
+            text="复习日期负载均衡",
+            font=("Microsoft YaHei UI", 13),
+            anchor="w"
+        ).pack(anchor="w")
+
+        ctk.CTkLabel(
+            balance_left,
+            text="在间隔附近的几天里选择复习量最少的一天，避免复习量集中在某一天",
+            font=("Microsoft YaHei UI", 11),
+            text_color=("gray50", "gray60"),
+            anchor="w"
+        ).pack(anchor="w")
+
+        self.load_balance_switch = ctk.CTkSwitch(
+            balance_row,
+            text="",
+            width=50,
+            command=self.on_load_balance_change
+        )
+        self.load_balance_switch.pack(side="right", padx=10)
+
         # 说明文字
         ctk.CTkLabel(
             card,
@@ -477,6 +535,111 @@ class SettingsView(BaseView):
             anchor="w"
         ).pack(fill="x", padx=20, pady=(0, 20))
 
+    def create_algorithm_card(self, parent):
+        """创建复习算法设置卡片"""
+        card = ctk.CTkFrame(parent, fg_color=("white", "#2b2b2b"), corner_radius=15)
+        card.pack(fill="x", padx=15, pady=8)
+        self.create_section_header(card, "🧠", "复习算法", "#673AB7")
+
+        algo_row = ctk.CTkFrame(card, fg_color="transparent")
+        algo_row.pack(fill="x", padx=20, pady=(0, 15))
+
+        ctk.CTkLabel(
+            algo_row,
+            text="复习间隔算法",
+            font=("Microsoft YaHei UI", 13)
+        ).pack(side="left")
+
+        self.algorithm_dropdown = ctk.CTkOptionMenu(
+            algo_row,
+            values=["SM-2", "FSRS"],
+            width=140,
+            height=35,
+            font=("Microsoft YaHei UI", 13),
+            command=self.on_algorithm_change
+        )
+        self.algorithm_dropdown.pack(side="right")
+
+        fit_row = ctk.CTkFrame(card, fg_color="transparent")
+        fit_row.pack(fill="x", padx=20, pady=(0, 10))
+
+        self.btn_fit_fsrs = ctk.CTkButton(
+            fit_row, text="📐 根据复习记录拟合 FSRS 参数", height=35,
+            font=("Microsoft YaHei UI", 13), command=self.fit_fsrs_params
+        )
+        self.btn_fit_fsrs.pack(side="left")
+
+        self.lbl_fsrs_status = ctk.CTkLabel(
+            card,
+            text="FSRS 根据每个单词的记忆稳定性安排复习，可用更少的复习达到相同的记忆保持率",
+            font=("Microsoft YaHei UI", 11),
+            text_color="gray",
+            wraplength=500,
+            anchor="w",
+            justify="left"
+        )
+        self.lbl_fsrs_status.pack(fill="x", padx=20, pady=(0, 20))
+
+    def on_algorithm_change(self, choice):
+        """复习算法改变"""
+        self.controller.config["review_algorithm"] = "fsrs" if choice == "FSRS" else "sm2"
+        save_config(self.controller.config)
+        self.controller.setup_review_algorithm()
+        if choice == "FSRS" and self.controller.fsrs is None:
+            messagebox.showerror("错误", "FSRS 需要安装 numpy，已继续使用 SM-2")
+            self.controller.config["review_algorithm"] = "sm2"
+            save_config(self.controller.config)
+            self.algorithm_dropdown.set("SM-2")
+
+    def fit_fsrs_params(self):
+        """在后台进程中拟合 FSRS 参数，拟合完成前界面照常使用"""
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            from ..services import fsrs_service
+        except ImportError as e:
+            messagebox.showerror("错误", f"无法拟合参数: {e}")
+            return
+
+        # 先把尚未写入的复习评分写入 review_history
+        if hasattr(self.controller, 'review_journal'):
+            self.controller.review_journal.flush()
+
+        self.btn_fit_fsrs.configure(state="disabled", text="⏳ 正在拟合...")
+        self.lbl_fsrs_status.configure(text="正在后台拟合参数，可以继续使用软件")
+
+        executor = ProcessPoolExecutor(max_workers=1)
+        future = executor.submit(fsrs_service.fit_from_db, DB_PATH)
+        executor.shutdown(wait=False)
+
+        def on_done(f):
+            try:
+                result = f.result()
+                self.after(0, lambda: self._on_fsrs_fitted(result, None))
+            except Exception as e:
+                err = str(e)
+                self.after(0, lambda: self._on_fsrs_fitted(None, err))
+
+        future.add_done_callback(on_done)
+
+    def _on_fsrs_fitted(self, result, error):
+        if not self.winfo_exists():
+            return
+        if hasattr(self, 'btn_fit_fsrs') and self.btn_fit_fsrs.winfo_exists():
+            self.btn_fit_fsrs.configure(state="normal", text="📐 根据复习记录拟合 FSRS 参数")
+
+        if error:
+            msg = f"拟合失败: {error}"
+        else:
+            msg = result['message']
+            if result['ok']:
+                self.controller.config["fsrs_params"] = result['params']
+                save_config(self.controller.config)
+                self.controller.setup_review_algorithm()
+                msg += f"（对数损失 {result['loss_before']} → {result['loss_after']}）"
+
+        if hasattr(self, 'lbl_fsrs_status') and self.lbl_fsrs_status.winfo_exists():
+            self.lbl_fsrs_status.configure(text=msg)
+
     def on_close_action_change(self, choice):
         """关闭行为改变"""
         action_map = {
@@ -510,6 +673,14 @@ class SettingsView(BaseView):
                 if not self.controller.review_scheduler.running:
                     self.controller.review_scheduler.start()
 
+    def on_load_balance_change(self):
+        """复习负载均衡开关改变"""
+        is_enabled = self.load_balance_switch.get() == 1
+        self.controller.config["review_load_balance"] = is_enabled
+        save_config(self.controller.config)
+        if hasattr(self.controller, 'review_balancer'):
+            self.controller.review_balancer.enabled = is_enabled
+
     def on_auto_copy_change(self):
         """自动复制开关改变"""
         is_enabled = self.auto_copy_switch.get() == 1
@@ -542,19 +713,28 @@ class SettingsView(BaseView):
         self.create_section_header(card, "💾", "数据管理", "#607D8B")
 
         row = ctk.CTkFrame(card, fg_color="transparent")
-        row.pack(fill="x", padx=20, pady=(0, 20))
+        row.pack(fill="x", padx=20, pady=(0, 10))
 
-        ctk.CTkButton(row, text="📤 导出 CSV", height=40, font=("Microsoft YaHei UI", 13, "bold"),
+        ctk.CTkButton(row, text="📤 导出", height=40, font=("Microsoft YaHei UI", 13, "bold"),
                      fg_color="#3B8ED0", command=self.export_data).pack(side="left", fill="x", expand=True, padx=(0, 5))
 
-        ctk.CTkButton(row, text="📥 导入 CSV", height=40, font=("Microsoft YaHei UI", 13, "bold"),
-                     fg_color="#3B8ED0", command=self.import_data).pack(side="left", fill="x", expand=True, padx=(5, 0))
+        self.btn_import = ctk.CTkButton(row, text="📥 导入 CSV", height=40, font=("Microsoft YaHei UI", 13, "bold"),
+                     fg_color="#3B8ED0", command=self.import_data)
+        self.btn_import.pack(side="left", fill="x", expand=True, padx=(5, 0))
+
+        option_row = ctk.CTkFrame(card, fg_color="transparent")
+        option_row.pack(fill="x", padx=20, pady=(0, 15))
+
+        self.import_enrich_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(option_row, text="导入时联网补全缺失的释义", variable=self.import_enrich_var,
+                        font=("Microsoft YaHei UI", 12)).pack(side="left")
+        self.lbl_data_status = ctk.CTkLabel(option_row, text="", font=("Microsoft YaHei UI", 12), text_color="gray")
+        self.lbl_data_status.pack(side="right")
 
     def export_data(self):
-        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=ExportService.filetypes())
         if filename:
-            words = self.controller.db.get_all_words()
-            success, msg = ExportService.export_to_csv(filename, words)
+            success, msg = ExportService.export(filename, self.controller.db)
             if success:
                 messagebox.showinfo("成功", msg)
             else:
@@ -564,13 +744,37 @@ class SettingsView(BaseView):
         filename = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
         if filename:
             if messagebox.askyesno("确认", "导入将合并现有数据，重复单词将更新释义。\n确定继续吗？"):
-                success, msg = ExportService.import_from_csv(filename, self.controller.db)
-                if success:
-                    messagebox.showinfo("成功", msg)
-                    self.controller.reload_vocab_list()
-                    self.refresh_settings()
-                else:
-                    messagebox.showerror("失败", msg)
+                self.btn_import.configure(state="disabled")
+                self.lbl_data_status.configure(text="正在导入...")
+                enrich = self.import_enrich_var.get()
+                threading.Thread(target=self._import_thread, args=(filename, enrich), daemon=True).start()
+
+    def _import_thread(self, filename, enrich):
+        """后台线程中执行导入，进度通过 after() 回到界面线程"""
+        stage_names = {"import": "导入", "enrich": "补全释义"}
+
+        def on_progress(stage, done, total):
+            text = f"{stage_names.get(stage, stage)} {done}/{total}"
+            self.after(0, lambda: self.lbl_data_status.configure(text=text))
+
+        try:
+            result = ImportService.import_csv(filename, self.controller.db, enrich=enrich, on_progress=on_progress)
+            msg = f"成功导入 {result['inserted']} 个单词，更新 {result['updated']} 个"
+            if enrich:
+                msg += f"\n补全释义 {result['enriched']} 个，未找到 {result['missing']} 个"
+            self.after(0, lambda: self._on_import_done(True, msg))
+        except Exception as e:
+            err = str(e)
+            self.after(0, lambda: self._on_import_done(False, err))
+
+    def _on_import_done(self, success, msg):
+        self.btn_import.configure(state="normal")
+        self.lbl_data_status.configure(text="")
+        if success:
+            messagebox.showinfo("成功", msg)
+            self.refresh_settings()
+        else:
+            messagebox.showerror("失败", msg)
 
     def create_about_card(self, parent):
         card = ctk.CTkFrame(parent, fg_color=("white", "#2b2b2b"), corner_radius=15)
@@ -705,6 +909,18 @@ class SettingsView(BaseView):
             else:
                 self.auto_copy_switch.deselect()
 
+        # Update Load-balance switch (if visible)
+        if hasattr(self, 'load_balance_switch') and self.load_balance_switch.winfo_exists():
+            if self.controller.config.get("review_load_balance", True):
+                self.load_balance_switch.select()
+            else:
+                self.load_balance_switch.deselect()
+
+        # Update Review Algorithm (if visible)
+        if hasattr(self, 'algorithm_dropdown') and self.algorithm_dropdown.winfo_exists():
+            algorithm = self.controller.config.get("review_algorithm", "sm2")
+            self.algorithm_dropdown.set("FSRS" if algorithm == "fsrs" else "SM-2")
+
         # Update Theme (if visible)
         if hasattr(self, 'theme_dropdown') and self.theme_dropdown.winfo_exists():
             current_mode = ctk.get_appearance_mode()
@@ -765,10 +981,21 @@ class SettingsView(BaseView):
             try:
                 stats = self.controller.db.get_dict_cache_stats()
                 total = stats.get('total', 0)
-                self.lbl_dict_cache.configure(text=f"{total} 条记录")
+                self.lbl_dict_cache.configure(
+                    text=f"{total} 条记录 ({stats.get('bytes', 0)/1024/1024:.1f} MB，"
+                         f"压缩节省 {stats.get('saved_bytes', 0)/1024/1024:.1f} MB)"
+                )
             except Exception:
                 self.lbl_dict_cache.configure(text="0 条记录")
 
+        # Update Memory Cache Info (if visible)
+        if hasattr(self, 'lbl_memory_cache') and self.lbl_memory_cache.winfo_exists():
+            stats = MultiDictService.get_memory_cache_stats()
+            self.lbl_memory_cache.configure(
+                text=f"{stats['entries']} 条 ({stats['bytes']/1024:.0f} KB)  "
+                     f"命中率 {stats['hit_rate']:.0%}  淘汰 {stats['evictions']} 次"
+            )
+
     def update_hotkey(self):
         if not hasattr(self, 'entry_hk') or not self.entry_hk.winfo_exists():
             return
@@ -797,6 +1024,7 @@ class SettingsView(BaseView):
         if messagebox.askyesno("确认", "确定清空所有词典查询缓存吗？\n\n清理后再次查询单词时需要重新从网络获取。"):
             try:
                 deleted = self.controller.db.clear_all_dict_cache()
+                MultiDictService.clear_memory_cache()
                 self.refresh_settings()
                 messagebox.showinfo("完成", f"已清理 {deleted} 条词典缓存")
             except Exception as e:
@@ -814,6 +1042,8 @@ class SettingsView(BaseView):
              bg = self.get_canvas_bg().replace("gray95", "white")
              self.heatmap_canvas.configure(bg=bg)
              self.after(100, self.draw_heatmap)
+        if hasattr(self, 'forecast_canvas') and self.forecast_canvas.winfo_exists():
+             self.after(100, self.draw_forecast)
 
     def draw_heatmap(self):
         if not hasattr(self, 'heatmap_canvas') or not self.heatmap_canvas.winfo_exists():
@@ -893,6 +1123,54 @@ class SettingsView(BaseView):
             y = margin_top + i * (box_size + gap) + box_size/2
             self.heatmap_canvas.create_text(margin_left - (5 * scaling), y, text=label, fill=text_color, font=("Arial", font_size), anchor="e")
 
+    def draw_forecast(self):
+        """绘制未来30天每日复习量柱状图（数据来自 ReviewLoadBalancer.forecast）"""
+        if not hasattr(self, 'forecast_canvas') or not self.forecast_canvas.winfo_exists():
+            return
+        if not hasattr(self.controller, 'review_balancer'):
+            return
+
+        canvas = self.forecast_canvas
+        canvas.delete("all")
+        data = self.controller.review_balancer.forecast(30)
+
+        try:
+            scaling = self._get_widget_scaling()
+        except AttributeError:
+            scaling = 1.0
+
+        is_dark = ctk.get_appearance_mode() == "Dark"
+        canvas.configure(bg="#2b2b2b" if is_dark else "white")
+        bar_color = "#26a69a" if is_dark else "#009688"
+        today_color = "#FF9800"
+        text_color = "gray60" if is_dark else "gray50"
+
+        font_size = int(7 * scaling)
+        margin_left = 30 * scaling
+        margin_top = 15 * scaling
+        margin_bottom = 18 * scaling
+        width = max(canvas.winfo_width(), 300)
+        height = float(canvas.cget("height"))
+        chart_height = height - margin_top - margin_bottom
+        slot = (width - margin_left) / len(data)
+        peak = max(count for _, count in data) or 1
+
+        canvas.create_text(margin_left - 5 * scaling, margin_top, text=str(peak),
+                           fill=text_color, font=("Arial", font_size), anchor="e")
+        canvas.create_text(margin_left - 5 * scaling, margin_top + chart_height, text="0",
+                           fill=text_color, font=("Arial", font_size), anchor="e")
+
+        for i, (day, count) in enumerate(data):
+            x1 = margin_left + i * slot + slot * 0.15
+            x2 = margin_left + (i + 1) * slot - slot * 0.15
+            y2 = margin_top + chart_height
+            y1 = y2 - chart_height * count / peak
+            if count:
+                canvas.create_rectangle(x1, y1, x2, y2, fill=today_color if i == 0 else bar_color, outline="")
+            if i % 7 == 0:
+                canvas.create_text((x1 + x2) / 2, y2 + 3 * scaling, text=day[5:],
+                                   fill=text_color, font=("Arial", font_size), anchor="n")
+
     def toggle_donate_qr(self):
         if not self.donate_qr_available:
             messagebox.showinfo("提示", "二维码图片未找到")